@@ -97,6 +97,13 @@ export const recordingsApi = {
       method: 'PUT',
       body: JSON.stringify(stepIds),
     }),
+
+  // 优化
+  optimize: (recordingId: string, apply = false, downgradeStable = false) =>
+    request<OptimizeResult>(`/recordings/${recordingId}/optimize`, {
+      method: 'POST',
+      body: JSON.stringify({ apply, downgrade_stable: downgradeStable }),
+    }),
 };
 
 // 录制控制API
@@ -116,10 +123,15 @@ export const recorderApi = {
 
 // 回放控制API
 export const playbackApi = {
-  start: (recordingId: string, startIndex = 0) =>
+  start: (recordingId: string, startIndex = 0, iterations = 1, loopDuration = 0) =>
     request<PlaybackStatus>('/playback/start', {
       method: 'POST',
-      body: JSON.stringify({ recording_id: recordingId, start_index: startIndex }),
+      body: JSON.stringify({
+        recording_id: recordingId,
+        start_index: startIndex,
+        iterations,
+        loop_duration: loopDuration,
+      }),
     }),
 
   pause: () => request<PlaybackStatus>('/playback/pause', { method: 'POST' }),
@@ -128,9 +140,39 @@ export const playbackApi = {
 
   stop: () => request<PlaybackStatus>('/playback/stop', { method: 'POST' }),
 
+  resync: () => request<PlaybackStatus>('/playback/resync', { method: 'POST' }),
+
   getStatus: () => request<PlaybackStatus>('/playback/status'),
 
   getLogs: () => request<StepLog[]>('/playback/logs'),
+
+  getIterations: () => request<IterationStats[]>('/playback/iterations'),
+
+  getTrace: () => request<Record<string, unknown>>('/playback/trace'),
+
+  startFleet: (
+    recordingId: string,
+    instances: number,
+    iterations = 1,
+    loopDuration = 0,
+    displays?: string[],
+    launch?: string[],
+  ) =>
+    request<FleetStatus>('/playback/fleet/start', {
+      method: 'POST',
+      body: JSON.stringify({
+        recording_id: recordingId,
+        instances,
+        iterations,
+        loop_duration: loopDuration,
+        displays,
+        launch,
+      }),
+    }),
+
+  stopFleet: () => request<FleetStatus>('/playback/fleet/stop', { method: 'POST' }),
+
+  getFleetStatus: () => request<FleetStatus>('/playback/fleet/status'),
 };
 
 // 文件API
@@ -163,6 +205,7 @@ import type {
   Recording,
   RecordingCreate,
   RecordingUpdate,
+  OptimizeResult,
   Step,
   StepCreate,
   StepUpdate,
@@ -170,4 +213,6 @@ import type {
   RecorderStatus,
   PlaybackStatus,
   StepLog,
+  IterationStats,
+  FleetStatus,
 } from '../types';
@@ -39,6 +39,7 @@ export interface TargetWindow {
   title: string;
   process_name: string;
   rect: Region;
+  scale?: number;
 }
 
 export interface Recording {
@@ -50,6 +51,25 @@ export interface Recording {
   steps: Step[];
 }
 
+export interface OptimizeChange {
+  rule: string;
+  step_ids: string[];
+  saved_ms: number;
+  message: string;
+}
+
+export interface OptimizeResult {
+  recording: Recording;
+  applied: boolean;
+  original_steps: number;
+  optimized_steps: number;
+  original_ms: number;
+  optimized_ms: number;
+  saved_ms: number;
+  changes: OptimizeChange[];
+  stable_steps: string[];
+}
+
 export interface RecordingCreate {
   name: string;
   project_id: string;
@@ -90,6 +110,7 @@ export interface Step {
   screenshot?: string;
   description: string;
   timestamp: number;
+  frame_hash?: string;
 
   // click
   button?: string;
@@ -104,6 +125,7 @@ export interface Step {
 
   // input
   input_text?: string;
+  input_mode?: 'char' | 'batch' | 'paste';
 
   // key
   key?: string;
@@ -170,6 +192,48 @@ export interface PlaybackStatus {
   total_steps: number;
   duration: number;
   error?: string;
+  iteration?: number;
+  iterations?: number;
+  readiness?: Record<string, number>;
+}
+
+export interface IterationStats {
+  iteration: number;
+  started_at: number;
+  duration: number;
+  steps: number;
+  succeeded: number;
+  failed: number;
+  skipped: number;
+  retries: number;
+  resyncs: number;
+  completed: boolean;
+}
+
+export interface FleetInstanceStatus {
+  name: string;
+  status: string;
+  pid?: number;
+  display?: string;
+  current_step: number;
+  total_steps: number;
+  iteration: number;
+  steps: number;
+  succeeded: number;
+  failed: number;
+  elapsed: number;
+  steps_per_sec: number;
+  error?: string;
+}
+
+export interface FleetStatus {
+  recording_id?: string;
+  instances: FleetInstanceStatus[];
+  running: number;
+  steps: number;
+  succeeded: number;
+  failed: number;
+  steps_per_sec: number;
 }
 
 export interface StepLog {
@@ -178,4 +242,7 @@ export interface StepLog {
   message: string;
   duration: number;
   timestamp: number;
+  settle_time?: number;
+  verify_time?: number;
+  phases?: Record<string, number>;
 }
@@ -7,6 +7,7 @@ import base64
 import json
 import re
 import asyncio
+import threading
 from typing import Optional
 from PIL import Image
 
@@ -21,6 +22,81 @@ class AIDecisionEngine:
         self.config = config
         self._client = None
 
+        # 异步客户端绑定在首次使用它的事件循环上，同步调用统一派发到该循环
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        绑定外部常驻事件循环（如播放器的运行时）
+
+        绑定后同步方法在该循环上执行；切换循环时重建客户端，
+        避免连接池仍绑定在旧循环上
+        """
+        with self._loop_lock:
+            if loop is self._loop:
+                return
+            self._stop_own_loop()
+            self._loop = loop
+            self._client = None
+
+    def close(self) -> None:
+        """释放自有事件循环"""
+        with self._loop_lock:
+            self._stop_own_loop()
+            self._loop = None
+            self._client = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """获取常驻事件循环，未绑定时启动自有循环线程"""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._loop_thread = threading.Thread(
+                    target=run, name="ai-decision-loop", daemon=True
+                )
+                self._loop_thread.start()
+                ready.wait()
+                self._loop = loop
+                self._client = None
+
+            return self._loop
+
+    async def warmup(self) -> None:
+        """导入 SDK 并在当前事件循环上创建异步客户端，避免首次决策时的初始化开销"""
+        if self._loop is None:
+            self.attach_loop(asyncio.get_running_loop())
+        self._get_client()
+
+    def _stop_own_loop(self) -> None:
+        """停止自有事件循环线程（外部绑定的循环不受影响）"""
+        if self._loop_thread and self._loop:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=5)
+            self._loop.close()
+        self._loop_thread = None
+
+    def _run_sync(self, coro):
+        """在常驻事件循环上执行协程并等待结果"""
+        loop = self._get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError("Sync API cannot be called from the engine's event loop; await the async API instead")
+
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
     def _get_client(self):
         """获取API客户端"""
         if self._client:
@@ -368,12 +444,7 @@ class AIDecisionEngine:
         options: list[dict]
     ) -> Decision:
         """同步版本的决策方法"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.decide(screenshot, prompt, options))
-        finally:
-            loop.close()
+        return self._run_sync(self.decide(screenshot, prompt, options))
 
     def analyze_screen_sync(
         self,
@@ -381,9 +452,4 @@ class AIDecisionEngine:
         prompt: str
     ) -> AnalysisResult:
         """同步版本的分析方法"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.analyze_screen(screenshot, prompt))
-        finally:
-            loop.close()
+        return self._run_sync(self.analyze_screen(screenshot, prompt))
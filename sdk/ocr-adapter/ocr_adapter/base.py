@@ -75,6 +75,9 @@ class OCRAdapter(ABC):
         """
         pass
 
+    def warmup(self) -> None:
+        """预热（加载模型、建立客户端），避免首次识别时的初始化开销；默认无操作"""
+
     def find_all_text(self, image: Image.Image, text: str) -> list[Position]:
         """
         查找所有匹配文字的位置
@@ -55,6 +55,10 @@ class LLMVisionAdapter(OCRAdapter):
 
         return self._client
 
+    def warmup(self) -> None:
+        """导入 SDK 并创建客户端"""
+        self._get_client()
+
     def _image_to_base64(self, image: Image.Image) -> str:
         """将图片转为base64"""
         buffer = io.BytesIO()
@@ -55,6 +55,11 @@ class PaddleOCRAdapter(OCRAdapter):
                 "Please install with: pip install paddleocr paddlepaddle"
             )
 
+    def warmup(self) -> None:
+        """加载模型并在空白图上执行一次识别（首次推理会构建计算图）"""
+        self._init_ocr()
+        self._ocr.ocr(np.full((32, 96, 3), 255, dtype=np.uint8), cls=self.config.cls)
+
     def recognize(self, image: Image.Image) -> list[TextRegion]:
         """识别图片中的所有文字"""
         self._init_ocr()
@@ -123,10 +128,22 @@ class PaddleOCRService:
 
     def __init__(self, endpoint: str = "http://localhost:8001"):
         self.endpoint = endpoint
+        self._session = None
+
+    def _get_session(self):
+        """获取复用连接的 HTTP 会话"""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def warmup(self) -> None:
+        """建立到服务的连接并执行一次识别"""
+        self.recognize(Image.new("RGB", (96, 32), (255, 255, 255)))
 
     def recognize(self, image: Image.Image) -> list[TextRegion]:
         """通过HTTP调用OCR服务"""
-        import requests
         import io
         import base64
 
@@ -136,7 +153,7 @@ class PaddleOCRService:
         img_base64 = base64.b64encode(buffer.getvalue()).decode()
 
         # 发送请求
-        response = requests.post(
+        response = self._get_session().post(
             f"{self.endpoint}/ocr",
             json={"image": img_base64}
         )
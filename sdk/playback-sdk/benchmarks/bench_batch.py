@@ -0,0 +1,84 @@
+"""
+固定步骤批量执行基准
+同一段宏式录制（固定坐标点击、按键、输入）分别逐步执行与合并批量执行，
+比较总耗时与每步耗时，并确认两种方式发出的输入事件一致（使用虚拟输入后端）
+
+用法: python benchmarks/bench_batch.py [--steps 200] [--step-delay 50] [--click-delay 20] [--batch-gap 2]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback import Player, PlayerConfig, PlaybackStatus, VirtualBackend  # noqa: E402
+
+
+def make_recording(count: int) -> dict:
+    """生成宏式录制，每 50 步插入一个等待步骤（批次在此断开）"""
+    kinds = [
+        {"type": "click", "position": {"x": 100, "y": 200}},
+        {"type": "key", "key": "tab"},
+        {"type": "input", "text": "abc", "input_mode": "batch"},
+        {"type": "key", "key": "ctrl+s"},
+    ]
+    steps = []
+    for i in range(count):
+        if i and i % 50 == 0:
+            step = {"type": "wait", "mode": "time", "duration": 0}
+        else:
+            step = dict(kinds[i % len(kinds)])
+        step["id"] = f"s{i}"
+        step["timestamp"] = i * 100
+        steps.append(step)
+    return {"id": "bench_batch", "steps": steps}
+
+
+def run(recording: dict, config: PlayerConfig) -> tuple[float, PlaybackStatus, list[str], int]:
+    """执行录制，返回 (耗时秒, 状态, 输入事件, 步骤结果数)"""
+    backend = VirtualBackend(record_moves=True)
+    player = Player(config)
+    player.set_input_backend(backend)
+    player.load(recording)
+
+    start = time.perf_counter()
+    player.play()
+    status = player.wait()
+    elapsed = time.perf_counter() - start
+
+    results = len(player.get_logs())
+    player.close()
+    return elapsed, status, [str(action) for action in backend.actions], results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--step-delay", type=int, default=50)
+    parser.add_argument("--click-delay", type=int, default=20)
+    parser.add_argument("--batch-gap", type=int, default=2)
+    args = parser.parse_args()
+
+    recording = make_recording(args.steps)
+    base = dict(step_delay=args.step_delay, click_delay=args.click_delay, type_delay=0, batch_gap=args.batch_gap)
+
+    serial_s, serial_status, serial_actions, serial_results = run(recording, PlayerConfig(**base))
+    batch_s, batch_status, batch_actions, batch_results = run(
+        recording, PlayerConfig(batch_fixed_steps=True, **base)
+    )
+
+    print(f"steps:        {args.steps} (step_delay {args.step_delay} ms, click_delay {args.click_delay} ms)")
+    print(f"per-step:     {serial_s * 1000:.0f} ms ({serial_s * 1000 / args.steps:.2f} ms/step), {serial_status.value}")
+    print(f"batched:      {batch_s * 1000:.0f} ms ({batch_s * 1000 / args.steps:.2f} ms/step), {batch_status.value}")
+    print(f"speedup:      {serial_s / batch_s:.1f}x")
+    print(f"results:      {serial_results} / {batch_results}")
+    print(f"same input:   {serial_actions == batch_actions} ({len(batch_actions)} events)")
+
+    if serial_actions != batch_actions or serial_results != batch_results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+步骤分发基准
+测量录制编译、计划缓存命中与每步分发开销（使用虚拟输入后端）
+
+用法: python benchmarks/bench_dispatch.py [--steps 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback import Player, PlayerConfig, VirtualBackend  # noqa: E402
+from playback.plan import PlanCache, compile_recording  # noqa: E402
+from playback.player import STEP_HANDLERS  # noqa: E402
+
+
+def make_recording(count: int) -> dict:
+    """生成混合类型的固定坐标录制（拖拽含固定移动时长，不计入）"""
+    kinds = [
+        {"type": "click", "position": {"x": 100, "y": 200}, "button": "left"},
+        {"type": "scroll", "position": {"x": 300, "y": 300}, "direction": "down", "amount": 120},
+        {"type": "input", "text": "hello"},
+        {"type": "key", "key": "ctrl+s"},
+        {"type": "wait", "mode": "time", "duration": 0},
+    ]
+    steps = []
+    for i in range(count):
+        step = dict(kinds[i % len(kinds)])
+        step["id"] = f"s{i}"
+        step["timestamp"] = 1000 + i * 10
+        steps.append(step)
+    return {"id": "bench", "steps": steps}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=10000)
+    args = parser.parse_args()
+
+    recording = make_recording(args.steps)
+    config = PlayerConfig(step_delay=0, click_delay=0, type_delay=0)
+
+    start = time.perf_counter()
+    compile_recording(recording, STEP_HANDLERS, config, Player._execute_unknown)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    cache = PlanCache()
+    cache.get_or_compile(recording, STEP_HANDLERS, config, Player._execute_unknown)
+    start = time.perf_counter()
+    cache.get_or_compile(recording, STEP_HANDLERS, config, Player._execute_unknown)
+    hit_ms = (time.perf_counter() - start) * 1000
+
+    player = Player(config)
+    player.set_input_backend(VirtualBackend(record_moves=False))
+    player.load(recording)
+    start = time.perf_counter()
+    for step in player.plan.steps:
+        player._execute_step(step)
+    dispatch_us = (time.perf_counter() - start) * 1e6 / args.steps
+    player.close()
+
+    print(f"steps:           {args.steps}")
+    print(f"compile:         {compile_ms:.1f} ms")
+    print(f"cache hit:       {hit_ms:.2f} ms (fingerprint only)")
+    print(f"dispatch/step:   {dispatch_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
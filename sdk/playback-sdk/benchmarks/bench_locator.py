@@ -0,0 +1,203 @@
+"""
+定位策略基准与回归检查
+在生成的语料上测量各定位策略的吞吐、p50/p99 延迟与命中率，并与基线比较
+
+用法:
+    python benchmarks/bench_locator.py                    # 运行并与基线比较，退化时退出码为 1
+    python benchmarks/bench_locator.py --update-baseline  # 重新生成基线
+    python benchmarks/bench_locator.py --ocr paddle       # 同时测量 OCR 适配器 find_text
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback import ElementLocator, PlayerConfig, VirtualBackend  # noqa: E402
+from playback.models import Position  # noqa: E402
+from playback.plan import search_roi  # noqa: E402
+
+import corpus  # noqa: E402
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "locator.json")
+
+# 定位结果与真实位置的最大允许距离(px)
+HIT_TOLERANCE = 12
+
+
+def template_full(locator: ElementLocator, case: corpus.Case):
+    """全屏模板匹配"""
+    return locator._locate_by_template(case.icon), case.icon_center
+
+
+def template_roi(locator: ElementLocator, case: corpus.Case):
+    """提示区域内模板匹配（提示坐标偏离真实位置 30px）"""
+    x, y = case.icon_center
+    region = search_roi(Position(x + 30, y - 30), locator.config.search_region_expand)
+    return locator._locate_by_template(case.icon, region), case.icon_center
+
+
+def feature_full(locator: ElementLocator, case: corpus.Case):
+    """全屏特征点匹配"""
+    return locator._locate_by_feature(case.icon), case.icon_center
+
+
+def feature_roi(locator: ElementLocator, case: corpus.Case):
+    """提示区域内特征点匹配（提示坐标偏离真实位置 30px）"""
+    x, y = case.icon_center
+    region = search_roi(Position(x + 30, y - 30), locator.config.search_region_expand)
+    return locator._locate_by_feature(case.icon, region), case.icon_center
+
+
+def ocr_full(locator: ElementLocator, case: corpus.Case):
+    """全屏 OCR (adapter.find_text)"""
+    return locator._locate_by_text(case.text), case.text_center
+
+
+STRATEGIES: dict[str, Callable] = {
+    "template": template_full,
+    "template_roi": template_roi,
+    "feature": feature_full,
+    "feature_roi": feature_roi,
+}
+
+
+def create_ocr_adapter(name: str):
+    """按名称创建 OCR 适配器"""
+    if name == "none":
+        return None
+    try:
+        from ocr_adapter import PaddleOCRAdapter
+    except ImportError:
+        print("ocr_adapter not installed, skipping OCR strategy")
+        return None
+    return PaddleOCRAdapter()
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """已排序数据的百分位数（最近秩）"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def run_strategy(strategy: Callable, cases: list[corpus.Case], ocr_adapter=None) -> dict:
+    """在整个语料上运行一个策略"""
+    locator = ElementLocator(PlayerConfig())
+    if ocr_adapter:
+        locator.set_ocr_adapter(ocr_adapter)
+
+    durations = []
+    hits = 0
+    by_condition: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    for case in cases:
+        locator.set_screen_capture(VirtualBackend(background=case.screen))
+        start = time.perf_counter()
+        result, (tx, ty) = strategy(locator, case)
+        durations.append((time.perf_counter() - start) * 1000)
+
+        hit = result.found and math.hypot(result.position.x - tx, result.position.y - ty) <= HIT_TOLERANCE
+        hits += hit
+        by_condition[(case.scale, case.noise)][0] += hit
+        by_condition[(case.scale, case.noise)][1] += 1
+
+    durations.sort()
+    return {
+        "cases": len(cases),
+        "hit_rate": round(hits / len(cases), 4),
+        "p50_ms": round(percentile(durations, 50), 2),
+        "p99_ms": round(percentile(durations, 99), 2),
+        "throughput": round(len(cases) / (sum(durations) / 1000), 2),
+        "by_condition": {
+            f"scale {scale} noise {noise}": round(h / n, 4)
+            for (scale, noise), (h, n) in sorted(by_condition.items())
+        },
+    }
+
+
+def check(results: dict, baseline: dict, hit_tolerance: float, latency_factor: float) -> list[str]:
+    """与基线比较，返回退化项"""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get("strategies", {}).get(name)
+        if not base:
+            continue
+        if result["hit_rate"] < base["hit_rate"] - hit_tolerance:
+            failures.append(f"{name}: hit rate {result['hit_rate']:.2%} < baseline {base['hit_rate']:.2%}")
+        if result["p50_ms"] > base["p50_ms"] * latency_factor:
+            failures.append(f"{name}: p50 {result['p50_ms']}ms > {latency_factor}x baseline {base['p50_ms']}ms")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--per-condition", type=int, default=3)
+    parser.add_argument("--ocr", choices=["none", "paddle"], default="none")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--hit-tolerance", type=float, default=0.02, help="允许的命中率下降")
+    parser.add_argument("--latency-factor", type=float, default=1.5, help="允许的 p50 倍数（基线与机器相关）")
+    parser.add_argument("--strategy", action="append", help="只运行指定策略，可重复")
+    args = parser.parse_args()
+
+    cases = corpus.generate(args.seed, args.per_condition)
+    strategies = dict(STRATEGIES)
+    ocr_adapter = create_ocr_adapter(args.ocr)
+    if ocr_adapter:
+        strategies["ocr"] = ocr_full
+    if args.strategy:
+        strategies = {k: v for k, v in strategies.items() if k in args.strategy}
+
+    results = {}
+    print(f"{'strategy':<14}{'hit':>8}{'p50 ms':>10}{'p99 ms':>10}{'ops/s':>10}")
+    for name, strategy in strategies.items():
+        results[name] = run_strategy(strategy, cases, ocr_adapter)
+        r = results[name]
+        print(f"{name:<14}{r['hit_rate']:>8.1%}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['throughput']:>10}")
+        for condition, rate in r["by_condition"].items():
+            print(f"  {condition:<22}{rate:>8.1%}")
+
+    corpus_info = {"seed": args.seed, "per_condition": args.per_condition, "cases": len(cases)}
+    baseline: Optional[dict] = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        # 同一语料下只更新本次运行的策略
+        strategies_baseline = {}
+        if baseline and baseline.get("corpus") == corpus_info:
+            strategies_baseline = baseline.get("strategies", {})
+        strategies_baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"corpus": corpus_info, "strategies": strategies_baseline}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not baseline:
+        print("no baseline, run with --update-baseline")
+        return
+    if baseline.get("corpus") != corpus_info:
+        print("corpus differs from baseline, skipping regression check")
+        return
+
+    failures = check(results, baseline, args.hit_tolerance, args.latency_factor)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
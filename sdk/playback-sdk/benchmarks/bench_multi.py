@@ -0,0 +1,154 @@
+"""
+多实例回放基准
+以 1, 2, 4 ... N 个实例并行执行同一录制，比较总吞吐随实例数的变化；
+每个实例是独立进程，OCR 请求由共享的 OCR 进程池处理
+
+- 默认使用合成游戏（虚拟输入后端 + 合成画面），无需桌面环境
+- --xvfb: 每个实例启动自己的 Xvfb 显示并运行 synthetic_game.py，使用真实输入与截图
+
+用法: python benchmarks/bench_multi.py [--instances 4] [--iterations 20] [--steps 20] [--ocr-workers 1] [--xvfb]
+"""
+
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import corpus  # noqa: E402
+from playback import InstanceSpec, MultiRunner, VirtualBackend  # noqa: E402
+from playback.models import Position  # noqa: E402
+
+
+class SyntheticGame(VirtualBackend):
+    """合成游戏：记录点击与按键，同时作为截图器；画面保持不变，各轮的定位开销一致"""
+
+    def __init__(self, screen_path: str):
+        super().__init__(record_moves=False)
+        self._screen = Image.open(screen_path).convert("RGB")
+
+    def capture_window(self, window_id=None):
+        return self._screen.copy()
+
+    def capture_region(self, x: int, y: int, width: int, height: int):
+        return self._screen.crop((x, y, x + width, y + height))
+
+
+class SyntheticOCR:
+    """合成 OCR：按语料中已知的文字位置返回结果，并做一次缩放模拟推理开销"""
+
+    def __init__(self, text: str, center: tuple[int, int]):
+        self.text = text
+        self.center = center
+
+    def find_text(self, image, text: str):
+        image.convert("L").resize((image.width // 2, image.height // 2))
+        return Position(*self.center) if text == self.text else None
+
+
+def make_recording(count: int, case: corpus.Case, icon_path: str, wait_for_icon: bool) -> dict:
+    """模板定位、OCR 定位与固定坐标步骤混合的录制"""
+    width, height = case.resolution
+    steps = []
+    if wait_for_icon:
+        # Xvfb 上的客户端启动需要时间：等待画面出现
+        steps.append({"type": "wait", "mode": "condition", "condition": {"type": "image_match", "value": icon_path}})
+    steps.append({"type": "click", "mode": "smart", "screenshot": icon_path, "position": {"x": case.icon_center[0], "y": case.icon_center[1]}})
+    steps.append({"type": "click", "mode": "smart", "text": case.text, "position": {"x": case.text_center[0], "y": case.text_center[1]}})
+    for i in range(len(steps), count):
+        kind = i % 3
+        if kind == 0:
+            steps.append({"type": "click", "position": {"x": (i * 97) % width, "y": (i * 53) % height}})
+        elif kind == 1:
+            steps.append({"type": "input", "text": f"t{i}", "input_mode": "batch"})
+        else:
+            steps.append({"type": "key", "key": "enter"})
+    for i, step in enumerate(steps):
+        step.update(id=f"s{i}", timestamp=i * 10)
+    return {"id": "bench_multi", "steps": steps}
+
+
+def run(count: int, args, case: corpus.Case, paths: dict) -> tuple[float, object]:
+    """执行 count 个实例，返回 (总耗时秒, 汇总状态)"""
+    recording = make_recording(args.steps, case, paths["icon"], args.xvfb)
+    config = dict(step_delay=0, click_delay=0, type_delay=0, loop_iterations=args.iterations)
+    specs = []
+    for i in range(count):
+        if args.xvfb:
+            specs.append(InstanceSpec(
+                name=f"i{i}",
+                recording=recording,
+                config=config,
+                launch=[sys.executable, os.path.join(os.path.dirname(__file__), "synthetic_game.py"), "--screen", paths["screen"]],
+            ))
+        else:
+            specs.append(InstanceSpec(
+                name=f"i{i}",
+                recording=recording,
+                config=config,
+                backend=functools.partial(SyntheticGame, paths["screen"]),
+            ))
+
+    ocr = functools.partial(SyntheticOCR, case.text, case.text_center)
+    with MultiRunner(specs, ocr_factory=ocr, ocr_workers=args.ocr_workers, screen=case.resolution) as runner:
+        start = time.perf_counter()
+        status = runner.wait()
+        elapsed = time.perf_counter() - start
+    return elapsed, status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--ocr-workers", type=int, default=1)
+    parser.add_argument("--xvfb", action="store_true", help="每个实例使用独立的 Xvfb 显示与合成游戏客户端")
+    args = parser.parse_args()
+
+    case = next(c for c in corpus.generate(seed=1, per_condition=1) if c.scale == 1.0 and c.noise == 0)
+
+    counts = []
+    n = 1
+    while n < args.instances:
+        counts.append(n)
+        n *= 2
+    counts.append(args.instances)
+
+    print(f"cpus:      {os.cpu_count()}")
+    print(f"recording: {args.steps} steps x {args.iterations} iterations per instance, {'xvfb' if args.xvfb else 'synthetic'}")
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"screen": os.path.join(tmp, "screen.png"), "icon": os.path.join(tmp, "icon.png")}
+        case.screen.save(paths["screen"])
+        case.icon.save(paths["icon"])
+
+        base = None
+        for count in counts:
+            elapsed, status = run(count, args, case, paths)
+            # 各实例自开始执行起计时，不含进程启动与准备
+            throughput = status.steps_per_sec
+            base = base or throughput
+            states = sorted({instance.status for instance in status.instances})
+            print(
+                f"instances {count:3d}: {status.steps:6d} steps in {elapsed:6.2f} s, "
+                f"{throughput:7.0f} steps/s ({throughput / base:.2f}x), "
+                f"success {status.succeeded / max(1, status.steps):.1%}, {','.join(states)}"
+            )
+            errors = [f"{i.name}: {i.error}" for i in status.instances if i.error]
+            if errors or states != ["completed"]:
+                failed = True
+                for error in errors:
+                    print(f"  {error}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
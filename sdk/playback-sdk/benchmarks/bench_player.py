@@ -0,0 +1,85 @@
+"""
+无桌面回放基准
+用虚拟输入后端完整执行 Player.play()，测量每步开销并与期望动作序列比对
+
+用法: python benchmarks/bench_player.py [--steps 2000] [--frame out.png] [--log actions.jsonl]
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback import Player, PlayerConfig, PlaybackStatus, VirtualBackend  # noqa: E402
+
+
+def make_recording(count: int, width: int, height: int) -> tuple[dict, list[str]]:
+    """生成录制及其期望动作序列"""
+    steps: list[dict] = []
+    expected: list[str] = []
+    for i in range(count):
+        x, y = (i * 97) % width, (i * 53) % height
+        kind = i % 4
+        if kind == 0:
+            steps.append({"type": "click", "position": {"x": x, "y": y}})
+            expected += [f"move {x} {y}", f"click left {x} {y} 1"]
+        elif kind == 1:
+            steps.append({"type": "scroll", "position": {"x": x, "y": y}, "direction": "up", "amount": 3})
+            expected += [f"move {x} {y}", f"scroll 0 3 {x} {y}"]
+        elif kind == 2:
+            steps.append({"type": "input", "text": f"t{i}", "input_mode": "batch"})
+            expected += [f"type t{i}"]
+        else:
+            steps.append({"type": "key", "key": "ctrl+a"})
+            expected += ["key_down ctrl", "key_down a", "key_up a", "key_up ctrl"]
+        steps[-1].update(id=f"s{i}", timestamp=i * 10)
+    return {"id": "bench_player", "steps": steps}, expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--frame", help="保存合成画面到该路径")
+    parser.add_argument("--log", help="保存动作日志(JSON Lines)到该路径")
+    args = parser.parse_args()
+
+    width, height = 1280, 720
+    recording, expected = make_recording(args.steps, width, height)
+
+    backend = VirtualBackend((width, height), framebuffer=bool(args.frame))
+    player = Player(PlayerConfig(step_delay=0, click_delay=0, type_delay=0))
+    player.set_input_backend(backend)
+    player.load(recording)
+
+    start = time.perf_counter()
+    player.play()
+    status = player.wait()
+    elapsed = time.perf_counter() - start
+    player.close()
+
+    actual = backend.signature()
+    diff = list(difflib.unified_diff(expected, actual, "expected", "actual", lineterm="", n=1))
+
+    print(f"steps:         {args.steps}")
+    print(f"status:        {status.value}")
+    print(f"total:         {elapsed * 1000:.1f} ms")
+    print(f"overhead/step: {elapsed * 1e6 / args.steps:.1f} us")
+    print(f"actions:       {len(actual)} (expected {len(expected)})")
+    print(f"action diff:   {'none' if not diff else f'{len(diff)} lines'}")
+    for line in diff[:20]:
+        print(f"  {line}")
+
+    if args.frame:
+        backend.frame.save(args.frame)
+    if args.log:
+        backend.dump(args.log)
+
+    if status != PlaybackStatus.COMPLETED or diff:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
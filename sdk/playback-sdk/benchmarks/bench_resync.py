@@ -0,0 +1,67 @@
+"""
+画面指纹索引基准
+为大录制建立画面指纹索引（多索引哈希），测量带噪声画面哈希的查找延迟与命中率
+
+用法: python benchmarks/bench_resync.py [--steps 10000] [--screens 2000] [--noise 4]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback.fingerprint import FrameIndex  # noqa: E402
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """已排序数据的百分位数（最近秩）"""
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=10000)
+    parser.add_argument("--screens", type=int, default=2000, help="不同画面数（多个步骤可共享画面）")
+    parser.add_argument("--noise", type=int, default=4, help="查询哈希随机翻转的位数")
+    parser.add_argument("--max-distance", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    screens = [rng.getrandbits(64) for _ in range(args.screens)]
+    # 录制按画面顺序推进，每个画面停留若干步
+    step_screens = sorted(rng.randrange(args.screens) for _ in range(args.steps))
+
+    start = time.perf_counter()
+    index = FrameIndex()
+    for step_index, screen in enumerate(step_screens):
+        index.add(screens[screen], step_index)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    durations = []
+    hits = 0
+    for _ in range(args.queries):
+        step_index = rng.randrange(args.steps)
+        query = screens[step_screens[step_index]]
+        for bit in rng.sample(range(64), args.noise):
+            query ^= 1 << bit
+
+        start = time.perf_counter()
+        match = index.nearest(query, args.max_distance, near=step_index)
+        durations.append((time.perf_counter() - start) * 1e6)
+        hits += bool(match) and step_screens[match[0]] == step_screens[step_index]
+
+    durations.sort()
+    print(f"steps:     {args.steps} ({args.screens} screens)")
+    print(f"build:     {build_ms:.1f} ms")
+    print(f"lookup:    p50 {percentile(durations, 50):.1f} us, p99 {percentile(durations, 99):.1f} us")
+    print(f"hit rate:  {hits / args.queries:.1%} (noise {args.noise} bits, radius {args.max_distance})")
+
+
+if __name__ == "__main__":
+    main()
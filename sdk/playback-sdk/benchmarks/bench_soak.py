@@ -0,0 +1,140 @@
+"""
+循环执行内存基准
+用虚拟后端循环执行同一录制数千轮，每轮结束采样进程 RSS，
+检查预热后内存不再增长（日志环形缓冲、缓存复用）
+
+用法: python benchmarks/bench_soak.py [--iterations 1000] [--steps 20] [--max-growth 8]
+"""
+
+import argparse
+import gc
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import corpus  # noqa: E402
+from playback import Player, PlayerConfig, PlaybackStatus, VirtualBackend  # noqa: E402
+
+
+def rss_mb() -> float:
+    """当前常驻内存(MB)，无 /proc 时退化为峰值"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class SoakBackend(VirtualBackend):
+    """每轮开始前恢复初始画面并清空动作日志的虚拟后端"""
+
+    def __init__(self, background):
+        super().__init__(background=background, record_moves=False)
+        self._background = background.convert("RGB")
+
+    def reset(self) -> None:
+        """恢复初始画面"""
+        self.clear()
+        with self._lock:
+            self._frame.paste(self._background)
+
+
+def make_recording(count: int, case: corpus.Case) -> dict:
+    """固定坐标步骤为主，每轮含一个模板定位步骤"""
+    width, height = case.resolution
+    x, y = case.icon_center
+    steps = [{"type": "click", "mode": "smart", "screenshot": "icon", "position": {"x": x + 15, "y": y - 10}}]
+    for i in range(1, count):
+        kind = i % 3
+        if kind == 0:
+            steps.append({"type": "click", "position": {"x": (i * 97) % width, "y": (i * 53) % height}})
+        elif kind == 1:
+            steps.append({"type": "input", "text": f"t{i}", "input_mode": "batch"})
+        else:
+            steps.append({"type": "key", "key": "enter"})
+    for i, step in enumerate(steps):
+        step.update(id=f"s{i}", timestamp=i * 10)
+    return {"id": "bench_soak", "steps": steps}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--log-capacity", type=int, default=PlayerConfig.log_capacity)
+    parser.add_argument("--warmup", type=float, default=0.2, help="预热轮数占比，之后的增长计入结果")
+    parser.add_argument("--max-growth", type=float, default=8.0, help="预热后允许的 RSS 增长(MB)，超出时退出码为 1")
+    args = parser.parse_args()
+
+    case = next(c for c in corpus.generate(seed=1, per_condition=1) if c.scale == 1.0 and c.noise == 0)
+    backend = SoakBackend(case.screen)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spill_path = os.path.join(tmp, "results.jsonl")
+        player = Player(PlayerConfig(
+            step_delay=0,
+            click_delay=0,
+            type_delay=0,
+            loop_iterations=args.iterations,
+            log_capacity=args.log_capacity,
+            log_spill_path=spill_path,
+        ))
+        player.set_input_backend(backend)
+        player.set_screen_capture(backend)
+        player.set_template_loader(lambda _: case.icon)
+        player.load(make_recording(args.steps, case))
+
+        warmup = max(1, int(args.iterations * args.warmup))
+        samples: list[tuple[int, float]] = []
+        durations: list[int] = []
+        totals = {"steps": 0, "succeeded": 0}
+
+        def on_iteration(stats) -> None:
+            backend.reset()
+            durations.append(stats.duration)
+            totals["steps"] += stats.steps
+            totals["succeeded"] += stats.succeeded
+            if stats.iteration + 1 >= warmup and (stats.iteration + 1) % max(1, args.iterations // 50) == 0:
+                gc.collect()
+                samples.append((stats.iteration + 1, rss_mb()))
+
+        player.on_iteration(on_iteration)
+
+        start_rss = rss_mb()
+        start = time.perf_counter()
+        player.play()
+        status = player.wait()
+        elapsed = time.perf_counter() - start
+
+        logs = len(player.get_logs())
+        spilled = os.path.getsize(spill_path) if os.path.exists(spill_path) else 0
+        player.close()
+
+    steps, succeeded = totals["steps"], totals["succeeded"]
+    window = max(1, len(durations) // 10)
+    first = sum(durations[:window]) / window if durations else 0.0
+    last = sum(durations[-window:]) / window if durations else 0.0
+    base = samples[0][1] if samples else start_rss
+    peak = max((rss for _, rss in samples), default=base)
+    growth = samples[-1][1] - base if samples else 0.0
+
+    print(f"status:       {status.value}")
+    print(f"iterations:   {len(durations)} x {args.steps} steps in {elapsed:.1f} s ({steps / elapsed:.0f} steps/s)")
+    print(f"iteration:    first 10% {first:.1f} ms, last 10% {last:.1f} ms")
+    print(f"success:      {succeeded / steps if steps else 0:.1%}")
+    print(f"logs:         {logs} in memory, {spilled / 2**20:.1f} MB spilled")
+    print(f"rss:          start {start_rss:.1f} MB, after warmup {base:.1f} MB, peak {peak:.1f} MB")
+    print(f"growth:       {growth:+.2f} MB over {len(samples)} samples after iteration {warmup}")
+
+    if status != PlaybackStatus.COMPLETED or growth > args.max_growth:
+        print(f"FAILED: growth limit {args.max_growth} MB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
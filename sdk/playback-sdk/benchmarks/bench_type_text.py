@@ -0,0 +1,103 @@
+"""
+文字输入基准
+对比 char / batch / paste 输入方式在文本框替身上的速度(字符/秒)与正确性
+
+文本框替身记录收到的按键；min_gap 模拟响应较慢的输入框：
+与上一个字符间隔小于 min_gap 的字符会被丢弃
+
+用法: python benchmarks/bench_type_text.py [--length 200]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback import EventSimulator, VirtualBackend  # noqa: E402
+
+
+class TextField(VirtualBackend):
+    """文本框替身，基于虚拟输入后端"""
+
+    def __init__(self, clipboard: "FakeClipboard", min_gap: float = 0.0):
+        super().__init__(record_moves=False)
+        self.value = ""
+        self.min_gap = min_gap
+        self._clipboard = clipboard
+        self._last_at = 0.0
+
+    def type(self, text: str) -> None:
+        super().type(text)
+        for char in text:
+            now = time.perf_counter()
+            if now - self._last_at >= self.min_gap:
+                self.value += char
+            self._last_at = now
+
+    def key_down(self, key: str) -> None:
+        if key == "v" and self.pressed_keys & {"ctrl", "cmd"}:
+            # 粘贴一次性插入，不受 min_gap 影响
+            self.value += self._clipboard.get() or ""
+        super().key_down(key)
+
+
+class FakeClipboard:
+    """内存剪贴板"""
+
+    def __init__(self, content: str = ""):
+        self.content = content
+        self.available = True
+
+    def get(self):
+        return self.content
+
+    def set(self, text: str) -> bool:
+        self.content = text
+        return True
+
+
+def run(strategy: str, text: str, min_gap_ms: float, delay, restore_delay: int) -> tuple[float, bool, bool]:
+    """执行一次输入，返回 (字符/秒, 内容是否正确, 剪贴板是否恢复)"""
+    clipboard = FakeClipboard("original clipboard")
+    field = TextField(clipboard, min_gap_ms / 1000)
+
+    simulator = EventSimulator(click_delay=0, paste_restore_delay=restore_delay, backend=field)
+    simulator._clipboard = clipboard
+
+    start = time.perf_counter()
+    simulator.type_text(text, strategy=strategy, delay=delay)
+    elapsed = time.perf_counter() - start
+
+    return len(text) / elapsed, field.value == text, clipboard.content == "original clipboard"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--length", type=int, default=200)
+    parser.add_argument("--restore-delay", type=int, default=100, help="paste_restore_delay(ms)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    text = "".join(random.choice(string.ascii_letters + string.digits + " ") for _ in range(args.length))
+
+    cases = [
+        ("char", None, "type_delay=50ms"),
+        ("char", 5, "window delay=5ms"),
+        ("batch", None, ""),
+        ("paste", None, ""),
+    ]
+
+    print(f"{'field':<12}{'strategy':<10}{'delay':<18}{'chars/s':>10}{'correct':>9}{'restored':>10}")
+    for field_name, min_gap in (("responsive", 0.0), ("laggy 2ms", 2.0)):
+        for strategy, delay, note in cases:
+            rate, correct, restored = run(strategy, text, min_gap, delay, args.restore_delay)
+            restored_text = str(restored) if strategy == "paste" else "-"
+            print(f"{field_name:<12}{strategy:<10}{note:<18}{rate:>10.0f}{str(correct):>9}{restored_text:>10}")
+
+
+if __name__ == "__main__":
+    main()
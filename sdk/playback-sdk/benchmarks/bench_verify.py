@@ -0,0 +1,104 @@
+"""
+点击校验基准
+模拟一个按概率丢弃点击、以一定延迟响应的界面，测量校验耗时与丢失点击的发现率
+
+用法: python benchmarks/bench_verify.py [--clicks 200] [--drop-rate 0.1] [--latency 60] [--reissue 1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback import Player, PlayerConfig, VirtualBackend  # noqa: E402
+from playback.models import StepResultStatus  # noqa: E402
+
+
+class FlakyGame(VirtualBackend):
+    """按概率丢弃点击的虚拟界面，接受的点击在 latency 后高亮按钮区域"""
+
+    def __init__(self, size: tuple[int, int], drop_rate: float, latency: float, seed: int = 0):
+        super().__init__(size, framebuffer=True)
+        self.drop_rate = drop_rate
+        self.latency = latency
+        self.accepted: list[bool] = []  # 每次点击是否被界面接受
+        self._rng = random.Random(seed)
+
+    def click(self, button: str = "left", count: int = 1) -> None:
+        """点击：被丢弃时不记录也不响应"""
+        dropped = self._rng.random() < self.drop_rate
+        self.accepted.append(not dropped)
+        if dropped:
+            return
+        super().click(button, count)
+        x, y = self.position
+        threading.Timer(self.latency, self._respond, (x, y)).start()
+
+    def _respond(self, x: int, y: int) -> None:
+        """界面响应：按钮区域反色"""
+        with self._lock:
+            # 取按钮边缘像素（中心是点击标记）
+            r, g, b = self._frame.getpixel((min(x + 30, self.size[0] - 1), y))
+            self._draw.rectangle((x - 40, y - 20, x + 40, y + 20), fill=(255 - r, 255 - g, 255 - b))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clicks", type=int, default=200)
+    parser.add_argument("--drop-rate", type=float, default=0.1)
+    parser.add_argument("--latency", type=int, default=60, help="界面响应延迟(ms)")
+    parser.add_argument("--window", type=int, default=PlayerConfig.verify_window_ms, help="校验等待窗口(ms)")
+    parser.add_argument("--reissue", type=int, default=1)
+    args = parser.parse_args()
+
+    width, height = 1280, 720
+    steps = [
+        {"id": f"c{i}", "type": "click", "position": {"x": 60 + (i * 97) % (width - 120), "y": 40 + (i * 53) % (height - 80)}}
+        for i in range(args.clicks)
+    ]
+
+    game = FlakyGame((width, height), args.drop_rate, args.latency / 1000)
+    config = PlayerConfig(
+        step_delay=0,
+        click_delay=0,
+        verify_clicks=True,
+        verify_window_ms=args.window,
+        verify_reissue=args.reissue,
+    )
+    player = Player(config)
+    player.set_input_backend(game)
+    player.set_screen_capture(game)
+    player.load({"id": "bench_verify", "steps": steps})
+
+    # 逐步执行，失败的步骤不中断统计
+    stats = player.get_verify_stats()
+    dropped = detected = false_alarms = failed = 0
+    start = time.perf_counter()
+    for step in player.plan.steps:
+        first_click, caught = len(game.accepted), stats.caught
+        result = player._execute_step(step)
+        was_dropped = not game.accepted[first_click]
+        was_caught = stats.caught > caught
+        dropped += was_dropped
+        detected += was_dropped and was_caught
+        false_alarms += was_caught and not was_dropped
+        failed += result.status != StepResultStatus.SUCCESS
+    elapsed = time.perf_counter() - start
+    player.close()
+
+    print(f"clicks:          {args.clicks} in {elapsed * 1000:.1f} ms")
+    print(f"dropped:         {dropped}")
+    print(f"detected:        {detected} ({detected / dropped if dropped else 1:.1%} of dropped)")
+    print(f"false alarms:    {false_alarms}")
+    print(f"recovered:       {stats.recovered}")
+    print(f"failed steps:    {failed}")
+    print(f"verify mean:     {stats.mean_time:.1f} ms/check ({stats.checks} checks)")
+    print(f"verify total:    {stats.total_time} ms")
+
+
+if __name__ == "__main__":
+    main()
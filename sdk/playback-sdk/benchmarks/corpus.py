@@ -0,0 +1,130 @@
+"""
+定位基准语料
+生成类 UI 画面，已知文字按钮与图标的位置，覆盖多种分辨率、缩放与噪声
+"""
+
+import random
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+WORDS = [
+    "Start", "Confirm", "Cancel", "Settings", "Inventory", "Battle", "Shop",
+    "Claim", "Upgrade", "Friends", "Mail", "Quest", "Retry", "Continue", "Skip",
+]
+
+RESOLUTIONS = [(1280, 720), (1920, 1080)]
+SCALES = [1.0, 0.9, 1.25]
+NOISE_LEVELS = [0, 8, 20]
+
+ICON_SIZE = 48
+
+
+@dataclass
+class Case:
+    """语料样本"""
+    id: str
+    resolution: tuple[int, int]
+    scale: float
+    noise: int
+    screen: Image.Image
+    text: str
+    text_center: tuple[int, int]
+    icon: Image.Image  # 原始尺寸(缩放 1.0)的图标模板
+    icon_center: tuple[int, int]
+
+    @property
+    def condition(self) -> str:
+        """样本条件标签"""
+        return f"{self.resolution[0]}x{self.resolution[1]} s{self.scale} n{self.noise}"
+
+
+def generate(
+    seed: int = 0,
+    per_condition: int = 3,
+    resolutions: list[tuple[int, int]] = RESOLUTIONS,
+    scales: list[float] = SCALES,
+    noise_levels: list[int] = NOISE_LEVELS,
+) -> list[Case]:
+    """按条件组合生成语料"""
+    rng = random.Random(seed)
+    cases = []
+    for resolution, scale, noise in product(resolutions, scales, noise_levels):
+        for i in range(per_condition):
+            cases.append(_render(rng, f"{len(cases):04d}", resolution, scale, noise))
+    return cases
+
+
+def _render(rng: random.Random, case_id: str, resolution: tuple[int, int], scale: float, noise: int) -> Case:
+    """渲染单个画面"""
+    width, height = resolution
+    screen = Image.new("RGB", resolution)
+    draw = ImageDraw.Draw(screen)
+
+    # 背景渐变
+    top, bottom = _color(rng, 20, 90), _color(rng, 20, 90)
+    for y in range(height):
+        t = y / height
+        draw.line([(0, y), (width, y)], fill=tuple(int(a + (b - a) * t) for a, b in zip(top, bottom)))
+
+    # 面板
+    for _ in range(rng.randint(2, 4)):
+        w, h = rng.randint(width // 6, width // 3), rng.randint(height // 6, height // 3)
+        x, y = rng.randint(0, width - w), rng.randint(0, height - h)
+        draw.rounded_rectangle((x, y, x + w, y + h), radius=12, fill=_color(rng, 40, 120))
+
+    # 文字按钮（在网格上放置，避免重叠）
+    font = ImageFont.load_default(size=max(10, int(22 * scale)))
+    button_w, button_h = int(170 * scale), int(48 * scale)
+    slots = [
+        (col * width // 5 + 20, row * height // 5 + 20)
+        for row in range(5) for col in range(5)
+    ]
+    rng.shuffle(slots)
+    words = rng.sample(WORDS, 6)
+    buttons = []
+    for word, (x, y) in zip(words, slots):
+        draw.rounded_rectangle((x, y, x + button_w, y + button_h), radius=8, fill=_color(rng, 90, 200))
+        draw.text((x + button_w // 2, y + button_h // 2), word, font=font, fill=(250, 250, 250), anchor="mm")
+        buttons.append((word, (x + button_w // 2, y + button_h // 2)))
+    text, text_center = buttons[0]
+
+    # 图标放在剩余的空位
+    icon = _icon(rng)
+    size = int(ICON_SIZE * scale)
+    x, y = slots[len(words)]
+    screen.paste(icon.resize((size, size), Image.BILINEAR), (x, y))
+    icon_center = (x + size // 2, y + size // 2)
+
+    if noise:
+        pixels = np.asarray(screen, dtype=np.float32)
+        noisy = pixels + np.random.default_rng(rng.randint(0, 2**31)).normal(0, noise, pixels.shape)
+        screen = Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+    return Case(case_id, resolution, scale, noise, screen, text, text_center, icon, icon_center)
+
+
+def _icon(rng: random.Random) -> Image.Image:
+    """绘制随机图标"""
+    icon = Image.new("RGB", (ICON_SIZE, ICON_SIZE), _color(rng, 0, 255))
+    draw = ImageDraw.Draw(icon)
+    for _ in range(3):
+        x0, y0 = rng.randint(0, 30), rng.randint(0, 30)
+        x1, y1 = x0 + rng.randint(10, 18), y0 + rng.randint(10, 18)
+        shape = rng.choice(["ellipse", "rectangle", "polygon"])
+        fill = _color(rng, 0, 255)
+        if shape == "ellipse":
+            draw.ellipse((x0, y0, x1, y1), fill=fill)
+        elif shape == "rectangle":
+            draw.rectangle((x0, y0, x1, y1), fill=fill)
+        else:
+            draw.polygon([(x0, y1), ((x0 + x1) // 2, y0), (x1, y1)], fill=fill)
+    return icon
+
+
+def _color(rng: random.Random, low: int, high: int) -> tuple[int, int, int]:
+    """随机颜色"""
+    return tuple(rng.randint(low, high) for _ in range(3))
@@ -0,0 +1,72 @@
+"""
+离线回放评估
+用录制的帧序列（目录或 zip）评估整条录制的定位成功率、置信度与耗时
+
+用法:
+    python benchmarks/replay_frames.py --recording rec.json --frames frames.zip
+    python benchmarks/replay_frames.py --recording rec.json --frames frames/ --ocr paddle --json report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from playback import FrameSequenceCapture, PlayerConfig, ReplayHarness  # noqa: E402
+
+
+def create_ocr_adapter(name: str):
+    """按名称创建 OCR 适配器"""
+    if name == "none":
+        return None
+    try:
+        from ocr_adapter import PaddleOCRAdapter
+    except ImportError:
+        print("ocr_adapter not installed, OCR strategy disabled")
+        return None
+    return PaddleOCRAdapter()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", required=True, help="录制 JSON 文件")
+    parser.add_argument("--frames", required=True, help="帧序列目录或 zip")
+    parser.add_argument("--ocr", choices=["none", "paddle"], default="none")
+    parser.add_argument("--match-threshold", type=float, default=PlayerConfig.match_threshold)
+    parser.add_argument("--search-expand", type=int, default=PlayerConfig.search_region_expand)
+    parser.add_argument("--ocr-timeout", type=int, default=PlayerConfig.ocr_timeout)
+    parser.add_argument("--json", help="保存完整报告到该路径")
+    parser.add_argument("--min-hit-rate", type=float, default=0.0, help="成功率低于该值时返回非零退出码")
+    args = parser.parse_args()
+
+    with open(args.recording, "r", encoding="utf-8") as f:
+        recording = json.load(f)
+
+    config = PlayerConfig(
+        click_delay=0,
+        retry_count=0,
+        match_threshold=args.match_threshold,
+        search_region_expand=args.search_expand,
+        ocr_timeout=args.ocr_timeout,
+    )
+    frames = FrameSequenceCapture(args.frames)
+    harness = ReplayHarness(frames, config, create_ocr_adapter(args.ocr))
+    try:
+        report = harness.run(recording)
+    finally:
+        harness.close()
+        frames.close()
+
+    print(report.format())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2, default=lambda o: o.__dict__)
+
+    if report.hit_rate < args.min_hit_rate:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+合成游戏客户端
+在当前 DISPLAY 上全屏显示一张游戏画面，统计收到的点击与按键，退出时写入统计文件；
+用于在 Xvfb 上测试多实例回放
+
+用法: DISPLAY=:101 python benchmarks/synthetic_game.py --screen screen.png [--stats stats.json]
+"""
+
+import argparse
+import json
+import signal
+import tkinter as tk
+
+from PIL import Image, ImageTk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--screen", required=True, help="游戏画面图片")
+    parser.add_argument("--stats", help="退出时写入点击/按键统计的 JSON 文件")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.title("synthetic-game")
+    root.overrideredirect(True)
+    image = Image.open(args.screen).convert("RGB")
+    root.geometry(f"{image.width}x{image.height}+0+0")
+
+    canvas = tk.Canvas(root, width=image.width, height=image.height, highlightthickness=0)
+    canvas.pack()
+    photo = ImageTk.PhotoImage(image)
+    canvas.create_image(0, 0, image=photo, anchor="nw")
+
+    stats = {"clicks": 0, "keys": 0, "text": ""}
+
+    def on_click(event) -> None:
+        stats["clicks"] += 1
+        canvas.create_oval(event.x - 3, event.y - 3, event.x + 3, event.y + 3, fill="red", outline="")
+
+    def on_key(event) -> None:
+        stats["keys"] += 1
+        if event.char and event.char.isprintable():
+            stats["text"] += event.char
+
+    def on_exit(*_) -> None:
+        if args.stats:
+            with open(args.stats, "w", encoding="utf-8") as f:
+                json.dump(stats, f)
+        root.destroy()
+
+    canvas.bind("<Button>", on_click)
+    root.bind("<Key>", on_key)
+    root.focus_force()
+    signal.signal(signal.SIGTERM, lambda *_: root.after(0, on_exit))
+
+    def tick() -> None:
+        # 定期执行 Python 代码，使信号处理得以运行
+        root.after(200, tick)
+
+    tick()
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
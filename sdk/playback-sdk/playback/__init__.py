@@ -5,16 +5,63 @@ TeachPlay Playback SDK
 
 from .player import Player
 from .simulator import EventSimulator
+from .backends import InputBackend, PynputBackend, VirtualBackend
 from .locator import ElementLocator
-from .models import PlayerConfig, StepResult, PlaybackStatus
+from .hints import HintStore
+from .runtime import AsyncRuntime
+from .control import PlaybackControl
+from .tracing import Tracer
+from .resultlog import ResultLog
+from .assets import AssetCache, AssetPrefetcher, PrefetchReport, asset_urls
+from .replay import FrameSequenceCapture, ReplayHarness, ReplayReport
+from .plan import ExecutionPlan, CompiledStep, PlanCache, compile_recording
+from .multi import MultiRunner, InstanceSpec, InstanceStatus, FleetStatus, OCRPool, RemoteOCRAdapter
+from .xdisplay import XvfbDisplay, XDisplayCapture
+from .optimizer import OptimizeChange, OptimizeReport, estimate_step_ms, optimize_recording
+from .models import PlayerConfig, StepResult, PlaybackStatus, StepHint, VerifyStats, IterationStats, Readiness
 
 __all__ = [
     "Player",
     "EventSimulator",
+    "InputBackend",
+    "PynputBackend",
+    "VirtualBackend",
     "ElementLocator",
+    "HintStore",
+    "AsyncRuntime",
+    "PlaybackControl",
+    "Tracer",
+    "ResultLog",
+    "AssetCache",
+    "AssetPrefetcher",
+    "PrefetchReport",
+    "asset_urls",
+    "FrameSequenceCapture",
+    "ReplayHarness",
+    "ReplayReport",
+    "ExecutionPlan",
+    "CompiledStep",
+    "PlanCache",
+    "compile_recording",
+    "MultiRunner",
+    "InstanceSpec",
+    "InstanceStatus",
+    "FleetStatus",
+    "OCRPool",
+    "RemoteOCRAdapter",
+    "XvfbDisplay",
+    "XDisplayCapture",
+    "OptimizeChange",
+    "OptimizeReport",
+    "estimate_step_ms",
+    "optimize_recording",
     "PlayerConfig",
     "StepResult",
     "PlaybackStatus",
+    "StepHint",
+    "VerifyStats",
+    "IterationStats",
+    "Readiness",
 ]
 
 __version__ = "0.1.0"
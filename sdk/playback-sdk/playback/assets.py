@@ -0,0 +1,276 @@
+"""
+资源预取模块
+执行前把录制引用的模板截图批量并发下载到本地内容寻址缓存，
+回放时模板只从本地缓存读取，定位等时间敏感的步骤中不再发生网络请求
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from PIL import Image
+
+
+# 缓存索引被其他连接锁定时的等待时间(s)
+DB_TIMEOUT = 10.0
+
+
+def asset_urls(recording: dict) -> list[str]:
+    """录制中智能步骤与图像等待条件引用的模板地址（去重，保持步骤顺序）"""
+    urls: dict[str, None] = {}
+    for step in recording.get("steps", []):
+        if step.get("mode") == "smart" and step.get("screenshot"):
+            urls[step["screenshot"]] = None
+        condition = step.get("condition") or {}
+        if condition.get("type") == "image_match" and condition.get("value"):
+            urls[condition["value"]] = None
+    return list(urls)
+
+
+class AssetCache:
+    """
+    内容寻址的本地资源缓存
+
+    文件按内容 SHA-256 存放在 objects/ 下（相同内容的不同地址只存一份），
+    地址 → 摘要与最近使用时间记录在 SQLite 索引中；
+    总大小超过 max_bytes 时按最近使用时间淘汰；
+    淘汰会删除文件，同一目录只应由一个进程使用（多实例各用自己的目录）
+    """
+
+    def __init__(self, root: str, max_bytes: int = 512 * 2**20):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False, timeout=DB_TIMEOUT)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs (last_used);
+            """
+        )
+        self._conn.commit()
+
+    def __contains__(self, url: str) -> bool:
+        return self.path(url, touch=False) is not None
+
+    @property
+    def size(self) -> int:
+        """缓存总字节数"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def path(self, url: str, touch: bool = True) -> Optional[Path]:
+        """地址对应的本地文件，未缓存时返回 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return None
+            path = self._object_path(row[0])
+            if not path.exists():
+                # 文件被外部删除：清理索引
+                self._forget(row[0])
+                self._conn.commit()
+                return None
+            if touch:
+                self._conn.execute("UPDATE blobs SET last_used = ? WHERE digest = ?", (time.time(), row[0]))
+                self._conn.commit()
+        return path
+
+    def get(self, url: str) -> Optional[bytes]:
+        """读取已缓存的内容"""
+        path = self.path(url)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def load_image(self, url: str) -> Optional[Image.Image]:
+        """模板解析器：只读本地缓存，未缓存时返回 None（可直接用作 Player.set_template_loader）"""
+        data = self.get(url)
+        if data is None:
+            return None
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            return image
+        except Exception as e:
+            print(f"Error decoding cached asset {url}: {e}")
+            return None
+
+    def put(self, url: str, data: bytes) -> Path:
+        """写入内容（已存在相同内容时只登记地址），并按容量淘汰"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再原子替换，并发写入同一内容时不会读到半个文件
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO blobs (digest, size, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(digest) DO UPDATE SET last_used = excluded.last_used",
+                (digest, len(data), time.time()),
+            )
+            self._conn.execute(
+                "INSERT INTO urls (url, digest) VALUES (?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET digest = excluded.digest",
+                (url, digest),
+            )
+            self._evict()
+            self._conn.commit()
+        return path
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            for (digest,) in self._conn.execute("SELECT digest FROM blobs").fetchall():
+                self._object_path(digest).unlink(missing_ok=True)
+            self._conn.execute("DELETE FROM blobs")
+            self._conn.execute("DELETE FROM urls")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """关闭索引"""
+        with self._lock:
+            self._conn.close()
+
+    def _object_path(self, digest: str) -> Path:
+        """内容文件路径"""
+        return self.root / "objects" / digest[:2] / digest
+
+    def _evict(self) -> None:
+        """总大小超过上限时删除最久未使用的内容（调用方持有锁）"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT digest, size FROM blobs ORDER BY last_used").fetchall()
+        for digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._object_path(digest).unlink(missing_ok=True)
+            self._forget(digest)
+            total -= size
+
+    def _forget(self, digest: str) -> None:
+        """删除内容的索引记录（调用方持有锁）"""
+        self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+
+
+@dataclass
+class PrefetchReport:
+    """预取结果"""
+    urls: int = 0  # 去重后的地址数
+    cached: int = 0  # 已在缓存中
+    downloaded: int = 0
+    bytes: int = 0  # 下载字节数
+    failed: list[str] = field(default_factory=list)
+    duration: int = 0  # 耗时(ms)
+
+
+def http_fetcher(pool_size: int = 8, timeout: float = 30.0) -> Callable[[str], Optional[bytes]]:
+    """基于 urllib3 连接池的 HTTP(S) 下载函数"""
+    import urllib3
+
+    pool = urllib3.PoolManager(maxsize=pool_size, timeout=timeout, retries=urllib3.Retry(2))
+
+    def fetch(url: str) -> Optional[bytes]:
+        response = pool.request("GET", url)
+        if response.status != 200:
+            print(f"Asset fetch error {response.status}: {url}")
+            return None
+        return response.data
+
+    return fetch
+
+
+class AssetPrefetcher:
+    """
+    资源预取器
+
+    Args:
+        cache: 本地缓存
+        fetcher: 下载函数 url → bytes（失败返回 None 或抛出异常），应复用连接池；
+            默认使用 http_fetcher（本地路径直接读取文件）
+        workers: 并发下载数
+    """
+
+    def __init__(
+        self,
+        cache: AssetCache,
+        fetcher: Optional[Callable[[str], Optional[bytes]]] = None,
+        workers: int = 8,
+    ):
+        self.cache = cache
+        self.workers = max(1, workers)
+        self._fetcher = fetcher
+        self._fetcher_lock = threading.Lock()
+
+    def prefetch(self, urls: Iterable[str]) -> PrefetchReport:
+        """并发下载尚未缓存的地址"""
+        start = time.perf_counter()
+        urls = list(dict.fromkeys(url for url in urls if url))
+        report = PrefetchReport(urls=len(urls))
+
+        missing = [url for url in urls if url not in self.cache]
+        report.cached = len(urls) - len(missing)
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=min(self.workers, len(missing)), thread_name_prefix="asset-prefetch"
+            ) as pool:
+                for url, data in zip(missing, pool.map(self._download, missing)):
+                    if data is None:
+                        report.failed.append(url)
+                        continue
+                    self.cache.put(url, data)
+                    report.downloaded += 1
+                    report.bytes += len(data)
+
+        report.duration = int((time.perf_counter() - start) * 1000)
+        return report
+
+    def prefetch_recording(self, recording: dict) -> PrefetchReport:
+        """预取录制引用的全部模板"""
+        return self.prefetch(asset_urls(recording))
+
+    def _download(self, url: str) -> Optional[bytes]:
+        """下载单个地址"""
+        try:
+            if "://" not in url:
+                return Path(url).read_bytes()
+            return self._get_fetcher()(url)
+        except Exception as e:
+            print(f"Asset fetch error: {url}: {e}")
+            return None
+
+    def _get_fetcher(self) -> Callable[[str], Optional[bytes]]:
+        """获取下载函数（默认 HTTP 连接池延迟创建）"""
+        if self._fetcher is None:
+            with self._fetcher_lock:
+                if self._fetcher is None:
+                    self._fetcher = http_fetcher(self.workers)
+        return self._fetcher
@@ -0,0 +1,15 @@
+"""
+输入后端
+EventSimulator 通过输入后端发送鼠标、键盘事件
+"""
+
+from .base import InputBackend
+from .native import PynputBackend
+from .virtual import VirtualBackend, InputAction
+
+__all__ = [
+    "InputBackend",
+    "PynputBackend",
+    "VirtualBackend",
+    "InputAction",
+]
@@ -0,0 +1,54 @@
+"""
+输入后端抽象接口
+"""
+
+from abc import ABC, abstractmethod
+
+
+class InputBackend(ABC):
+    """
+    输入后端抽象基类
+
+    按钮使用 "left"/"right"/"middle"；按键使用规范化的键名
+    （如 "enter"、"ctrl"、"page_up"）或单个字符
+    """
+
+    @abstractmethod
+    def move(self, x: int, y: int) -> None:
+        """移动鼠标"""
+        pass
+
+    @abstractmethod
+    def click(self, button: str = "left", count: int = 1) -> None:
+        """在当前位置点击"""
+        pass
+
+    @abstractmethod
+    def mouse_down(self, button: str = "left") -> None:
+        """按下鼠标按钮"""
+        pass
+
+    @abstractmethod
+    def mouse_up(self, button: str = "left") -> None:
+        """松开鼠标按钮"""
+        pass
+
+    @abstractmethod
+    def scroll(self, dx: int, dy: int) -> None:
+        """滚动"""
+        pass
+
+    @abstractmethod
+    def key_down(self, key: str) -> None:
+        """按下按键"""
+        pass
+
+    @abstractmethod
+    def key_up(self, key: str) -> None:
+        """松开按键"""
+        pass
+
+    @abstractmethod
+    def type(self, text: str) -> None:
+        """输入文字"""
+        pass
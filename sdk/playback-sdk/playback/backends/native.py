@@ -0,0 +1,98 @@
+"""
+pynput 输入后端
+驱动真实的鼠标、键盘
+"""
+
+from .base import InputBackend
+
+
+class PynputBackend(InputBackend):
+    """pynput 输入后端（首次使用时加载 pynput）"""
+
+    def __init__(self):
+        self._mouse = None
+        self._keyboard = None
+        self._buttons = None
+        self._keys = None
+
+    def move(self, x: int, y: int) -> None:
+        """移动鼠标"""
+        self._get_mouse().position = (x, y)
+
+    def click(self, button: str = "left", count: int = 1) -> None:
+        """在当前位置点击"""
+        self._get_mouse().click(self._get_button(button), count)
+
+    def mouse_down(self, button: str = "left") -> None:
+        """按下鼠标按钮"""
+        self._get_mouse().press(self._get_button(button))
+
+    def mouse_up(self, button: str = "left") -> None:
+        """松开鼠标按钮"""
+        self._get_mouse().release(self._get_button(button))
+
+    def scroll(self, dx: int, dy: int) -> None:
+        """滚动"""
+        self._get_mouse().scroll(dx, dy)
+
+    def key_down(self, key: str) -> None:
+        """按下按键"""
+        self._get_keyboard().press(self._get_key(key))
+
+    def key_up(self, key: str) -> None:
+        """松开按键"""
+        self._get_keyboard().release(self._get_key(key))
+
+    def type(self, text: str) -> None:
+        """输入文字"""
+        self._get_keyboard().type(text)
+
+    def _get_mouse(self):
+        """延迟创建鼠标控制器"""
+        if self._mouse is None:
+            from pynput.mouse import Button, Controller
+            self._mouse = Controller()
+            self._buttons = {
+                "left": Button.left,
+                "right": Button.right,
+                "middle": Button.middle,
+            }
+        return self._mouse
+
+    def _get_keyboard(self):
+        """延迟创建键盘控制器"""
+        if self._keyboard is None:
+            from pynput.keyboard import Key, Controller
+            self._keyboard = Controller()
+            self._keys = {
+                "enter": Key.enter,
+                "tab": Key.tab,
+                "space": Key.space,
+                "backspace": Key.backspace,
+                "delete": Key.delete,
+                "esc": Key.esc,
+                "up": Key.up,
+                "down": Key.down,
+                "left": Key.left,
+                "right": Key.right,
+                "home": Key.home,
+                "end": Key.end,
+                "page_up": Key.page_up,
+                "page_down": Key.page_down,
+                "ctrl": Key.ctrl,
+                "alt": Key.alt,
+                "shift": Key.shift,
+                "cmd": Key.cmd,
+                **{f"f{i}": getattr(Key, f"f{i}") for i in range(1, 13)},
+            }
+        return self._keyboard
+
+    def _get_button(self, button: str):
+        """获取 pynput 鼠标按钮"""
+        self._get_mouse()
+        return self._buttons.get(button, self._buttons["left"])
+
+    def _get_key(self, key: str):
+        """获取 pynput 按键对象（单个字符原样传入）"""
+        self._get_keyboard()
+        return self._keys.get(key, key)
@@ -0,0 +1,209 @@
+"""
+虚拟输入后端
+不操作真实设备，记录带时间戳的动作日志，可选地把动作绘制到合成画面上
+用于无桌面环境下测量回放开销、比对动作序列
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageDraw
+
+from .base import InputBackend
+
+
+# 点击标记颜色
+BUTTON_COLORS = {
+    "left": (255, 64, 64),
+    "right": (64, 128, 255),
+    "middle": (64, 200, 64),
+}
+
+MODIFIER_KEYS = {"ctrl", "alt", "shift", "cmd"}
+
+
+@dataclass(slots=True)
+class InputAction:
+    """输入动作记录"""
+    time: float  # 相对后端创建时间(ms)
+    action: str  # move, click, mouse_down, mouse_up, scroll, key_down, key_up, type
+    args: tuple = ()
+
+    def __str__(self) -> str:
+        return " ".join([self.action, *(str(a) for a in self.args)])
+
+
+class VirtualBackend(InputBackend):
+    """
+    虚拟输入后端
+
+    Args:
+        size: 合成画面尺寸
+        framebuffer: 是否把动作绘制到合成画面（可作为屏幕捕获器使用）
+        background: 合成画面的初始图像
+        record_moves: 是否记录单独的鼠标移动
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int] = (1920, 1080),
+        framebuffer: bool = False,
+        background: Optional[Image.Image] = None,
+        record_moves: bool = True,
+    ):
+        self.size = background.size if background is not None else size
+        self.position = (0, 0)
+        self.pressed_buttons: set[str] = set()
+        self.pressed_keys: set[str] = set()
+        self.text = ""  # 已输入的文字
+        self.record_moves = record_moves
+
+        self._actions: list[InputAction] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+        self._frame: Optional[Image.Image] = None
+        self._draw: Optional[ImageDraw.ImageDraw] = None
+        if framebuffer or background is not None:
+            self._frame = (
+                background.convert("RGB").copy()
+                if background is not None
+                else Image.new("RGB", self.size, (32, 32, 32))
+            )
+            self._draw = ImageDraw.Draw(self._frame)
+
+    # ---- InputBackend ----
+
+    def move(self, x: int, y: int) -> None:
+        """移动鼠标"""
+        previous = self.position
+        self.position = (x, y)
+        if self.record_moves:
+            self._record("move", x, y)
+        if self._draw and self.pressed_buttons:
+            # 按住按钮移动：绘制拖拽轨迹
+            with self._lock:
+                self._draw.line([previous, (x, y)], fill=(255, 200, 0), width=3)
+
+    def click(self, button: str = "left", count: int = 1) -> None:
+        """在当前位置点击"""
+        x, y = self.position
+        self._record("click", button, x, y, count)
+        self._mark(button)
+
+    def mouse_down(self, button: str = "left") -> None:
+        """按下鼠标按钮"""
+        self.pressed_buttons.add(button)
+        self._record("mouse_down", button, *self.position)
+        self._mark(button)
+
+    def mouse_up(self, button: str = "left") -> None:
+        """松开鼠标按钮"""
+        self.pressed_buttons.discard(button)
+        self._record("mouse_up", button, *self.position)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        """滚动"""
+        self._record("scroll", dx, dy, *self.position)
+
+    def key_down(self, key: str) -> None:
+        """按下按键"""
+        self.pressed_keys.add(key)
+        self._record("key_down", key)
+        if key == "backspace":
+            self.text = self.text[:-1]
+        elif key == "enter":
+            self.text += "\n"
+        elif len(key) == 1 and not (self.pressed_keys & MODIFIER_KEYS):
+            self._append_text(key)
+
+    def key_up(self, key: str) -> None:
+        """松开按键"""
+        self.pressed_keys.discard(key)
+        self._record("key_up", key)
+
+    def type(self, text: str) -> None:
+        """输入文字"""
+        self._record("type", text)
+        self._append_text(text)
+
+    # ---- 动作日志 ----
+
+    @property
+    def actions(self) -> list[InputAction]:
+        """动作日志"""
+        with self._lock:
+            return list(self._actions)
+
+    def signature(self) -> list[str]:
+        """不含时间戳的动作序列，用于与期望序列比对"""
+        return [str(action) for action in self.actions]
+
+    def lines(self) -> list[str]:
+        """紧凑文本日志: 时间(ms) 动作 参数..."""
+        return [f"{action.time:.3f} {action}" for action in self.actions]
+
+    def dump(self, path: str) -> None:
+        """将动作日志写入 JSON Lines 文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            for action in self.actions:
+                f.write(json.dumps([round(action.time, 3), action.action, *action.args], ensure_ascii=False))
+                f.write("\n")
+
+    def clear(self) -> None:
+        """清空动作日志与已输入文字"""
+        with self._lock:
+            self._actions.clear()
+            self._origin = time.perf_counter()
+        self.text = ""
+
+    # ---- 合成画面（屏幕捕获器接口） ----
+
+    @property
+    def frame(self) -> Optional[Image.Image]:
+        """当前合成画面"""
+        return self._frame
+
+    def capture_window(self, window_id: Optional[str] = None) -> Optional[Image.Image]:
+        """截取合成画面"""
+        if self._frame is None:
+            return None
+        with self._lock:
+            return self._frame.copy()
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        """截取合成画面区域"""
+        if self._frame is None:
+            return None
+        with self._lock:
+            return self._frame.crop((x, y, x + width, y + height))
+
+    def _record(self, action: str, *args) -> None:
+        """记录动作"""
+        with self._lock:
+            self._actions.append(
+                InputAction((time.perf_counter() - self._origin) * 1000, action, args)
+            )
+
+    def _mark(self, button: str) -> None:
+        """在光标位置绘制点击标记"""
+        if self._draw is None:
+            return
+        x, y = self.position
+        with self._lock:
+            self._draw.ellipse(
+                (x - 6, y - 6, x + 6, y + 6),
+                fill=BUTTON_COLORS.get(button, BUTTON_COLORS["left"])
+            )
+
+    def _append_text(self, text: str) -> None:
+        """追加已输入文字，并绘制在光标右侧"""
+        if self._draw is not None:
+            x, y = self.position
+            offset = len(self.text.rsplit("\n", 1)[-1]) * 6
+            with self._lock:
+                self._draw.text((x + 10 + offset, y - 5), text, fill=(255, 255, 255))
+        self.text += text
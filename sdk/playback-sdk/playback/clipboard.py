@@ -0,0 +1,53 @@
+"""
+剪贴板模块
+粘贴输入时读写系统剪贴板（依赖 pyperclip，未安装时不可用）
+"""
+
+from typing import Optional
+
+
+class Clipboard:
+    """系统剪贴板"""
+
+    def __init__(self):
+        self._backend = None
+        self._checked = False
+
+    @property
+    def available(self) -> bool:
+        """剪贴板是否可用"""
+        return self._get_backend() is not None
+
+    def get(self) -> Optional[str]:
+        """读取剪贴板文字，不可用或读取失败返回 None"""
+        backend = self._get_backend()
+        if backend is None:
+            return None
+        try:
+            return backend.paste()
+        except Exception as e:
+            print(f"Clipboard read error: {e}")
+            return None
+
+    def set(self, text: str) -> bool:
+        """写入剪贴板文字"""
+        backend = self._get_backend()
+        if backend is None:
+            return False
+        try:
+            backend.copy(text)
+            return True
+        except Exception as e:
+            print(f"Clipboard write error: {e}")
+            return False
+
+    def _get_backend(self):
+        """延迟加载 pyperclip"""
+        if not self._checked:
+            self._checked = True
+            try:
+                import pyperclip
+                self._backend = pyperclip
+            except ImportError:
+                print("pyperclip not installed, paste input unavailable")
+        return self._backend
@@ -0,0 +1,175 @@
+"""
+播放控制模块
+暂停/继续/停止的共享令牌，所有阻塞等待都在其条件变量上进行，状态变化即时唤醒
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Iterable, Optional
+
+
+class PlaybackControl:
+    """
+    播放控制令牌
+
+    播放器、定位器、事件模拟器共享同一个令牌：
+    - sleep/sleep_async 在暂停期间冻结倒计时，停止时立即返回 False
+    - 暂停时在条件变量上阻塞，不占用 CPU
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._paused = False
+        self._paused_at: Optional[float] = None
+        self._paused_total = 0.0
+        self._async_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def stopped(self) -> bool:
+        """是否已停止"""
+        return self._stopped
+
+    @property
+    def paused(self) -> bool:
+        """是否已暂停"""
+        return self._paused
+
+    def reset(self) -> None:
+        """清除停止与暂停状态（开始新一轮播放时调用）"""
+        with self._cond:
+            self._stopped = False
+            self._set_paused(False)
+            self._notify()
+
+    def stop(self) -> None:
+        """停止，唤醒所有等待者"""
+        with self._cond:
+            self._stopped = True
+            self._set_paused(False)
+            self._notify()
+
+    def pause(self) -> None:
+        """暂停"""
+        with self._cond:
+            if not self._stopped:
+                self._set_paused(True)
+                self._notify()
+
+    def resume(self) -> None:
+        """继续"""
+        with self._cond:
+            self._set_paused(False)
+            self._notify()
+
+    def paused_total(self) -> float:
+        """累计暂停时长(秒)，含正在进行的暂停"""
+        with self._cond:
+            total = self._paused_total
+            if self._paused_at is not None:
+                total += time.monotonic() - self._paused_at
+            return total
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        可中断的睡眠，暂停期间不计时
+
+        Returns:
+            正常结束返回 True，被停止返回 False
+        """
+        remaining = seconds
+        with self._cond:
+            while not self._stopped:
+                if self._paused:
+                    self._cond.wait()
+                    continue
+                if remaining <= 0:
+                    return True
+                start = time.monotonic()
+                self._cond.wait(remaining)
+                remaining -= time.monotonic() - start
+            return False
+
+    def checkpoint(self) -> bool:
+        """暂停时阻塞到继续；已停止返回 False"""
+        return self.sleep(0)
+
+    def wait_futures(self, futures: Iterable[Future], timeout: Optional[float] = None) -> bool:
+        """
+        等待任一 future 完成，停止时立即返回（不受暂停影响）
+
+        Returns:
+            是否有 future 已完成
+        """
+        futures = list(futures)
+        for future in futures:
+            future.add_done_callback(lambda _: self._wake())
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while not any(f.done() for f in futures) and not self._stopped:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return any(f.done() for f in futures)
+
+    async def sleep_async(self, seconds: float) -> bool:
+        """sleep 的协程版本，在事件循环上等待，不占用线程"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        event = waiter[1]
+        with self._cond:
+            self._async_waiters.add(waiter)
+
+        try:
+            remaining = seconds
+            while True:
+                # 先清除再检查状态，状态变化的唤醒不会丢失
+                event.clear()
+                if self._stopped:
+                    return False
+                if self._paused:
+                    await event.wait()
+                    continue
+                if remaining <= 0:
+                    return True
+
+                start = time.monotonic()
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                remaining -= time.monotonic() - start
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+
+    async def checkpoint_async(self) -> bool:
+        """checkpoint 的协程版本"""
+        return await self.sleep_async(0)
+
+    def _set_paused(self, paused: bool) -> None:
+        """更新暂停状态并累计暂停时长（需持有锁）"""
+        if paused and self._paused_at is None:
+            self._paused_at = time.monotonic()
+        elif not paused and self._paused_at is not None:
+            self._paused_total += time.monotonic() - self._paused_at
+            self._paused_at = None
+        self._paused = paused
+
+    def _wake(self) -> None:
+        """唤醒等待者"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def _notify(self) -> None:
+        """唤醒同步与异步等待者（需持有锁）"""
+        self._cond.notify_all()
+        for loop, event in list(self._async_waiters):
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 事件循环已关闭
+                self._async_waiters.discard((loop, event))
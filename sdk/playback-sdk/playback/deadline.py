@@ -0,0 +1,82 @@
+"""
+截止时间模块
+为定位、重试等阻塞操作提供统一的时间预算
+"""
+
+import time
+from typing import Optional
+
+
+class Deadline:
+    """基于单调时钟的截止时间，timeout 为空表示不限时"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: 时间预算(ms)
+        """
+        self._expires_at = (
+            time.monotonic() + timeout / 1000 if timeout is not None else None
+        )
+
+    @classmethod
+    def unbounded(cls) -> "Deadline":
+        """不限时的截止时间"""
+        return cls(None)
+
+    @property
+    def bounded(self) -> bool:
+        """是否有时间限制"""
+        return self._expires_at is not None
+
+    def remaining(self) -> Optional[float]:
+        """剩余时间(秒)，不限时返回 None"""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def remaining_ms(self) -> Optional[int]:
+        """剩余时间(ms)，不限时返回 None"""
+        remaining = self.remaining()
+        return int(remaining * 1000) if remaining is not None else None
+
+    def expired(self) -> bool:
+        """是否已超时"""
+        return self._expires_at is not None and time.monotonic() >= self._expires_at
+
+    def share(self, parts: int, cap: Optional[float] = None) -> "Deadline":
+        """
+        将剩余预算平均分给 parts 个后续操作，返回当前操作的截止时间
+
+        Args:
+            parts: 剩余操作数（含当前操作）
+            cap: 当前操作的预算上限(ms)
+        """
+        remaining = self.remaining_ms()
+        if remaining is None:
+            return Deadline(cap)
+
+        budget = remaining / max(1, parts)
+        if cap is not None:
+            budget = min(budget, cap)
+        return Deadline(budget)
+
+    def sleep(self, seconds: float, control=None) -> bool:
+        """
+        睡眠，但不超过截止时间
+
+        Args:
+            seconds: 睡眠时长(秒)
+            control: 播放控制令牌，提供时睡眠可被暂停/停止打断
+
+        Returns:
+            被停止时返回 False
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        if control is not None:
+            return control.sleep(max(0.0, seconds))
+        if seconds > 0:
+            time.sleep(seconds)
+        return True
@@ -0,0 +1,164 @@
+"""
+特征点匹配模块
+用 ORB/AKAZE 二进制描述子 + 汉明距离暴力匹配 + RANSAC 相似变换定位模板，
+可应对模板匹配无法处理的缩放、部分遮挡与动态背景
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from PIL import Image
+
+from .models import PlayerConfig
+
+
+# 模板短边小于该值时先放大再检测，小图标上的特征点过少
+MIN_TEMPLATE_SIDE = 96
+
+# 匹配到的缩放比例范围，超出视为错误匹配
+MIN_SCALE, MAX_SCALE = 0.25, 4.0
+
+# 截图随模板放大时的像素上限
+MAX_SCALED_PIXELS = 4_000_000
+
+
+@dataclass
+class FeatureMatch:
+    """特征点匹配结果"""
+    found: bool
+    x: float = 0.0  # 模板中心在截图中的坐标
+    y: float = 0.0
+    confidence: float = 0.0  # 内点占比
+    inliers: int = 0
+    matches: int = 0
+    message: str = ""
+
+
+class FeatureMatcher:
+    """特征点匹配器，模板描述子只计算一次"""
+
+    def __init__(self, config: Optional[PlayerConfig] = None, cache_size: int = 64):
+        self.config = config or PlayerConfig()
+        self._cache: OrderedDict[int, tuple] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        # OpenCV 检测器与匹配器不保证线程安全，按线程创建
+        self._local = threading.local()
+
+    def match(self, template: Image.Image, screenshot: Image.Image) -> FeatureMatch:
+        """在截图中定位模板"""
+        import cv2
+        import numpy as np
+
+        keypoints, descriptors, scale, size = self._template_features(template)
+        if descriptors is None or len(keypoints) < self.config.feature_min_matches:
+            return FeatureMatch(False, message=f"Too few template keypoints: {len(keypoints)}")
+
+        # 小模板放大检测时，截图按同一倍数放大（面积过大时不放大，由特征点金字塔处理尺度差）
+        frame_scale = scale if screenshot.width * screenshot.height * scale * scale <= MAX_SCALED_PIXELS else 1.0
+        image = screenshot.convert("RGB")
+        if frame_scale > 1.0:
+            image = image.resize((round(image.width * frame_scale), round(image.height * frame_scale)), Image.BILINEAR)
+
+        detector, matcher = self._tools()
+        gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+        frame_keypoints, frame_descriptors = detector.detectAndCompute(gray, None)
+        if frame_descriptors is None or len(frame_keypoints) < 2:
+            return FeatureMatch(False, message="Too few screen keypoints")
+
+        # 最近邻比值检验
+        good = []
+        for pair in matcher.knnMatch(descriptors, frame_descriptors, k=2):
+            if len(pair) == 2 and pair[0].distance < self.config.feature_ratio * pair[1].distance:
+                good.append(pair[0])
+        if len(good) < self.config.feature_min_matches:
+            return FeatureMatch(False, matches=len(good), message=f"Too few feature matches: {len(good)}")
+
+        src = np.float32([keypoints[m.queryIdx].pt for m in good]) / scale
+        dst = np.float32([frame_keypoints[m.trainIdx].pt for m in good]) / frame_scale
+
+        # 界面元素只有平移与等比缩放，用 RANSAC 估计相似变换（比完整单应性需要的内点更少）
+        transform, mask = cv2.estimateAffinePartial2D(
+            src, dst, method=cv2.RANSAC, ransacReprojThreshold=3.0
+        )
+        inliers = int(mask.sum()) if mask is not None else 0
+        if transform is None or inliers < self.config.feature_min_matches:
+            return FeatureMatch(False, inliers=inliers, matches=len(good), message=f"Transform rejected: {inliers} inliers")
+
+        match_scale = float(np.hypot(transform[0, 0], transform[1, 0]))
+        if not MIN_SCALE <= match_scale <= MAX_SCALE:
+            return FeatureMatch(False, inliers=inliers, matches=len(good), message=f"Implausible scale: {match_scale:.2f}")
+
+        width, height = size
+        x, y = transform @ np.float32([width / 2, height / 2, 1])
+        confidence = inliers / len(good)
+        return FeatureMatch(
+            True,
+            x=float(x),
+            y=float(y),
+            confidence=confidence,
+            inliers=inliers,
+            matches=len(good),
+            message=f"Feature matched: {inliers}/{len(good)} inliers, scale {match_scale:.2f}",
+        )
+
+    def prepare(self, template: Image.Image) -> None:
+        """预先计算并缓存模板的特征点描述子"""
+        self._template_features(template)
+
+    def clear(self) -> None:
+        """清空模板描述子缓存"""
+        with self._lock:
+            self._cache.clear()
+
+    def _template_features(self, template: Image.Image) -> tuple[Any, Any, float, tuple[int, int]]:
+        """获取模板的特征点与描述子（按图片对象缓存）"""
+        key = id(template)
+        with self._lock:
+            entry = self._cache.get(key)
+            # id 可能在对象回收后被复用，以弱引用确认仍是同一对象
+            if entry is not None and entry[0]() is template:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        import cv2
+        import numpy as np
+
+        detector, _ = self._tools()
+        scale = max(1.0, MIN_TEMPLATE_SIDE / max(1, min(template.size)))
+        image = template.convert("RGB")
+        if scale > 1.0:
+            image = image.resize((round(image.width * scale), round(image.height * scale)), Image.BICUBIC)
+        gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+        keypoints, descriptors = detector.detectAndCompute(gray, None)
+        features = (keypoints, descriptors, scale, template.size)
+
+        with self._lock:
+            self._cache[key] = (weakref.ref(template), features)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return features
+
+    def _tools(self):
+        """当前线程的检测器与匹配器"""
+        tools = getattr(self._local, "tools", None)
+        if tools is None:
+            import cv2
+
+            akaze = getattr(cv2, "AKAZE_create", None)
+            if self.config.feature_detector == "akaze" and akaze is not None:
+                detector = akaze()
+            else:
+                if self.config.feature_detector == "akaze":
+                    print("AKAZE not available in this OpenCV build, using ORB")
+                detector = cv2.ORB_create(
+                    nfeatures=self.config.feature_max_keypoints,
+                    edgeThreshold=15,
+                    patchSize=15,
+                    fastThreshold=10,
+                )
+            tools = self._local.tools = (detector, cv2.BFMatcher(cv2.NORM_HAMMING))
+        return tools
@@ -0,0 +1,176 @@
+"""
+画面指纹模块
+用感知哈希 (dHash) 标识录制中每一步的画面，按汉明距离用多索引哈希查找最相近的步骤，
+回放失败后据此判断当前画面处于录制的哪一步
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+
+HASH_SIZE = 8  # 哈希边长，64 位，须与录制端 recorder.framehash.FRAME_HASH_SIZE 相同
+
+
+def dhash(image: Image.Image, size: int = HASH_SIZE) -> int:
+    """
+    差异哈希：缩小为 (size+1)×size 灰度图，逐行比较相邻像素亮度
+
+    与录制端 recorder.framehash.frame_hash 逐位一致（tests/test_fingerprint.py 校验）
+    """
+    small = np.asarray(image.convert("L").resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, :-1] > small[:, 1:]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big") >> (-bits.size % 8)
+
+
+def parse_hash(value) -> Optional[int]:
+    """解析录制中保存的十六进制哈希"""
+    if isinstance(value, int):
+        return value
+    if not value:
+        return None
+    try:
+        return int(value, 16)
+    except (TypeError, ValueError):
+        return None
+
+
+def hamming(a: int, b: int) -> int:
+    """汉明距离"""
+    return (a ^ b).bit_count()
+
+
+CHUNKS = 4  # 多索引哈希的分段数
+CHUNK_BITS = HASH_SIZE * HASH_SIZE // CHUNKS
+
+
+@lru_cache(maxsize=8)
+def _flip_masks(radius: int) -> tuple[int, ...]:
+    """一个分段内汉明距离不超过 radius 的所有翻转掩码"""
+    masks = []
+    for r in range(radius + 1):
+        for bits in combinations(range(CHUNK_BITS), r):
+            mask = 0
+            for bit in bits:
+                mask |= 1 << bit
+            masks.append(mask)
+    return tuple(masks)
+
+
+class MultiIndexHash:
+    """
+    多索引哈希：64 位哈希切成 4 段，每段建立精确查找表
+
+    两个哈希的距离不超过 r 时，至少有一段的距离不超过 r // 4（鸽巢原理），
+    因此只需在每段枚举该半径内的变体查表，再对候选计算完整距离，
+    查找开销与录制长度基本无关
+
+    相同哈希合并存储（录制中同一画面常对应多个步骤）
+    """
+
+    def __init__(self):
+        self._values: dict[int, list] = {}
+        self._tables: list[dict[int, list[int]]] = [{} for _ in range(CHUNKS)]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value_hash: int, value) -> None:
+        """插入哈希及其关联值"""
+        self._size += 1
+        values = self._values.get(value_hash)
+        if values is not None:
+            values.append(value)
+            return
+
+        self._values[value_hash] = [value]
+        for i, table in enumerate(self._tables):
+            table.setdefault(_chunk(value_hash, i), []).append(value_hash)
+
+    def nearest(self, value_hash: int, max_distance: int) -> tuple[int, list]:
+        """
+        查找距离最近的哈希（可能有多个并列）
+
+        Returns:
+            (距离, 并列最近的值列表)，max_distance 内没有时返回 (-1, [])
+        """
+        exact = self._values.get(value_hash)
+        if exact is not None:
+            return 0, list(exact)
+
+        candidates: set[int] = set()
+        masks = _flip_masks(max_distance // CHUNKS)
+        for i, table in enumerate(self._tables):
+            chunk = _chunk(value_hash, i)
+            for mask in masks:
+                bucket = table.get(chunk ^ mask)
+                if bucket:
+                    candidates.update(bucket)
+
+        best, values = max_distance + 1, []
+        for candidate in candidates:
+            distance = hamming(value_hash, candidate)
+            if distance > max_distance:
+                continue
+            if distance < best:
+                best, values = distance, list(self._values[candidate])
+            elif distance == best:
+                values.extend(self._values[candidate])
+
+        return (best, values) if values else (-1, [])
+
+
+def _chunk(value_hash: int, i: int) -> int:
+    """取第 i 段"""
+    return (value_hash >> (CHUNK_BITS * i)) & ((1 << CHUNK_BITS) - 1)
+
+
+class FrameIndex:
+    """录制步骤的画面指纹索引"""
+
+    def __init__(self):
+        self._hashes = MultiIndexHash()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    @classmethod
+    def from_steps(cls, steps) -> "FrameIndex":
+        """由编译后的步骤（frame_hash 字段）建立索引"""
+        index = cls()
+        for step in steps:
+            if step.frame_hash is not None:
+                index.add(step.frame_hash, step.index)
+        return index
+
+    def add(self, frame_hash: int, step_index: int) -> None:
+        """登记步骤画面"""
+        self._hashes.add(frame_hash, step_index)
+
+    def nearest(
+        self,
+        frame_hash: int,
+        max_distance: int,
+        near: Optional[int] = None,
+    ) -> Optional[tuple[int, int]]:
+        """
+        查找画面最相近的步骤
+
+        同一距离有多个步骤时，优先取 near 及其之后最近的步骤，其次取 near 之前最近的
+
+        Returns:
+            (步骤索引, 汉明距离)，半径内没有匹配时返回 None
+        """
+        distance, candidates = self._hashes.nearest(frame_hash, max_distance)
+        if not candidates:
+            return None
+
+        if near is None:
+            return min(candidates), distance
+
+        ahead = [i for i in candidates if i >= near]
+        return (min(ahead) if ahead else max(candidates)), distance
@@ -0,0 +1,43 @@
+"""
+画面比对工具
+截取并缩小屏幕区域，计算帧间差异
+"""
+
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from .models import Position
+
+
+def to_signature(image: Image.Image, size: int = 32) -> np.ndarray:
+    """将图片缩小为 size×size 灰度数组，用于快速比对"""
+    small = image.convert("L").resize((size, size), Image.BILINEAR)
+    return np.asarray(small, dtype=np.float32)
+
+
+def mean_abs_diff(a: np.ndarray, b: np.ndarray) -> float:
+    """两个签名的平均绝对差 (0-255)"""
+    if a.shape != b.shape:
+        return 255.0
+    return float(np.mean(np.abs(a - b)))
+
+
+def capture_patch(
+    capture,
+    center: Position,
+    size: int,
+    signature_size: int = 32,
+) -> Optional[np.ndarray]:
+    """截取以 center 为中心、边长 size 的区域并返回其签名"""
+    half = size // 2
+    image = capture.capture_region(
+        max(0, center.x - half),
+        max(0, center.y - half),
+        size,
+        size
+    )
+    if image is None:
+        return None
+    return to_signature(image, signature_size)
@@ -0,0 +1,151 @@
+"""
+定位提示存储模块
+持久化每个步骤在历史运行中观察到的实际位置偏移，用于缩小后续运行的搜索区域
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .models import PlayerConfig, Position, StepHint
+
+
+# 提示库被其他连接（如服务与回放实例进程）锁定时的等待时间(s)
+DB_TIMEOUT = 10.0
+
+
+class HintStore:
+    """步骤定位提示存储 (SQLite)"""
+
+    def __init__(self, db_path: str = ":memory:", config: Optional[PlayerConfig] = None):
+        self.config = config or PlayerConfig()
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=DB_TIMEOUT)
+        if db_path != ":memory:":
+            # WAL：多个进程打开同一提示库时读不阻塞写
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS step_hints (
+                recording_id TEXT NOT NULL,
+                step_id TEXT NOT NULL,
+                offset_x INTEGER NOT NULL DEFAULT 0,
+                offset_y INTEGER NOT NULL DEFAULT 0,
+                confidence REAL NOT NULL DEFAULT 0,
+                expand INTEGER NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (recording_id, step_id)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, recording_id: str, step_id: str) -> Optional[StepHint]:
+        """获取步骤定位提示"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT offset_x, offset_y, confidence, expand, hits, misses "
+                "FROM step_hints WHERE recording_id = ? AND step_id = ?",
+                (recording_id, step_id),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        return StepHint(
+            offset_x=row[0],
+            offset_y=row[1],
+            confidence=row[2],
+            expand=row[3],
+            hits=row[4],
+            misses=row[5],
+        )
+
+    def record_success(
+        self,
+        recording_id: str,
+        step_id: str,
+        offset: Position,
+        confidence: float,
+    ) -> StepHint:
+        """
+        记录一次成功定位
+
+        搜索区域按 hint_shrink_factor 收缩，但不小于 hint_min_expand，
+        且至少覆盖本次偏移相对上次的漂移量
+        """
+        hint = self.get(recording_id, step_id)
+
+        if hint is None:
+            expand = self.config.search_region_expand
+            hint = StepHint(expand=expand)
+            drift = 0
+        else:
+            drift = max(abs(offset.x - hint.offset_x), abs(offset.y - hint.offset_y))
+
+        expand = int(hint.expand * self.config.hint_shrink_factor)
+        expand = max(expand, self.config.hint_min_expand, drift * 2)
+        expand = min(expand, self.config.search_region_expand)
+
+        hint.offset_x = offset.x
+        hint.offset_y = offset.y
+        hint.confidence = confidence
+        hint.expand = expand
+        hint.hits += 1
+
+        self._save(recording_id, step_id, hint)
+        return hint
+
+    def record_miss(self, recording_id: str, step_id: str) -> Optional[StepHint]:
+        """记录一次在提示区域内定位失败，恢复默认搜索区域"""
+        hint = self.get(recording_id, step_id)
+        if hint is None:
+            return None
+
+        hint.expand = self.config.search_region_expand
+        hint.confidence = hint.confidence / 2
+        hint.misses += 1
+
+        self._save(recording_id, step_id, hint)
+        return hint
+
+    def clear(self, recording_id: Optional[str] = None) -> None:
+        """清除提示（不指定录制则全部清除）"""
+        with self._lock:
+            if recording_id:
+                self._conn.execute(
+                    "DELETE FROM step_hints WHERE recording_id = ?", (recording_id,)
+                )
+            else:
+                self._conn.execute("DELETE FROM step_hints")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    def _save(self, recording_id: str, step_id: str, hint: StepHint) -> None:
+        """写入提示"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO step_hints "
+                "(recording_id, step_id, offset_x, offset_y, confidence, expand, hits, misses) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    recording_id,
+                    step_id,
+                    hint.offset_x,
+                    hint.offset_y,
+                    hint.confidence,
+                    hint.expand,
+                    hint.hits,
+                    hint.misses,
+                ),
+            )
+            self._conn.commit()
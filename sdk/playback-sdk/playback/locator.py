@@ -1,106 +1,395 @@
 """
 元素定位模块
-支持 OCR文字定位、图像模板匹配、固定坐标
+支持 OCR文字定位、图像模板匹配、特征点匹配、固定坐标
 """
 
 import io
-from typing import Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Callable, Optional
 from PIL import Image
 
+from .control import PlaybackControl
+from .deadline import Deadline
+from .features import FeatureMatcher
 from .models import Position, LocatorResult, PlayerConfig
+from .plan import search_roi
+from .tracing import NULL_TRACER, Tracer
 
 
 class ElementLocator:
     """元素定位器"""
 
-    def __init__(self, config: Optional[PlayerConfig] = None):
+    def __init__(
+        self,
+        config: Optional[PlayerConfig] = None,
+        control: Optional[PlaybackControl] = None,
+        tracer: Optional[Tracer] = None
+    ):
         self.config = config or PlayerConfig()
         self._ocr_adapter = None
         self._screen_capture = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # OCR 适配器通常不是线程安全的：所有识别调用在单个 OCR 线程上串行执行，
+        # 超时被放弃的调用仍在运行时不再提交新的调用
+        self._ocr_executor: Optional[ThreadPoolExecutor] = None
+        self._ocr_future: Optional[Future] = None
+        self._ocr_lock = threading.Lock()
+        self._ocr_ready = False
+        self._control = control
+        self._tracer = tracer or NULL_TRACER
+        self._features = FeatureMatcher(self.config)
+
+    def set_control(self, control: Optional[PlaybackControl]) -> None:
+        """设置播放控制令牌，等待与定位可被停止打断"""
+        self._control = control
+
+    def set_tracer(self, tracer: Optional[Tracer]) -> None:
+        """设置跨度记录器"""
+        self._tracer = tracer or NULL_TRACER
 
     def set_ocr_adapter(self, adapter) -> None:
-        """设置OCR适配器"""
-        self._ocr_adapter = adapter
+        """设置OCR适配器（每个适配器使用独立的 OCR 线程）"""
+        with self._ocr_lock:
+            if self._ocr_executor:
+                self._ocr_executor.shutdown(wait=False, cancel_futures=True)
+            self._ocr_adapter = adapter
+            self._ocr_executor = None
+            self._ocr_future = None
+            self._ocr_ready = False
 
     def set_screen_capture(self, capture) -> None:
         """设置屏幕捕获器"""
         self._screen_capture = capture
 
+    @property
+    def ocr_adapter(self):
+        """当前OCR适配器"""
+        return self._ocr_adapter
+
     def locate(
         self,
         text: Optional[str] = None,
         template: Optional[Image.Image] = None,
         fixed_position: Optional[Position] = None,
         hint_position: Optional[Position] = None,
+        search_expand: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+        search_roi: Optional[tuple[int, int, int, int]] = None,
     ) -> LocatorResult:
         """
         定位元素
 
-        优先级:
+        优先级 (按 locate_preference，默认):
         1. OCR 文字定位 (如果提供了 text)
         2. 模板匹配 (如果提供了 template)
-        3. 固定坐标 (如果提供了 fixed_position)
+        3. 特征点匹配 (如果提供了 template 且启用 feature_locate)
+        4. 固定坐标 (如果提供了 fixed_position)
+
+        启用 concurrent_locate 时，OCR 与模板匹配在同一帧上并发执行，
+        先得到可信结果者胜出，同时完成时按优先级取舍
+
+        顺序执行时剩余时间预算在尚未执行的策略间平均分配，
+        超时的策略被放弃，结果中 timed_out 标记为 True
 
         Args:
             text: 要查找的文字
             template: 模板图片
             fixed_position: 固定坐标
             hint_position: 提示坐标，用于缩小搜索范围
+            search_expand: 提示坐标周围的搜索扩展(px)，默认使用 search_region_expand
+            deadline: 截止时间，默认使用 ocr_timeout
+            search_roi: 预先计算的搜索区域 (x, y, width, height)，优先于 hint_position
         """
-        # 1. 尝试 OCR 文字定位
-        if text and self._ocr_adapter and self._screen_capture:
-            result = self._locate_by_text(text, hint_position)
-            if result.found:
-                return result
+        with self._tracer.span("locate", cat="locate", text=text or "", template=template is not None):
+            if deadline is None:
+                if text:
+                    self.ensure_ocr_ready()
+                deadline = self._default_deadline()
+
+            region = search_roi or self._search_region(hint_position, search_expand)
+
+            strategies = self._build_strategies(text, template)
+            timed_out = False
+
+            if len(strategies) > 1 and self.config.concurrent_locate:
+                result = self._locate_concurrent(strategies, region, deadline)
+                if result.found:
+                    return result
+                timed_out = result.timed_out
+            else:
+                for i, (method, strategy) in enumerate(strategies):
+                    result = self._run_with_deadline(
+                        method,
+                        partial(strategy, region, None),
+                        deadline.share(len(strategies) - i)
+                    )
+                    if result.found:
+                        return result
+                    timed_out = timed_out or result.timed_out
+
+            # 4. 使用固定坐标（定位超时则不回退，由调用方按超时处理）
+            if fixed_position and not timed_out:
+                return LocatorResult(
+                    found=True,
+                    position=fixed_position,
+                    confidence=1.0,
+                    method="fixed",
+                    message="Using fixed position"
+                )
 
-        # 2. 尝试模板匹配
-        if template and self._screen_capture:
-            result = self._locate_by_template(template, hint_position)
-            if result.found:
-                return result
+            return LocatorResult(
+                found=False,
+                timed_out=timed_out,
+                message="Locate timed out" if timed_out else "No element found"
+            )
+
+    def warmup(self) -> None:
+        """导入 OpenCV 并执行一次小尺寸模板匹配（首次调用会初始化线程池等）"""
+        import cv2
+        import numpy as np
+
+        image = np.zeros((32, 32, 3), dtype=np.uint8)
+        cv2.matchTemplate(image, image[:8, :8], cv2.TM_CCOEFF_NORMED)
+
+    def warmup_ocr(self) -> None:
+        """
+        在 OCR 线程上预热适配器（加载模型或建立连接），失败时抛出异常
+
+        适配器未实现 warmup 时以一次空白小图识别代替（首次识别通常会加载模型）
+        """
+        adapter = self._ocr_adapter
+        if adapter is None or self._ocr_ready:
+            return
+
+        warmup = getattr(adapter, "warmup", None)
+        if warmup is None:
+            blank = Image.new("RGB", (32, 32))
+            warmup = partial(adapter.find_text, blank, "")
+
+        future = self._submit_ocr(warmup, Deadline.unbounded())
+        if future is None:
+            return
+        if self._control is not None and not self._control.wait_futures([future]):
+            # 停止时不再等待，预热在 OCR 线程上继续
+            return
+        future.result()
+        self._ocr_ready = True
+
+    def ensure_ocr_ready(self) -> None:
+        """首次 OCR 定位前预热适配器，调用方应在开始计算定位时限之前调用"""
+        if self._ocr_adapter is None or self._ocr_ready:
+            return
+        with self._tracer.span("ocr_warmup", cat="locate"):
+            try:
+                self.warmup_ocr()
+            except Exception as e:
+                print(f"OCR warmup error: {e}")
+                # 预热失败时不再重复尝试，由定位调用报告错误
+                self._ocr_ready = True
+
+    def prepare_template(self, template: Image.Image) -> None:
+        """启用特征点定位时预先计算模板描述子"""
+        if self.config.feature_locate:
+            self._features.prepare(template)
+
+    def can_locate(self, text: Optional[str] = None, template: Optional[Image.Image] = None) -> bool:
+        """是否有可用的定位策略（不含固定坐标回退）"""
+        return bool(self._build_strategies(text, template))
+
+    def close(self) -> None:
+        """释放并发定位线程池与 OCR 线程"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        with self._ocr_lock:
+            if self._ocr_executor:
+                self._ocr_executor.shutdown(wait=False, cancel_futures=True)
+                self._ocr_executor = None
+            self._ocr_future = None
+
+    def _default_deadline(self) -> Deadline:
+        """按 ocr_timeout 创建默认截止时间"""
+        if self.config.ocr_timeout > 0:
+            return Deadline(self.config.ocr_timeout)
+        return Deadline.unbounded()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取定位线程池"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="locator"
+            )
+        return self._executor
 
-        # 3. 使用固定坐标
-        if fixed_position:
+    def _submit_ocr(self, task: Callable, deadline: Deadline) -> Optional[Future]:
+        """
+        提交到 OCR 线程
+
+        上一次调用（含超时后被放弃的调用）仍在运行时，在截止时间内等待其结束而不排队新的调用；
+        到期或被停止时返回 None
+        """
+        while True:
+            with self._ocr_lock:
+                inflight = self._ocr_future
+                if inflight is None or inflight.done():
+                    if self._ocr_executor is None:
+                        self._ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="locator-ocr")
+                    self._ocr_future = self._ocr_executor.submit(self._tracer.bind(task))
+                    return self._ocr_future
+            if deadline.expired() or (self._control is not None and self._control.stopped):
+                return None
+            if self._control is not None:
+                self._control.wait_futures([inflight], deadline.remaining())
+            else:
+                wait([inflight], timeout=deadline.remaining())
+
+    def _submit(self, method: str, task: Callable, deadline: Deadline) -> Optional[Future]:
+        """提交定位策略：OCR 在 OCR 线程上串行执行，其余在定位线程池中执行"""
+        if method == "ocr":
+            return self._submit_ocr(task, deadline)
+        return self._get_executor().submit(self._tracer.bind(task))
+
+    def _run_with_deadline(
+        self,
+        method: str,
+        strategy: Callable[[], LocatorResult],
+        deadline: Deadline,
+    ) -> LocatorResult:
+        """在截止时间内执行定位策略，超时则放弃等待"""
+        if not deadline.bounded and method != "ocr":
+            return strategy()
+
+        if deadline.expired():
             return LocatorResult(
-                found=True,
-                position=fixed_position,
-                confidence=1.0,
-                method="fixed",
-                message="Using fixed position"
+                found=False,
+                method=method,
+                timed_out=True,
+                message=f"{method} skipped: no time budget left"
             )
 
-        return LocatorResult(
-            found=False,
-            message="No element found"
-        )
+        future = self._submit(method, strategy, deadline)
+        if future is None:
+            return LocatorResult(
+                found=False,
+                method=method,
+                timed_out=True,
+                message=f"{method} busy: previous call still running"
+            )
+        if self._control is not None:
+            # 停止时不再等待
+            self._control.wait_futures([future], deadline.remaining())
+            if self._control.stopped and not future.done():
+                future.cancel()
+                return LocatorResult(found=False, method=method, message=f"{method} stopped")
+
+        try:
+            return future.result(timeout=deadline.remaining())
+        except FutureTimeoutError:
+            # 无法中断正在运行的 OCR 调用，放弃其结果（OCR 线程空闲前不再提交新的调用）
+            future.cancel()
+            return LocatorResult(
+                found=False,
+                method=method,
+                timed_out=True,
+                message=f"{method} timed out"
+            )
+
+    def _build_strategies(
+        self,
+        text: Optional[str],
+        template: Optional[Image.Image],
+    ) -> list[tuple[str, Callable]]:
+        """按优先级构建可用的定位策略列表"""
+        available = {}
+        if text and self._ocr_adapter and self._screen_capture:
+            available["ocr"] = partial(self._locate_by_text, text)
+        if template and self._screen_capture:
+            available["template"] = partial(self._locate_by_template, template)
+            if self.config.feature_locate:
+                available["feature"] = partial(self._locate_by_feature, template)
+
+        order = [m for m in self.config.locate_preference if m in available]
+        order += [m for m in available if m not in order]
+        return [(method, available[method]) for method in order]
+
+    def _locate_concurrent(
+        self,
+        strategies: list[tuple[str, Callable]],
+        region: Optional[tuple[int, int, int, int]],
+        deadline: Deadline,
+    ) -> LocatorResult:
+        """在同一帧上并发执行多个定位策略，先找到者胜出"""
+        frame = self._capture(region)
+        if not frame[0]:
+            return LocatorResult(found=False, message="Failed to capture screen")
+
+        rank = {method: i for i, (method, _) in enumerate(strategies)}
+        futures = {}
+        misses: list[LocatorResult] = []
+        for method, strategy in strategies:
+            future = self._submit(method, partial(strategy, region, frame), deadline)
+            if future is None:
+                misses.append(LocatorResult(
+                    found=False,
+                    method=method,
+                    timed_out=True,
+                    message=f"{method} busy: previous call still running"
+                ))
+            else:
+                futures[future] = method
+
+        pending = set(futures)
+        while pending:
+            if self._control is not None:
+                self._control.wait_futures(pending, deadline.remaining())
+                if self._control.stopped:
+                    for future in pending:
+                        future.cancel()
+                    return LocatorResult(found=False, message="Locate stopped")
+            done, pending = wait(
+                pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                for future in pending:
+                    future.cancel()
+                return LocatorResult(
+                    found=False,
+                    timed_out=True,
+                    message="Locate timed out: "
+                    + ", ".join(futures[f] for f in pending)
+                )
+            results = [f.result() for f in done]
+            found = [r for r in results if r.found]
+            if found:
+                # 尚未开始的策略直接取消，已在运行的结果将被丢弃
+                for future in pending:
+                    future.cancel()
+                return min(found, key=lambda r: rank.get(r.method, len(rank)))
+            misses.extend(results)
+
+        # 有策略超时（或 OCR 仍被占用）时按超时处理，与顺序执行一致
+        misses.sort(key=lambda r: (not r.timed_out, rank.get(r.method, len(rank))))
+        return misses[0] if misses else LocatorResult(found=False, message="No element found")
 
     def _locate_by_text(
         self,
         text: str,
-        hint_position: Optional[Position] = None
+        region: Optional[tuple[int, int, int, int]] = None,
+        frame: Optional[tuple[Image.Image, Position]] = None,
     ) -> LocatorResult:
         """通过OCR文字定位"""
         try:
-            # 获取搜索区域
-            if hint_position:
-                # 在提示位置周围搜索
-                expand = self.config.search_region_expand
-                x = max(0, hint_position.x - expand)
-                y = max(0, hint_position.y - expand)
-                width = expand * 2
-                height = expand * 2
-                screenshot = self._screen_capture.capture_region(x, y, width, height)
-                offset = Position(x, y)
-            else:
-                # 全屏搜索
-                screenshot = self._screen_capture.capture_window(None)
-                offset = Position(0, 0)
+            screenshot, offset = frame or self._capture(region)
 
             if not screenshot:
                 return LocatorResult(found=False, message="Failed to capture screen")
 
             # OCR 识别
-            position = self._ocr_adapter.find_text(screenshot, text)
+            with self._tracer.span("ocr", cat="locate", text=text):
+                position = self._ocr_adapter.find_text(screenshot, text)
             if position:
                 # 转换为屏幕坐标
                 screen_pos = Position(
@@ -131,36 +420,27 @@ class ElementLocator:
     def _locate_by_template(
         self,
         template: Image.Image,
-        hint_position: Optional[Position] = None
+        region: Optional[tuple[int, int, int, int]] = None,
+        frame: Optional[tuple[Image.Image, Position]] = None,
     ) -> LocatorResult:
         """通过模板匹配定位"""
         try:
             import cv2
             import numpy as np
 
-            # 获取搜索区域
-            if hint_position:
-                expand = self.config.search_region_expand
-                x = max(0, hint_position.x - expand)
-                y = max(0, hint_position.y - expand)
-                width = expand * 2
-                height = expand * 2
-                screenshot = self._screen_capture.capture_region(x, y, width, height)
-                offset = Position(x, y)
-            else:
-                screenshot = self._screen_capture.capture_window(None)
-                offset = Position(0, 0)
+            screenshot, offset = frame or self._capture(region)
 
             if not screenshot:
                 return LocatorResult(found=False, message="Failed to capture screen")
 
-            # 转换为 OpenCV 格式
-            screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            template_cv = cv2.cvtColor(np.array(template), cv2.COLOR_RGB2BGR)
+            with self._tracer.span("template", cat="locate"):
+                # 转换为 OpenCV 格式
+                screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                template_cv = cv2.cvtColor(np.array(template), cv2.COLOR_RGB2BGR)
 
-            # 模板匹配
-            result = cv2.matchTemplate(screenshot_cv, template_cv, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+                # 模板匹配
+                result = cv2.matchTemplate(screenshot_cv, template_cv, cv2.TM_CCOEFF_NORMED)
+                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
 
             if max_val >= self.config.match_threshold:
                 # 计算中心点
@@ -196,6 +476,74 @@ class ElementLocator:
                 message=f"Template matching error: {str(e)}"
             )
 
+    def _locate_by_feature(
+        self,
+        template: Image.Image,
+        region: Optional[tuple[int, int, int, int]] = None,
+        frame: Optional[tuple[Image.Image, Position]] = None,
+    ) -> LocatorResult:
+        """通过特征点匹配定位（模板描述子缓存复用）"""
+        try:
+            screenshot, offset = frame or self._capture(region)
+
+            if not screenshot:
+                return LocatorResult(found=False, message="Failed to capture screen")
+
+            with self._tracer.span("feature", cat="locate"):
+                match = self._features.match(template, screenshot)
+
+            if match.found:
+                return LocatorResult(
+                    found=True,
+                    position=Position(int(match.x) + offset.x, int(match.y) + offset.y),
+                    confidence=match.confidence,
+                    method="feature",
+                    message=match.message
+                )
+
+            return LocatorResult(
+                found=False,
+                method="feature",
+                confidence=match.confidence,
+                message=match.message
+            )
+
+        except ImportError:
+            return LocatorResult(
+                found=False,
+                method="feature",
+                message="OpenCV not available"
+            )
+        except Exception as e:
+            return LocatorResult(
+                found=False,
+                method="feature",
+                message=f"Feature matching error: {str(e)}"
+            )
+
+    def _search_region(
+        self,
+        hint_position: Optional[Position] = None,
+        search_expand: Optional[int] = None,
+    ) -> Optional[tuple[int, int, int, int]]:
+        """提示坐标周围的搜索区域，无提示坐标时为全屏 (None)"""
+        if not hint_position:
+            return None
+        return search_roi(hint_position, search_expand or self.config.search_region_expand)
+
+    def _capture(
+        self,
+        region: Optional[tuple[int, int, int, int]] = None,
+    ) -> tuple[Optional[Image.Image], Position]:
+        """捕获搜索区域，返回截图及其屏幕偏移"""
+        with self._tracer.span("capture", cat="locate", region=region):
+            if region:
+                x, y, width, height = region
+                return self._screen_capture.capture_region(x, y, width, height), Position(x, y)
+
+            # 全屏搜索
+            return self._screen_capture.capture_window(None), Position(0, 0)
+
     def wait_for_text(
         self,
         text: str,
@@ -203,18 +551,24 @@ class ElementLocator:
         interval: int = 500
     ) -> LocatorResult:
         """等待文字出现"""
-        import time
-
-        start_time = time.time()
-        while (time.time() - start_time) * 1000 < timeout:
-            result = self._locate_by_text(text, None)
+        self.ensure_ocr_ready()
+        deadline = Deadline(timeout)
+        while not deadline.expired():
+            result = self._run_with_deadline(
+                "ocr",
+                partial(self._locate_by_text, text, None),
+                deadline.share(1, cap=self.config.ocr_timeout or None)
+            )
             if result.found:
                 return result
-            time.sleep(interval / 1000)
+            with self._tracer.span("sleep", cat="wait"):
+                if not deadline.sleep(interval / 1000, self._control):
+                    break
 
         return LocatorResult(
             found=False,
             method="ocr",
+            timed_out=True,
             message=f"Timeout waiting for text: {text}"
         )
 
@@ -225,17 +579,22 @@ class ElementLocator:
         interval: int = 500
     ) -> LocatorResult:
         """等待图像出现"""
-        import time
-
-        start_time = time.time()
-        while (time.time() - start_time) * 1000 < timeout:
-            result = self._locate_by_template(template, None)
+        deadline = Deadline(timeout)
+        while not deadline.expired():
+            result = self._run_with_deadline(
+                "template",
+                partial(self._locate_by_template, template, None),
+                deadline
+            )
             if result.found:
                 return result
-            time.sleep(interval / 1000)
+            with self._tracer.span("sleep", cat="wait"):
+                if not deadline.sleep(interval / 1000, self._control):
+                    break
 
         return LocatorResult(
             found=False,
             method="template",
+            timed_out=True,
             message="Timeout waiting for template"
         )
@@ -4,7 +4,7 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 
 class PlaybackStatus(Enum):
@@ -29,13 +29,71 @@ class StepResultStatus(Enum):
 class PlayerConfig:
     """播放器配置"""
     step_delay: int = 500  # 步骤间延迟(ms)
+    timing_mode: str = "fixed"  # fixed: 固定延迟; faithful: 还原录制间隔; scaled: 按 speed 缩放录制间隔
+    speed: float = 1.0  # scaled 模式速度倍率 (0.5 - 20)
+    min_step_gap: int = 30  # scaled 模式最小步骤间隔(ms)
+    drift_tolerance: int = 50  # 落后计划超过该值时顺延后续计划(ms)
+    pacing: str = "fixed"  # fixed: 固定 step_delay; adaptive: 画面稳定后继续
+    batch_fixed_steps: bool = False  # 连续的固定坐标点击/按键/输入步骤合并为一批快速执行（仅 fixed 调度与节奏、未启用点击校验时）
+    batch_gap: int = 5  # 批内动作间隔(ms)，也用作批内逐字输入间隔（window_type_delays 仍生效）
+    batch_max_steps: int = 100  # 每批最多步骤数，批之间照常等待 step_delay 与检查暂停
+    settle_stable_ms: int = 150  # 画面保持稳定多久视为完成(ms)
+    settle_max_ms: int = 3000  # 最长等待画面稳定(ms)
+    settle_poll_ms: int = 30  # 画面稳定检测轮询间隔(ms)
+    settle_region_size: int = 400  # 观察区域边长(px)，0 表示整个窗口
+    settle_diff_threshold: float = 2.0  # 视为无变化的平均灰度差 (0-255)
+    adaptive_click_delay: int = 10  # adaptive 模式下动作前的延迟(ms)
+    verify_clicks: bool = False  # 点击后校验目标区域画面是否变化，用于发现被丢弃的点击
+    verify_region_size: int = 160  # 校验区域边长(px)
+    verify_window_ms: int = 300  # 点击后等待画面变化的最长时间(ms)
+    verify_poll_ms: int = 30  # 校验轮询间隔(ms)
+    verify_diff_threshold: float = 3.0  # 视为已变化的平均灰度差 (0-255)
+    verify_reissue: int = 0  # 无变化时重新点击的次数，用尽后步骤失败
     click_delay: int = 100  # 点击延迟(ms)
     type_delay: int = 50  # 输入字符间延迟(ms)
-    retry_count: int = 3  # 失败重试次数
-    retry_delay: int = 1000  # 重试间隔(ms)
+    input_strategy: str = "char"  # 输入方式: char 逐字; batch 整串; paste 剪贴板粘贴（步骤可单独指定）
+    window_type_delays: dict[str, int] = field(default_factory=dict)  # 目标窗口标题/进程名 → 逐字输入最小间隔(ms)
+    paste_restore_delay: int = 100  # 粘贴后恢复原剪贴板前的等待(ms)
+    follow_window: bool = False  # 固定坐标跟随目标窗口（按录制时的窗口矩形换算窗口偏移与 DPI 缩放）
+    window_check_steps: int = 20  # 每隔多少步重新校验目标窗口位置，0 表示只在开始执行时查找一次
+    retry_count: int = 3  # 定位失败重试次数（只重新截图定位，不重复发送输入）
+    retry_before_fallback: bool = False  # 有录制坐标的步骤也先重试定位再回退；默认未找到即回退录制坐标，只有无坐标可回退的步骤重试
+    retry_delay: int = 1000  # 首次重试前的等待(ms)
+    retry_backoff: float = 2.0  # 重试等待指数退避倍数，1 为固定间隔
+    retry_max_delay: int = 5000  # 单次重试等待上限(ms)
+    retry_jitter: float = 0.2  # 重试等待随机抖动比例 (0-1)
+    retry_expand_factor: float = 1.5  # 未找到目标时每次重试搜索区域扩大倍数
     search_region_expand: int = 200  # 搜索区域扩展(px)
     match_threshold: float = 0.8  # 图像匹配阈值
-    ocr_timeout: int = 5000  # OCR超时(ms)
+    ocr_timeout: int = 5000  # 单次定位超时(ms)，0 表示不限时
+    step_timeout: int = 0  # 单步总时限(ms)，含重试等待；0 表示按 ocr_timeout、重试次数与退避等待估算
+    hint_db_path: Optional[str] = None  # 定位提示库路径(SQLite)，为空则不启用
+    hint_min_expand: int = 40  # 定位提示最小搜索扩展(px)
+    hint_shrink_factor: float = 0.5  # 每次命中后搜索区域收缩比例
+    lookahead: bool = False  # 是否在步骤间延迟期间预解析下一步的目标位置
+    lookahead_patch_size: int = 48  # 预解析结果校验区域边长(px)
+    lookahead_max_diff: float = 6.0  # 校验区域允许的平均灰度差 (0-255)
+    resync_on_failure: bool = False  # 步骤失败时按当前画面查找录制中对应的步骤并从该步继续
+    resync_max_distance: int = 10  # 画面指纹匹配允许的最大汉明距离 (0-64)
+    resync_limit: int = 3  # 单次执行最多自动重新同步次数
+    feature_locate: bool = False  # 是否启用特征点定位（模板匹配失败时可应对缩放、遮挡）
+    feature_detector: str = "orb"  # 特征点算法: orb, akaze
+    feature_max_keypoints: int = 1000  # 每帧最多检测的特征点数
+    feature_ratio: float = 0.75  # 最近邻比值检验阈值
+    feature_min_matches: int = 8  # 变换估计最少内点数
+    concurrent_locate: bool = False  # 是否并发执行 OCR 与模板匹配
+    locate_preference: list[str] = field(default_factory=lambda: ["ocr", "template", "feature"])  # 定位策略优先级
+    prepare_workers: int = 4  # 预热并行线程数（模型加载、模板预取等）
+    asset_cache_dir: Optional[str] = None  # 模板本地缓存目录（None 表示不缓存）
+    asset_cache_max_mb: int = 512  # 模板本地缓存容量(MB)，超出时淘汰最久未使用的
+    asset_prefetch_workers: int = 8  # 模板并发下载数
+    trace: bool = False  # 是否记录步骤分阶段耗时跨度（可导出 Chrome trace）
+    trace_max_spans: int = 100000  # 最多保留的跨度数，超出后丢弃最早的
+    loop_iterations: int = 1  # 一次 play 循环执行录制的次数，0 表示不限次数（直到 loop_duration 或停止）
+    loop_duration: int = 0  # 循环执行总时长上限(s)，0 表示不限
+    log_capacity: int = 10000  # 内存中保留的最近步骤结果条数，0 表示不限
+    log_spill_path: Optional[str] = None  # 步骤结果追加写入的 JSON Lines 文件，为空则不落盘
+    log_spill_batch: int = 500  # 累计多少条结果写一次盘（每轮结束时也会写盘）
 
 
 @dataclass
@@ -56,6 +114,88 @@ class StepResult:
     retry_count: int = 0
     screenshot: Optional[bytes] = None
     error: Optional[str] = None
+    settle_time: int = 0  # 动作后等待画面稳定耗时(ms)
+    verify_time: int = 0  # 动作后校验画面变化耗时(ms)
+    locate_method: str = ""  # 定位方式: ocr, template, feature, fixed, ai
+    confidence: float = 0.0  # 定位置信度
+    phases: dict[str, float] = field(default_factory=dict)  # 各阶段自身耗时(ms)，启用 trace 时记录
+
+
+@dataclass
+class StepHint:
+    """步骤定位提示（历史运行中观察到的偏移）"""
+    offset_x: int = 0  # 实际位置相对录制坐标的偏移
+    offset_y: int = 0
+    confidence: float = 0.0
+    expand: int = 200  # 当前搜索扩展(px)
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class VerifyStats:
+    """点击后校验统计"""
+    checks: int = 0  # 校验次数
+    caught: int = 0  # 点击后画面无变化（疑似被丢弃）的次数
+    recovered: int = 0  # 重新点击后出现变化的次数
+    failed: int = 0  # 重新点击用尽仍无变化的次数
+    total_time: int = 0  # 校验总耗时(ms)
+
+    @property
+    def catch_rate(self) -> float:
+        """疑似丢失点击占比"""
+        return self.caught / self.checks if self.checks else 0.0
+
+    @property
+    def mean_time(self) -> float:
+        """平均每次校验耗时(ms)"""
+        return self.total_time / self.checks if self.checks else 0.0
+
+
+@dataclass
+class Readiness:
+    """预热结果"""
+    total: int = 0  # 总耗时(ms)，各项并行执行
+    phases: dict[str, int] = field(default_factory=dict)  # 各项耗时(ms): cv2, ocr, capture, ai, assets, templates
+    errors: dict[str, str] = field(default_factory=dict)  # 失败项及原因（不阻止执行）
+    templates: int = 0  # 已预取的模板数
+    missing_templates: list[str] = field(default_factory=list)  # 加载失败的模板地址
+
+    @property
+    def ready(self) -> bool:
+        """全部预热项均成功"""
+        return not self.errors and not self.missing_templates
+
+
+@dataclass
+class IterationStats:
+    """循环执行中单轮的汇总统计"""
+    iteration: int = 0  # 轮次（从 0 开始）
+    started_at: int = 0  # 开始时间（Unix 毫秒）
+    duration: int = 0  # 本轮耗时(ms)
+    steps: int = 0  # 已执行步骤数
+    succeeded: int = 0
+    failed: int = 0  # 失败或超时
+    skipped: int = 0
+    retries: int = 0  # 定位重试总次数
+    resyncs: int = 0  # 失败后自动重新同步次数
+    completed: bool = False  # 是否执行到最后一步
+
+    @property
+    def success_rate(self) -> float:
+        """步骤成功率"""
+        return self.succeeded / self.steps if self.steps else 0.0
+
+    def add(self, result: StepResult) -> None:
+        """计入一个步骤结果"""
+        self.steps += 1
+        self.retries += result.retry_count
+        if result.status == StepResultStatus.SUCCESS:
+            self.succeeded += 1
+        elif result.status == StepResultStatus.SKIPPED:
+            self.skipped += 1
+        else:
+            self.failed += 1
 
 
 @dataclass
@@ -64,5 +204,14 @@ class LocatorResult:
     found: bool = False
     position: Optional[Position] = None
     confidence: float = 0.0
-    method: str = ""  # ocr, template, fixed
+    method: str = ""  # ocr, template, feature, fixed
     message: str = ""
+    timed_out: bool = False
+
+
+@dataclass
+class Speculation:
+    """下一步骤的预解析定位结果"""
+    step_id: str
+    result: LocatorResult
+    patch: Any = None  # 目标区域的灰度签名，用于执行时校验
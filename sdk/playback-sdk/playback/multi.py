@@ -0,0 +1,503 @@
+"""
+多实例回放模块
+每个实例在独立进程中运行自己的 Player，绑定各自的 X 显示（Xvfb）或窗口、截图器与输入后端；
+OCR 由共享的工作进程池提供（模型只在池中加载），各实例的运行状态汇总到主进程
+"""
+
+import importlib
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Optional
+
+from PIL import Image
+
+from .assets import AssetCache, AssetPrefetcher
+from .models import PlayerConfig, StepResultStatus
+from .xdisplay import XDisplayCapture, XvfbDisplay
+
+
+# 实例进程上报状态的间隔(s)
+STATUS_INTERVAL = 0.5
+
+# 等待 OCR 池返回结果的默认最长时间(s)，实例中按 ocr_timeout 设置
+OCR_TIMEOUT = 30.0
+
+# 实例的结束状态
+FINISHED = ("completed", "stopped", "error")
+
+
+def resolve(factory: Any) -> Any:
+    """解析工厂：可调用对象，或 "模块:属性" 字符串"""
+    if isinstance(factory, str):
+        module, _, attr = factory.partition(":")
+        return getattr(importlib.import_module(module), attr)
+    return factory
+
+
+@dataclass
+class InstanceSpec:
+    """
+    实例配置
+
+    backend 为 "x11" 时使用 display 上的真实鼠标键盘与截图；
+    也可以是返回输入后端的工厂（"模块:属性" 或可序列化的可调用对象），
+    后端实现 capture_window 时同时作为截图器（如合成游戏画面）；
+    asset_fetcher 为返回模板下载函数（url → bytes）的工厂，录制中的模板不是 HTTP 地址
+    （如 minio://）时必须设置，否则预取失败，智能步骤只能回退录制坐标
+    """
+    name: str
+    recording: dict
+    config: dict = field(default_factory=dict)  # PlayerConfig 字段
+    backend: Any = "x11"
+    display: Optional[str] = None  # X 显示，x11 后端未指定时由 MultiRunner 启动 Xvfb 分配
+    window: Optional[dict] = None  # 目标窗口 {title, process_name, rect}，设置后固定坐标跟随该窗口
+    launch: Optional[list[str]] = None  # 在该显示上启动的程序（如游戏客户端）
+    asset_fetcher: Any = None  # 模板下载函数工厂，为空时按 HTTP 下载
+    start_index: int = 0
+
+
+@dataclass
+class InstanceStatus:
+    """实例运行状态"""
+    name: str
+    status: str = "starting"  # starting, playing, paused, completed, stopped, error
+    pid: Optional[int] = None
+    display: Optional[str] = None
+    current_step: int = 0
+    total_steps: int = 0
+    iteration: int = 0  # 已完成轮数
+    steps: int = 0  # 已执行步骤数（含各轮）
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0  # 开始执行后的时长(s)
+    error: Optional[str] = None
+
+    @property
+    def steps_per_sec(self) -> float:
+        """步骤吞吐"""
+        return self.steps / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class FleetStatus:
+    """多实例汇总状态"""
+    instances: list[InstanceStatus]
+    running: int = 0
+    steps: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    steps_per_sec: float = 0.0  # 各实例吞吐之和
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        data = asdict(self)
+        for item, instance in zip(data["instances"], self.instances):
+            item["steps_per_sec"] = instance.steps_per_sec
+        return data
+
+
+class OCRPool:
+    """
+    共享 OCR 工作进程池
+
+    OCR 模型在每个工作进程中只加载一次，所有实例通过队列提交请求；
+    各实例的结果队列须在启动前创建（队列只能在创建进程时传递）
+
+    Args:
+        factory: 创建 OCR 适配器的工厂（"模块:属性" 或可序列化的可调用对象）
+        clients: 实例名列表
+        workers: 工作进程数
+    """
+
+    def __init__(self, factory: Any, clients: list[str], workers: int = 1, context=None):
+        self._ctx = context or mp.get_context("spawn")
+        self._factory = factory
+        self._workers = max(1, workers)
+        self._requests = self._ctx.Queue()
+        self._responses = {name: self._ctx.Queue() for name in clients}
+        self._processes: list = []
+
+    def start(self) -> None:
+        """启动工作进程"""
+        for i in range(self._workers):
+            process = self._ctx.Process(
+                target=_ocr_worker,
+                args=(self._factory, self._requests, self._responses),
+                name=f"ocr-worker-{i}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def channel(self, client: str) -> tuple:
+        """实例使用的 (请求队列, 结果队列)，作为实例进程参数传入"""
+        return self._requests, self._responses[client]
+
+    def close(self, timeout: float = 5.0) -> None:
+        """停止工作进程"""
+        for _ in self._processes:
+            self._requests.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+
+
+class RemoteOCRAdapter:
+    """
+    实例进程中的 OCR 代理：把请求发送到共享 OCR 池并等待结果
+
+    结果由后台线程按请求 id 分发，等待期间不持锁；timeout 应与调用方的定位时限一致，
+    超时的请求不再等待，其迟到结果直接丢弃
+    """
+
+    def __init__(self, client: str, requests, responses, timeout: float = OCR_TIMEOUT):
+        self._client = client
+        self._requests = requests
+        self._responses = responses
+        self._timeout = timeout
+        self._ids = itertools.count()
+        self._pending: dict[int, Future] = {}
+        self._reader: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def warmup(self) -> None:
+        """让池中的工作进程加载模型（加载耗时不受定位时限约束）"""
+        self._call("warmup", None, timeout=max(self._timeout, OCR_TIMEOUT))
+
+    def recognize(self, image: Image.Image) -> list:
+        """识别图片中的所有文字"""
+        return self._call("recognize", image)
+
+    def find_text(self, image: Image.Image, text: str):
+        """查找指定文字的位置"""
+        return self._call("find_text", image, text)
+
+    def _call(self, method: str, image: Optional[Image.Image], *args, timeout: Optional[float] = None):
+        """发送请求并等待对应的结果"""
+        timeout = self._timeout if timeout is None else timeout
+        payload = None
+        if image is not None:
+            payload = (image.mode, image.size, image.tobytes())
+
+        future: Future = Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            if self._reader is None:
+                self._reader = threading.Thread(target=self._read, name="remote-ocr", daemon=True)
+                self._reader.start()
+
+        self._requests.put((self._client, request_id, method, payload, args))
+        try:
+            ok, value = future.result(timeout)
+        except FutureTimeoutError:
+            raise RuntimeError(f"OCR pool timeout after {timeout}s")
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+        if not ok:
+            raise RuntimeError(f"OCR error: {value}")
+        return value
+
+    def _read(self) -> None:
+        """接收结果队列并分发给等待中的请求（结果队列按实例共用）"""
+        while True:
+            response_id, ok, value = self._responses.get()
+            with self._lock:
+                future = self._pending.pop(response_id, None)
+            if future is not None:
+                future.set_result((ok, value))
+
+
+class MultiRunner:
+    """
+    多实例回放
+
+    每个实例一个进程（各自的事件循环、线程与 GIL），吞吐随核数扩展；
+    x11 实例未指定显示时依次启动 Xvfb :first_display、:first_display+1 ...
+
+    Args:
+        specs: 实例配置
+        ocr_factory: OCR 适配器工厂，设置后启动共享 OCR 池
+        ocr_workers: OCR 工作进程数
+        screen: Xvfb 屏幕尺寸
+        first_display: 自动分配的首个显示编号
+    """
+
+    def __init__(
+        self,
+        specs: list[InstanceSpec],
+        ocr_factory: Any = None,
+        ocr_workers: int = 1,
+        screen: tuple[int, int] = (1280, 720),
+        first_display: int = 100,
+    ):
+        names = [spec.name for spec in specs]
+        if len(set(names)) != len(names):
+            raise ValueError("Instance names must be unique")
+
+        self.specs = list(specs)
+        self._ocr_factory = ocr_factory
+        self._ocr_workers = ocr_workers
+        self._screen = screen
+        self._first_display = first_display
+
+        self._ctx = mp.get_context("spawn")
+        self._updates = self._ctx.Queue()
+        self._stop_event = self._ctx.Event()
+        self._processes: dict[str, Any] = {}
+        self._statuses: dict[str, InstanceStatus] = {}
+        self._status_lock = threading.Lock()
+        self._collector: Optional[threading.Thread] = None
+        self._displays: list[XvfbDisplay] = []
+        self._clients: list[subprocess.Popen] = []
+        self._ocr: Optional[OCRPool] = None
+
+    def start(self) -> None:
+        """分配显示、启动客户端程序、OCR 池与各实例进程"""
+        if self._processes:
+            raise RuntimeError("Already started")
+
+        try:
+            self.specs = [self._bind_display(i, spec) for i, spec in enumerate(self.specs)]
+            for spec in self.specs:
+                if spec.launch:
+                    env = {**os.environ, "DISPLAY": spec.display} if spec.display else None
+                    self._clients.append(subprocess.Popen(spec.launch, env=env))
+
+            if self._ocr_factory is not None:
+                self._ocr = OCRPool(
+                    self._ocr_factory, [spec.name for spec in self.specs], self._ocr_workers, self._ctx
+                )
+                self._ocr.start()
+
+            self._collector = threading.Thread(target=self._collect, name="multi-status", daemon=True)
+            self._collector.start()
+
+            for spec in self.specs:
+                self._statuses[spec.name] = InstanceStatus(
+                    spec.name, display=spec.display, total_steps=len(spec.recording.get("steps", []))
+                )
+                process = self._ctx.Process(
+                    target=_run_instance,
+                    args=(spec, self._updates, self._stop_event, self._ocr.channel(spec.name) if self._ocr else None),
+                    name=f"player-{spec.name}",
+                    daemon=True,
+                )
+                process.start()
+                self._processes[spec.name] = process
+        except Exception:
+            # 已启动的实例进程、OCR 池、客户端程序与 Xvfb 一并释放
+            self.close()
+            raise
+
+    def status(self) -> FleetStatus:
+        """各实例状态与汇总（进程异常退出的实例标记为 error）"""
+        with self._status_lock:
+            for name, process in self._processes.items():
+                status = self._statuses[name]
+                if status.status not in FINISHED and not process.is_alive():
+                    status.status = "error"
+                    status.error = status.error or f"Process exited with code {process.exitcode}"
+            instances = [replace(status) for status in self._statuses.values()]
+
+        fleet = FleetStatus(instances)
+        for instance in instances:
+            fleet.running += instance.status not in FINISHED
+            fleet.steps += instance.steps
+            fleet.succeeded += instance.succeeded
+            fleet.failed += instance.failed
+            fleet.steps_per_sec += instance.steps_per_sec
+        return fleet
+
+    def stop(self) -> None:
+        """停止所有实例"""
+        self._stop_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> FleetStatus:
+        """等待所有实例结束"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for process in self._processes.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            process.join(remaining)
+        # 进程退出前已发送最终状态，等待收集线程处理完
+        time.sleep(0.05)
+        return self.status()
+
+    def close(self) -> None:
+        """停止实例并释放 OCR 池、客户端程序与 Xvfb"""
+        self.stop()
+        for process in self._processes.values():
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+
+        if self._collector is not None:
+            self._updates.put(None)
+            self._collector.join(2)
+            self._collector = None
+        if self._ocr is not None:
+            self._ocr.close()
+            self._ocr = None
+        for client in self._clients:
+            if client.poll() is None:
+                client.terminate()
+        self._clients.clear()
+        for display in self._displays:
+            display.stop()
+        self._displays.clear()
+
+    def __enter__(self) -> "MultiRunner":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _bind_display(self, index: int, spec: InstanceSpec) -> InstanceSpec:
+        """x11 实例未指定显示时启动 Xvfb"""
+        if spec.backend != "x11" or spec.display:
+            return spec
+        display = XvfbDisplay(f":{self._first_display + index}", self._screen)
+        display.start()
+        self._displays.append(display)
+        return replace(spec, display=display.display)
+
+    def _collect(self) -> None:
+        """接收实例进程上报的状态"""
+        while True:
+            status = self._updates.get()
+            if status is None:
+                return
+            with self._status_lock:
+                self._statuses[status.name] = status
+
+
+def _ocr_worker(factory: Any, requests, responses: dict) -> None:
+    """OCR 工作进程：加载一次适配器，循环处理各实例的请求"""
+    adapter = None
+    while True:
+        item = requests.get()
+        if item is None:
+            return
+
+        client, request_id, method, payload, args = item
+        try:
+            if adapter is None:
+                adapter = resolve(factory)()
+            if method == "warmup":
+                warmup = getattr(adapter, "warmup", None)
+                value = warmup() if warmup is not None else None
+            else:
+                mode, size, data = payload
+                value = getattr(adapter, method)(Image.frombytes(mode, size, data), *args)
+            responses[client].put((request_id, True, value))
+        except Exception as e:
+            responses[client].put((request_id, False, str(e)))
+
+
+def _run_instance(spec: InstanceSpec, updates, stop_event, ocr: Optional[tuple]) -> None:
+    """实例进程入口：创建 Player 执行录制，定期上报状态"""
+    if spec.display:
+        # pynput 与截图按 DISPLAY 连接到该实例的显示
+        os.environ["DISPLAY"] = spec.display
+
+    from .backends import PynputBackend
+    from .player import Player
+
+    status = InstanceStatus(
+        spec.name,
+        pid=os.getpid(),
+        display=spec.display,
+        total_steps=len(spec.recording.get("steps", [])),
+    )
+    player = None
+    assets = None
+    start = time.perf_counter()
+
+    def on_step(_, result) -> None:
+        status.steps += 1
+        if result.status == StepResultStatus.SUCCESS:
+            status.succeeded += 1
+        elif result.status in (StepResultStatus.FAILED, StepResultStatus.TIMEOUT):
+            status.failed += 1
+
+    def on_iteration(stats) -> None:
+        status.iteration = stats.iteration + 1
+
+    def publish() -> None:
+        status.elapsed = time.perf_counter() - start
+        if player is not None:
+            status.current_step = player.get_current_step()
+            if status.status not in FINISHED:
+                status.status = player.get_status().value
+        updates.put(replace(status))
+
+    try:
+        config = PlayerConfig(**spec.config)
+        recording = spec.recording
+        if spec.window:
+            recording = {**recording, "target_window": spec.window}
+            config.follow_window = True
+
+        if spec.asset_fetcher is not None and config.asset_cache_dir:
+            assets = AssetPrefetcher(
+                AssetCache(config.asset_cache_dir, config.asset_cache_max_mb * 2**20),
+                fetcher=resolve(spec.asset_fetcher)(),
+                workers=config.asset_prefetch_workers,
+            )
+            # 缓存由上面的预取器打开，Player 不再按配置创建默认（HTTP）预取器
+            config.asset_cache_dir = None
+
+        player = Player(config)
+        if assets is not None:
+            player.set_asset_prefetcher(assets)
+        if spec.backend == "x11":
+            capture = XDisplayCapture(spec.display)
+            player.set_input_backend(PynputBackend())
+            player.set_screen_capture(capture)
+        else:
+            backend = resolve(spec.backend)()
+            player.set_input_backend(backend)
+            if hasattr(backend, "capture_window"):
+                player.set_screen_capture(backend)
+        if ocr is not None:
+            # 单次 OCR 等待不超过定位时限，超时后 OCR 线程即可处理下一次定位
+            timeout = config.ocr_timeout / 1000 if config.ocr_timeout > 0 else OCR_TIMEOUT
+            player.set_ocr_adapter(RemoteOCRAdapter(spec.name, *ocr, timeout=timeout))
+
+        player.on_step(on_step)
+        player.on_iteration(on_iteration)
+        player.load(recording)
+        player.prepare()
+        start = time.perf_counter()
+        player.play(spec.start_index)
+
+        while True:
+            try:
+                player.wait(STATUS_INTERVAL)
+                break
+            except FutureTimeoutError:
+                if stop_event.is_set():
+                    player.stop()
+                publish()
+        status.status = player.get_status().value
+    except Exception as e:
+        status.status = "error"
+        status.error = str(e)
+    finally:
+        publish()
+        if player is not None:
+            player.close()
+        if assets is not None:
+            assets.cache.close()
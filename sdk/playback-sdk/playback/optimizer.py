@@ -0,0 +1,381 @@
+"""
+录制优化模块
+离线改写录制为等价但更快的步骤序列：合并碎片输入与滚动、
+去除无效步骤与重复点击、合并等待，并根据定位提示标记目标从未移动的智能步骤
+"""
+
+import copy
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from .hints import HintStore
+from .models import PlayerConfig
+
+
+# 相邻步骤时间间隔超过该值(ms)时不合并（间隔可能是在等待界面响应）
+MERGE_GAP_MS = 1500
+
+# 相同点击的间隔不超过该值(ms)视为重复事件（低于双击间隔）
+DUPLICATE_CLICK_MS = 50
+
+# 起止点距离小于该值(px)的拖拽按点击处理
+MIN_DRAG_DISTANCE = 3
+
+# 滚动位置差在该值(px)内视为同一位置
+SCROLL_SLOP = 5
+
+# 拖拽平滑移动耗时(ms)，与 EventSimulator.drag 默认值一致
+DRAG_DURATION_MS = 500
+
+# 智能定位的估计耗时(ms)：截图 + 模板匹配
+SMART_LOCATE_MS = 200
+
+# 目标判定为从未移动所需的最少成功定位次数
+STABLE_MIN_HITS = 5
+
+# 录制 SDK 把双击记录为带该描述的点击步骤（前面通常紧跟同一位置的单击）
+DOUBLE_CLICK_DESCRIPTION = "双击"
+
+
+@dataclass
+class OptimizeChange:
+    """一项改写"""
+    rule: str  # noop, short_drag, merge_input, merge_scroll, duplicate_click, merge_wait, stable_smart
+    step_ids: list[str]  # 涉及的原步骤
+    saved_ms: int = 0  # 估计节省耗时
+    message: str = ""
+
+
+@dataclass
+class OptimizeReport:
+    """优化结果（耗时按 fixed 调度与配置中的延迟估算）"""
+    original_steps: int = 0
+    optimized_steps: int = 0
+    original_ms: int = 0  # 优化前估计耗时
+    optimized_ms: int = 0  # 优化后估计耗时
+    changes: list[OptimizeChange] = field(default_factory=list)
+    stable_steps: list[str] = field(default_factory=list)  # 目标从未移动、可改为固定坐标的智能步骤
+
+    @property
+    def saved_ms(self) -> int:
+        """估计节省耗时"""
+        return self.original_ms - self.optimized_ms
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {**asdict(self), "saved_ms": self.saved_ms}
+
+
+def estimate_step_ms(step: dict, config: Optional[PlayerConfig] = None) -> int:
+    """估计单步耗时(ms)：步骤间延迟 + 动作内的固定等待"""
+    config = config or PlayerConfig()
+    cost = config.step_delay
+    step_type = step.get("type", "")
+
+    if step_type in ("click", "scroll"):
+        cost += config.click_delay
+    elif step_type == "drag":
+        cost += config.click_delay + DRAG_DURATION_MS
+    elif step_type == "input":
+        if step.get("position"):
+            cost += config.click_delay * 2
+        if (step.get("input_mode") or config.input_strategy) == "char":
+            cost += config.type_delay * len(_input_text(step))
+    elif step_type == "wait" and (step.get("mode") or "time") == "time":
+        cost += step.get("duration") or 0
+
+    if step.get("mode") == "smart":
+        cost += SMART_LOCATE_MS
+    return cost
+
+
+def optimize_recording(
+    recording: dict,
+    config: Optional[PlayerConfig] = None,
+    hints: Optional[HintStore] = None,
+    downgrade_stable: bool = False,
+    merge_gap: int = MERGE_GAP_MS,
+) -> tuple[dict, OptimizeReport]:
+    """
+    优化录制
+
+    Args:
+        recording: 录制数据（不会被修改）
+        config: 估算耗时使用的播放器配置
+        hints: 定位提示库，用于找出目标从未移动的智能步骤
+        downgrade_stable: 是否把这些步骤直接改为固定坐标（否则只在报告中标记）
+        merge_gap: 相邻步骤间隔超过该值(ms)时不合并
+
+    Returns:
+        (优化后的录制, 报告)
+    """
+    config = config or PlayerConfig()
+    steps = copy.deepcopy(recording.get("steps", []))
+    report = OptimizeReport(
+        original_steps=len(steps),
+        original_ms=sum(estimate_step_ms(step, config) for step in steps),
+    )
+
+    optimizer = _Optimizer(config, report, merge_gap)
+    steps = optimizer.drop_noops(steps)
+    steps = optimizer.short_drags(steps)
+    steps = optimizer.merge_inputs(steps)
+    steps = optimizer.merge_scrolls(steps)
+    steps = optimizer.dedupe_clicks(steps)
+    steps = optimizer.merge_waits(steps)
+    if hints is not None:
+        optimizer.stable_smart(steps, hints, recording.get("id", ""), downgrade_stable)
+
+    for index, step in enumerate(steps):
+        if "index" in step:
+            step["index"] = index
+
+    report.optimized_steps = len(steps)
+    report.optimized_ms = sum(estimate_step_ms(step, config) for step in steps)
+    return {**recording, "steps": steps}, report
+
+
+class _Optimizer:
+    """各项改写规则，每项返回新的步骤列表并登记到报告"""
+
+    def __init__(self, config: PlayerConfig, report: OptimizeReport, merge_gap: int):
+        self.config = config
+        self.report = report
+        self.merge_gap = merge_gap
+
+    def drop_noops(self, steps: list[dict]) -> list[dict]:
+        """去除无效步骤：空输入、空按键、零时长等待"""
+        result = []
+        for step in steps:
+            step_type = step.get("type")
+            noop = (
+                (step_type == "input" and not _input_text(step) and not step.get("position"))
+                or (step_type == "key" and not step.get("key"))
+                or (
+                    step_type == "wait"
+                    and (step.get("mode") or "time") == "time"
+                    and not step.get("duration")
+                    and not step.get("condition")
+                )
+            )
+            if noop:
+                self._change("noop", [step], None, f"Dropped empty {step_type} step")
+            else:
+                result.append(step)
+        return result
+
+    def short_drags(self, steps: list[dict]) -> list[dict]:
+        """起止点几乎重合的拖拽（按下后手抖）改为点击"""
+        result = []
+        for step in steps:
+            start, end = _drag_points(step)
+            if (
+                step.get("type") == "drag"
+                and start is not None
+                and end is not None
+                and _distance(start, end) < MIN_DRAG_DISTANCE
+            ):
+                click = {
+                    key: value for key, value in step.items()
+                    if key not in ("from", "to", "from_pos", "to_pos")
+                }
+                click.update(type="click", position=dict(start), button="left")
+                self._change("short_drag", [step], click, "Drag without movement replayed as click")
+                step = click
+            result.append(step)
+        return result
+
+    def merge_inputs(self, steps: list[dict]) -> list[dict]:
+        """合并录制时按输入停顿切分的连续输入"""
+        result: list[dict] = []
+        for step in steps:
+            previous = result[-1] if result else None
+            if (
+                previous is not None
+                and step.get("type") == "input"
+                and previous.get("type") == "input"
+                and _plain(step)
+                and _plain(previous)
+                and step.get("input_mode") == previous.get("input_mode")
+                and (not step.get("position") or _same_position(step.get("position"), previous.get("position")))
+                and self._close(previous, step)
+            ):
+                merged = dict(previous)
+                field_name = "text" if previous.get("text") else "input_text"
+                merged[field_name] = _input_text(previous) + _input_text(step)
+                self._change("merge_input", [previous, step], merged, "Merged input fragments")
+                result[-1] = merged
+            else:
+                result.append(step)
+        return result
+
+    def merge_scrolls(self, steps: list[dict]) -> list[dict]:
+        """合并同一位置、同一方向的连续滚动"""
+        result: list[dict] = []
+        for step in steps:
+            previous = result[-1] if result else None
+            if (
+                previous is not None
+                and step.get("type") == "scroll"
+                and previous.get("type") == "scroll"
+                and _plain(step)
+                and _plain(previous)
+                and (step.get("direction") or "down") == (previous.get("direction") or "down")
+                and _near(step.get("position"), previous.get("position"), SCROLL_SLOP)
+                and self._close(previous, step)
+            ):
+                merged = dict(previous)
+                merged["amount"] = _scroll_amount(previous) + _scroll_amount(step)
+                self._change("merge_scroll", [previous, step], merged, "Merged scroll ticks")
+                result[-1] = merged
+            else:
+                result.append(step)
+        return result
+
+    def dedupe_clicks(self, steps: list[dict]) -> list[dict]:
+        """去除间隔极短的重复点击事件（双击及其前面的单击保留）"""
+        result: list[dict] = []
+        for i, step in enumerate(steps):
+            previous = result[-1] if result else None
+            following = steps[i + 1] if i + 1 < len(steps) else None
+            if (
+                previous is not None
+                and not _is_double_click(step)
+                and not (following is not None and _is_double_click(following))
+                and step.get("type") == "click"
+                and previous.get("type") == "click"
+                and step.get("mode", "fixed") == "fixed"
+                and previous.get("mode", "fixed") == "fixed"
+                and step.get("button", "left") == previous.get("button", "left")
+                and _same_position(step.get("position"), previous.get("position"))
+                and _within(previous, step, DUPLICATE_CLICK_MS)
+            ):
+                self._change("duplicate_click", [step], None, "Dropped duplicate click event")
+            else:
+                result.append(step)
+        return result
+
+    def merge_waits(self, steps: list[dict]) -> list[dict]:
+        """合并连续的固定时长等待"""
+        result: list[dict] = []
+        for step in steps:
+            previous = result[-1] if result else None
+            if previous is not None and _time_wait(step) and _time_wait(previous):
+                merged = dict(previous)
+                merged["duration"] = (previous.get("duration") or 0) + (step.get("duration") or 0)
+                self._change("merge_wait", [previous, step], merged, "Merged consecutive waits")
+                result[-1] = merged
+            else:
+                result.append(step)
+        return result
+
+    def stable_smart(self, steps: list[dict], hints: HintStore, recording_id: str, downgrade: bool) -> None:
+        """标记历次运行中目标位置从未变化的智能步骤（可选直接改为固定坐标）"""
+        for i, step in enumerate(steps):
+            if step.get("mode") != "smart" or step.get("type") != "click" or not step.get("position"):
+                continue
+            hint = hints.get(recording_id, step.get("id", ""))
+            # 搜索区域收缩到下限说明每次定位的漂移都很小
+            if (
+                hint is None
+                or hint.hits < STABLE_MIN_HITS
+                or hint.misses
+                or hint.expand > hints.config.hint_min_expand
+            ):
+                continue
+
+            self.report.stable_steps.append(step.get("id", ""))
+            position = step["position"]
+            fixed = dict(step)
+            fixed["mode"] = "fixed"
+            fixed["position"] = {
+                **position,
+                "x": int(position.get("x", 0)) + hint.offset_x,
+                "y": int(position.get("y", 0)) + hint.offset_y,
+            }
+            message = f"Target stable over {hint.hits} runs at offset ({hint.offset_x}, {hint.offset_y})"
+            if downgrade:
+                self._change("stable_smart", [step], fixed, message)
+                steps[i] = fixed
+            else:
+                saved = estimate_step_ms(step, self.config) - estimate_step_ms(fixed, self.config)
+                self.report.changes.append(OptimizeChange(
+                    "stable_smart", [step.get("id", "")], 0, f"{message}; can be fixed (saves ~{saved} ms)"
+                ))
+
+    def _close(self, first: dict, second: dict) -> bool:
+        """两步时间间隔不超过 merge_gap"""
+        return _within(first, second, self.merge_gap)
+
+    def _change(self, rule: str, before: list[dict], after: Optional[dict], message: str) -> None:
+        """登记一项改写及其估计节省耗时"""
+        saved = sum(estimate_step_ms(step, self.config) for step in before)
+        if after is not None:
+            saved -= estimate_step_ms(after, self.config)
+        self.report.changes.append(OptimizeChange(
+            rule, [step.get("id", "") for step in before], saved, message
+        ))
+
+
+def _within(first: dict, second: dict, gap: int) -> bool:
+    """
+    两步都有录制时间戳且间隔不超过 gap(ms)
+
+    界面中添加的步骤时间戳为 0，无法判断是否相邻，不参与合并与去重
+    """
+    a, b = first.get("timestamp") or 0, second.get("timestamp") or 0
+    return bool(a and b) and abs(b - a) <= gap
+
+
+def _input_text(step: dict) -> str:
+    """输入步骤的文字（与执行计划编译规则一致）"""
+    return step.get("text") or step.get("input_text") or ""
+
+
+def _plain(step: dict) -> bool:
+    """固定坐标且不带等待条件与 AI 配置的步骤"""
+    return (
+        step.get("mode", "fixed") == "fixed"
+        and not step.get("condition")
+        and not step.get("ai_config")
+    )
+
+
+def _is_double_click(step: dict) -> bool:
+    """录制的双击步骤"""
+    return step.get("type") == "click" and step.get("description") == DOUBLE_CLICK_DESCRIPTION
+
+
+def _scroll_amount(step: dict) -> int:
+    """滚动量（与执行计划编译规则一致：只有未指定时按 100 处理）"""
+    amount = step.get("amount")
+    return 100 if amount is None else amount
+
+
+def _time_wait(step: dict) -> bool:
+    """固定时长等待步骤"""
+    return step.get("type") == "wait" and (step.get("mode") or "time") == "time" and not step.get("condition")
+
+
+def _drag_points(step: dict) -> tuple[Optional[dict], Optional[dict]]:
+    """拖拽起止点"""
+    return step.get("from") or step.get("from_pos"), step.get("to") or step.get("to_pos")
+
+
+def _distance(a: dict, b: dict) -> float:
+    """两点距离"""
+    return ((a.get("x", 0) - b.get("x", 0)) ** 2 + (a.get("y", 0) - b.get("y", 0)) ** 2) ** 0.5
+
+
+def _same_position(a: Optional[dict], b: Optional[dict]) -> bool:
+    """坐标相同（均为空也视为相同）"""
+    if not a or not b:
+        return not a and not b
+    return a.get("x") == b.get("x") and a.get("y") == b.get("y")
+
+
+def _near(a: Optional[dict], b: Optional[dict], slop: int) -> bool:
+    """坐标差在 slop 以内（均为空也视为相同）"""
+    if not a or not b:
+        return not a and not b
+    return abs(a.get("x", 0) - b.get("x", 0)) <= slop and abs(a.get("y", 0) - b.get("y", 0)) <= slop
@@ -0,0 +1,270 @@
+"""
+执行计划模块
+将录制数据编译为不可变的步骤计划，回放时无需重复解析字典
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+from PIL import Image
+
+from .fingerprint import FrameIndex, parse_hash
+from .models import PlayerConfig, Position
+
+
+@dataclass(slots=True, eq=False)
+class TemplateHandle:
+    """模板句柄：同一地址只加载一次，计划复用时图片随之复用"""
+    url: str
+    image: Optional[Image.Image] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def get(self, loader: Callable[[str], Optional[Image.Image]]) -> Optional[Image.Image]:
+        """获取模板图片，首次调用时通过 loader 加载（失败下次重试）"""
+        if self.image is None:
+            with self._lock:
+                if self.image is None:
+                    self.image = loader(self.url)
+        return self.image
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledStep:
+    """编译后的步骤"""
+    index: int
+    id: str
+    type: str
+    mode: str
+    handler: Callable  # 预绑定的处理函数 handler(player, step, start_time, deadline)
+    raw: dict  # 原始步骤数据，回调时传出
+    timestamp: int = 0
+    frame_hash: Optional[int] = None  # 录制时该步画面的感知哈希
+
+    # 通用
+    position: Optional[Position] = None
+    text: Optional[str] = None
+    template: Optional[TemplateHandle] = None
+    search_roi: Optional[tuple[int, int, int, int]] = None  # 录制坐标周围的默认搜索区域
+
+    # click
+    button: str = "left"
+
+    # scroll
+    direction: str = "down"
+    amount: int = 100
+
+    # drag
+    from_position: Optional[Position] = None
+    to_position: Optional[Position] = None
+
+    # input / file_select
+    input_text: str = ""
+    input_mode: str = ""  # 输入方式，为空使用 input_strategy
+    file_path: str = ""
+
+    # key
+    keys: tuple[str, ...] = ()
+
+    # wait
+    wait_duration: int = 0
+    timeout: int = 30000
+    condition_type: str = ""
+    condition_value: str = ""
+    condition_template: Optional[TemplateHandle] = None
+
+    # ai_decision
+    ai_prompt: str = ""
+    ai_options: tuple = ()
+
+    @property
+    def locates(self) -> bool:
+        """是否需要定位（受定位时限与超时重试约束）"""
+        return self.type == "click" and self.mode in ("smart", "ai_decision")
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutionPlan:
+    """录制的执行计划"""
+    recording_id: str
+    fingerprint: str
+    steps: tuple[CompiledStep, ...]
+    templates: dict[str, TemplateHandle]
+    target_window: Optional[dict] = None
+    frame_index: FrameIndex = field(default_factory=FrameIndex)  # 步骤画面指纹索引
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+def search_roi(center: Position, expand: int) -> tuple[int, int, int, int]:
+    """计算以 center 为中心的搜索区域 (x, y, width, height)"""
+    x = max(0, center.x - expand)
+    y = max(0, center.y - expand)
+    return (x, y, expand * 2, expand * 2)
+
+
+def fingerprint(recording: dict) -> str:
+    """录制内容指纹"""
+    payload = json.dumps(
+        [recording.get("steps", []), recording.get("target_window")],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def compile_recording(
+    recording: dict,
+    handlers: dict[str, Callable],
+    config: Optional[PlayerConfig] = None,
+    unknown_handler: Optional[Callable] = None,
+    recording_fingerprint: Optional[str] = None,
+) -> ExecutionPlan:
+    """
+    编译录制为执行计划
+
+    Args:
+        recording: 录制数据
+        handlers: 步骤类型 → 处理函数
+        config: 播放器配置（用于预计算搜索区域）
+        unknown_handler: 未知步骤类型的处理函数
+        recording_fingerprint: 已计算的录制指纹
+    """
+    config = config or PlayerConfig()
+    templates: dict[str, TemplateHandle] = {}
+
+    def handle(url: Optional[str]) -> Optional[TemplateHandle]:
+        if not url:
+            return None
+        if url not in templates:
+            templates[url] = TemplateHandle(url)
+        return templates[url]
+
+    steps = tuple(
+        _compile_step(i, raw, handlers, unknown_handler, handle, config)
+        for i, raw in enumerate(recording.get("steps", []))
+    )
+
+    return ExecutionPlan(
+        recording_id=recording.get("id", ""),
+        fingerprint=recording_fingerprint or fingerprint(recording),
+        steps=steps,
+        templates=templates,
+        target_window=recording.get("target_window"),
+        frame_index=FrameIndex.from_steps(steps),
+    )
+
+
+def _position(data: Any) -> Optional[Position]:
+    """解析坐标"""
+    if not data:
+        return None
+    return Position(int(data.get("x", 0)), int(data.get("y", 0)))
+
+
+def _compile_step(
+    index: int,
+    raw: dict,
+    handlers: dict[str, Callable],
+    unknown_handler: Optional[Callable],
+    handle: Callable[[Optional[str]], Optional[TemplateHandle]],
+    config: PlayerConfig,
+) -> CompiledStep:
+    """编译单个步骤"""
+    step_type = raw.get("type", "")
+    mode = raw.get("mode") or ("time" if step_type == "wait" else "fixed")
+    position = _position(raw.get("position"))
+
+    key = raw.get("key") or ""
+    keys = tuple(key.split("+")) if key else ()
+
+    condition = raw.get("condition") or {}
+    condition_type = condition.get("type", "")
+    condition_value = condition.get("value", "")
+
+    ai_config = raw.get("ai_config") or {}
+
+    return CompiledStep(
+        index=index,
+        id=raw.get("id", ""),
+        type=step_type,
+        mode=mode,
+        handler=handlers.get(step_type, unknown_handler),
+        raw=raw,
+        timestamp=raw.get("timestamp") or 0,
+        frame_hash=parse_hash(raw.get("frame_hash")),
+        position=position,
+        text=raw.get("text"),
+        template=handle(raw.get("screenshot")) if mode == "smart" else None,
+        search_roi=search_roi(position, config.search_region_expand) if position else None,
+        button=raw.get("button") or "left",
+        direction=raw.get("direction") or "down",
+        amount=100 if raw.get("amount") is None else raw["amount"],
+        from_position=_position(raw.get("from") or raw.get("from_pos")),
+        to_position=_position(raw.get("to") or raw.get("to_pos")),
+        input_text=raw.get("text") or raw.get("input_text") or "",
+        input_mode=raw.get("input_mode") or "",
+        file_path=raw.get("file_path") or "",
+        keys=keys,
+        wait_duration=raw.get("duration") or 0,
+        timeout=raw.get("timeout") or 30000,
+        condition_type=condition_type,
+        condition_value=condition_value,
+        condition_template=handle(condition_value) if condition_type == "image_match" else None,
+        ai_prompt=ai_config.get("prompt", ""),
+        ai_options=tuple(ai_config.get("options", [])),
+    )
+
+
+class PlanCache:
+    """
+    执行计划 LRU 缓存，按录制 id 与内容指纹复用
+
+    计划中的模板句柄会缓存已加载的图片，因此键中还包含模板来源：
+    加载函数或资源缓存目录不同的播放器不共享计划
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._plans: OrderedDict[tuple, ExecutionPlan] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(
+        self,
+        recording: dict,
+        handlers: dict[str, Callable],
+        config: Optional[PlayerConfig] = None,
+        unknown_handler: Optional[Callable] = None,
+        template_source: Hashable = None,
+    ) -> ExecutionPlan:
+        """获取缓存的计划，内容变化或未缓存时重新编译（template_source 标识模板来源）"""
+        config = config or PlayerConfig()
+        digest = fingerprint(recording)
+        key = (recording.get("id", ""), digest, config.search_region_expand, template_source)
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = compile_recording(recording, handlers, config, unknown_handler, digest)
+
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._plans.clear()
+
+
+# 进程内共享的计划缓存
+plan_cache = PlanCache()
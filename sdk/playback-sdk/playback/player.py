@@ -4,7 +4,9 @@
 
 import time
 import asyncio
-import threading
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Callable
 from PIL import Image
 import io
@@ -15,9 +17,29 @@ from .models import (
     StepResult,
     StepResultStatus,
     Position,
+    LocatorResult,
+    Speculation,
+    VerifyStats,
+    IterationStats,
+    Readiness,
 )
+from .assets import AssetCache, AssetPrefetcher
+from .control import PlaybackControl
 from .simulator import EventSimulator
 from .locator import ElementLocator
+from .hints import HintStore
+from .deadline import Deadline
+from .runtime import AsyncRuntime
+from .fingerprint import dhash
+from .frames import capture_patch, mean_abs_diff
+from .settle import SettleDetector
+from .scheduler import ReplayScheduler
+from .plan import CompiledStep, ExecutionPlan, plan_cache
+from .resultlog import ResultLog
+from .retry import RetryPolicy
+from .tracing import Tracer
+from .verify import ActionVerifier
+from .window import WindowTracker
 
 
 class Player:
@@ -25,16 +47,45 @@ class Player:
 
     def __init__(self, config: Optional[PlayerConfig] = None):
         self.config = config or PlayerConfig()
+
+        # 控制令牌：暂停/继续/停止即时作用于所有阻塞点
+        self._control = PlaybackControl()
+
+        # 步骤分阶段耗时跨度（config.trace 未启用时为空操作）
+        self._tracer = Tracer(self.config.trace, self.config.trace_max_spans)
+
         self._simulator = EventSimulator(
-            click_delay=self.config.click_delay,
-            type_delay=self.config.type_delay
+            click_delay=(
+                self.config.adaptive_click_delay
+                if self.config.pacing == "adaptive"
+                else self.config.click_delay
+            ),
+            type_delay=self.config.type_delay,
+            control=self._control,
+            paste_restore_delay=self.config.paste_restore_delay,
+            tracer=self._tracer
         )
-        self._locator = ElementLocator(config)
+        # 批量快速执行使用的模拟器：动作前只等待 batch_gap
+        self._batch_simulator = EventSimulator(
+            click_delay=self.config.batch_gap,
+            type_delay=self.config.batch_gap,
+            control=self._control,
+            paste_restore_delay=self.config.paste_restore_delay,
+            backend=self._simulator.backend,
+            tracer=self._tracer
+        )
+        self._locator = ElementLocator(self.config, self._control, self._tracer)
+
+        # 目标窗口跟踪：固定坐标按窗口偏移与 DPI 缩放换算
+        self._window = WindowTracker(self.config, self._tracer)
 
         self._status = PlaybackStatus.IDLE
         self._current_step_index = 0
         self._recording = None
-        self._steps = []
+        self._plan: Optional[ExecutionPlan] = None
+        self._steps: tuple[CompiledStep, ...] = ()
+        self._batch_ends: list[int] = []  # 从每步开始的快速执行批次结束索引（不含）
+        self._type_delay: Optional[int] = None  # 目标窗口的逐字输入间隔(ms)
 
         # 回调
         self._on_step_callback: Optional[Callable] = None
@@ -46,12 +97,63 @@ class Player:
         # 屏幕捕获器
         self._screen_capture = None
 
-        # 控制标志
-        self._stop_flag = threading.Event()
-        self._pause_flag = threading.Event()
+        # 自定义模板加载器（返回 None 时按默认方式加载）
+        self._template_loader: Optional[Callable[[str], Optional[Image.Image]]] = None
+
+        # 资源预取：预热时批量下载模板到本地缓存，执行时只从缓存读取
+        self._assets: Optional[AssetPrefetcher] = None
+        if self.config.asset_cache_dir:
+            self._assets = AssetPrefetcher(
+                AssetCache(self.config.asset_cache_dir, self.config.asset_cache_max_mb * 2**20),
+                workers=self.config.asset_prefetch_workers,
+            )
+
+        # 定位提示存储
+        self._hint_store: Optional[HintStore] = None
+        if self.config.hint_db_path:
+            self._hint_store = HintStore(self.config.hint_db_path, self.config)
+
+        # 异步执行核心：常驻事件循环 + 串行步骤执行线程
+        self._runtime = AsyncRuntime()
+        self._step_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="player-step")
+        self._play_future: Optional[Future] = None
+        self._scheduler = ReplayScheduler(self.config, self._control)
+        self._retry_policy = RetryPolicy(self.config)
+
+        # 预解析：在步骤间延迟期间定位下一步目标
+        self._lookahead_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="player-lookahead")
+        self._lookahead_future: Optional[asyncio.Future] = None
+        self._speculations: dict[str, Speculation] = {}
+
+        # 预热（prepare）：play() 开始前等待其完成
+        self._prepare_future: Optional[Future] = None
 
-        # 日志
-        self._logs: list[StepResult] = []
+        # 点击后校验统计
+        self._verify_stats = VerifyStats()
+
+        # 本次执行中失败后自动重新同步的次数
+        self._resyncs = 0
+
+        # 日志：内存中只保留最近 log_capacity 条，可按批写入文件
+        self._logs = ResultLog(
+            self.config.log_capacity, self.config.log_spill_path, self.config.log_spill_batch
+        )
+
+        # 循环执行：每轮汇总统计（只保留最近 ITERATION_HISTORY 轮）
+        self._iterations: deque[IterationStats] = deque(maxlen=ITERATION_HISTORY)
+        self._iteration: Optional[IterationStats] = None
+        self._on_iteration_callback: Optional[Callable[[IterationStats], None]] = None
+
+        # 未调用 close() 的播放器被回收时同样释放事件循环线程、线程池与数据库连接
+        self._finalizer = weakref.finalize(
+            self,
+            _release,
+            self._runtime,
+            (self._step_executor, self._lookahead_executor),
+            self._locator,
+            self._hint_store,
+            self._assets.cache if self._assets else None,
+        )
 
     def set_ocr_adapter(self, adapter) -> None:
         """设置OCR适配器"""
@@ -61,19 +163,73 @@ class Player:
         """设置屏幕捕获器"""
         self._screen_capture = capture
         self._locator.set_screen_capture(capture)
+        self._window.set_source(capture)
+
+    def set_input_backend(self, backend) -> None:
+        """设置输入后端（如 VirtualBackend 用于无桌面环境回放）"""
+        self._simulator.set_backend(backend)
+        self._batch_simulator.set_backend(backend)
+
+    def set_template_loader(self, loader: Optional[Callable[[str], Optional[Image.Image]]]) -> None:
+        """设置模板加载器"""
+        self._template_loader = loader
+
+    def set_asset_prefetcher(self, prefetcher: Optional[AssetPrefetcher]) -> None:
+        """设置资源预取器：play() 前自动预热，模板从其本地缓存加载"""
+        self._assets = prefetcher
 
     def set_ai_engine(self, engine) -> None:
-        """设置AI决策引擎"""
+        """设置AI决策引擎，并将其绑定到播放器的事件循环"""
         self._ai_engine = engine
+        if hasattr(engine, "attach_loop"):
+            engine.attach_loop(self._runtime.loop)
+
+    @property
+    def runtime(self) -> AsyncRuntime:
+        """播放器的异步运行时"""
+        return self._runtime
+
+    @property
+    def tracer(self) -> Tracer:
+        """步骤跨度记录器"""
+        return self._tracer
+
+    def export_trace(self, path: str) -> None:
+        """保存本次执行的 Chrome trace JSON，可在 chrome://tracing 或 Perfetto 中打开"""
+        self._tracer.export(path)
+
+    def set_hint_store(self, store: Optional[HintStore]) -> None:
+        """设置定位提示存储"""
+        self._hint_store = store
 
     def load(self, recording: dict) -> None:
-        """加载录制数据"""
+        """加载录制数据（编译为执行计划，内容未变时复用缓存的计划）"""
         self._recording = recording
-        self._steps = recording.get("steps", [])
+        # 模板图片随计划缓存：模板来源（加载函数、资源缓存目录）相同的播放器才共享计划
+        template_source = (self._template_loader, str(self._assets.cache.root) if self._assets else None)
+        self.load_plan(plan_cache.get_or_compile(
+            recording, STEP_HANDLERS, self.config, Player._execute_unknown, template_source
+        ))
+
+    def load_plan(self, plan: ExecutionPlan) -> None:
+        """加载已编译的执行计划"""
+        self._plan = plan
+        self._steps = plan.steps
+        self._batch_ends = self._compute_batches(plan.steps)
+        self._type_delay = self._window_type_delay(plan.target_window)
+        self._window.reset(plan.target_window)
         self._current_step_index = 0
-        self._logs = []
+        self._logs.clear()
+        self._iterations.clear()
+        self._speculations.clear()
+        self._prepare_future = None
         self._set_status(PlaybackStatus.IDLE)
 
+    @property
+    def plan(self) -> Optional[ExecutionPlan]:
+        """当前执行计划"""
+        return self._plan
+
     def on_step(self, callback: Callable[[dict, StepResult], None]) -> None:
         """注册步骤完成回调"""
         self._on_step_callback = callback
@@ -82,36 +238,93 @@ class Player:
         """注册状态变更回调"""
         self._on_status_change_callback = callback
 
+    def on_iteration(self, callback: Callable[[IterationStats], None]) -> None:
+        """注册循环执行每轮结束回调"""
+        self._on_iteration_callback = callback
+
+    def prepare(self) -> Future:
+        """
+        预热：并行导入 OpenCV、加载 OCR 模型、打开截图会话、创建 AI 客户端并预取全部模板
+        （设置了资源预取器时先批量下载到本地缓存）
+
+        在后台执行并立即返回，play() 开始执行前会等待预热完成；
+        返回的 Future 结果为 Readiness（各项耗时与失败原因），预热失败不阻止执行
+        """
+        if self._prepare_future is None:
+            self._prepare_future = self._runtime.submit(self._prepare_async())
+        return self._prepare_future
+
+    def get_readiness(self) -> Optional[Readiness]:
+        """获取已完成的预热结果"""
+        future = self._prepare_future
+        if future is None or not future.done() or future.cancelled() or future.exception():
+            return None
+        return future.result()
+
     def play(self, start_index: int = 0) -> None:
-        """开始执行"""
+        """
+        开始执行
+
+        loop_iterations 不为 1 时循环执行录制（首轮从 start_index 开始，之后从头开始），
+        执行计划、模板、定位提示、OCR 等状态在各轮之间复用
+        """
         if self._status == PlaybackStatus.PLAYING:
             return
 
         self._current_step_index = start_index
-        self._stop_flag.clear()
-        self._pause_flag.clear()
+        self._speculations.clear()
+        self._control.reset()
+        self._tracer.clear()
+        self._verify_stats = VerifyStats()
+        self._resyncs = 0
+        self._iterations.clear()
+        if self._assets is not None:
+            # 模板须在执行前下载到本地，步骤执行中不访问网络
+            self.prepare()
+        self._window.reset(self._plan.target_window if self._plan else None)
+        self._scheduler.reset(self._steps, start_index)
         self._set_status(PlaybackStatus.PLAYING)
 
-        # 在新线程中执行
-        thread = threading.Thread(target=self._play_loop, daemon=True)
-        thread.start()
+        # 在常驻事件循环上执行
+        self._play_future = self._runtime.submit(self._play_async())
+        self._play_future.add_done_callback(self._on_play_done)
+
+    async def play_async(self, start_index: int = 0) -> PlaybackStatus:
+        """开始执行并等待结束，可在任意事件循环中 await"""
+        self.play(start_index)
+        if self._play_future:
+            await asyncio.wrap_future(self._play_future)
+        return self._status
+
+    def wait(self, timeout: Optional[float] = None) -> PlaybackStatus:
+        """阻塞等待当前执行结束"""
+        if self._play_future:
+            self._play_future.result(timeout=timeout)
+        return self._status
+
+    def close(self) -> None:
+        """停止执行并释放事件循环、线程池等资源（已结束的执行保留其最终状态）"""
+        if self._status in (PlaybackStatus.PLAYING, PlaybackStatus.PAUSED):
+            self.stop()
+        else:
+            self._control.stop()
+        self._finalizer()
 
     def pause(self) -> None:
         """暂停执行"""
         if self._status == PlaybackStatus.PLAYING:
-            self._pause_flag.set()
+            self._control.pause()
             self._set_status(PlaybackStatus.PAUSED)
 
     def resume(self) -> None:
         """继续执行"""
         if self._status == PlaybackStatus.PAUSED:
-            self._pause_flag.clear()
+            self._control.resume()
             self._set_status(PlaybackStatus.PLAYING)
 
     def stop(self) -> None:
         """停止执行"""
-        self._stop_flag.set()
-        self._pause_flag.clear()
+        self._control.stop()
         self._set_status(PlaybackStatus.STOPPED)
 
     def get_status(self) -> PlaybackStatus:
@@ -123,8 +336,87 @@ class Player:
         return self._current_step_index
 
     def get_logs(self) -> list[StepResult]:
-        """获取执行日志"""
-        return self._logs
+        """获取执行日志（最近 log_capacity 条）"""
+        return list(self._logs)
+
+    def get_iteration_stats(self) -> list[IterationStats]:
+        """获取循环执行各轮的汇总统计（含进行中的一轮）"""
+        stats = list(self._iterations)
+        if self._iteration is not None:
+            stats.append(self._iteration)
+        return stats
+
+    def resync_index(self, near: Optional[int] = None) -> Optional[int]:
+        """
+        按当前画面的感知哈希查找录制中最相近的步骤
+
+        Args:
+            near: 多个步骤画面相同时优先取该索引及其之后最近的步骤
+
+        Returns:
+            步骤索引，录制未记录画面哈希或没有足够相近的画面时返回 None
+        """
+        if not self._plan or not len(self._plan.frame_index) or not self._screen_capture:
+            return None
+
+        with self._tracer.span("resync", cat="resync"):
+            # 录制时哈希的是目标窗口画面，这里同样只截取窗口所在区域
+            self._window.step()
+            region = self._window.region()
+            if region is not None:
+                image = self._screen_capture.capture_region(*region)
+            else:
+                image = self._screen_capture.capture_window(None)
+            if image is None:
+                return None
+            match = self._plan.frame_index.nearest(dhash(image), self.config.resync_max_distance, near)
+        return match[0] if match else None
+
+    def locate_step(self, index: int) -> LocatorResult:
+        """
+        只定位不执行：按执行时的定位逻辑（含定位提示）在当前画面上查找步骤目标
+
+        用于离线评估；不发送输入、不重试、不回退到录制坐标、不写入定位提示。
+        支持智能点击与图像/文字出现等待条件，其余步骤返回未找到
+        """
+        if not self._plan or not 0 <= index < len(self._steps):
+            raise IndexError(f"Step index out of range: {index}")
+
+        step = self._steps[index]
+        text, template = None, None
+        if step.type == "click" and step.mode == "smart":
+            text = step.text
+            template = step.template.get(self._load_template) if step.template else None
+        elif step.type == "wait" and step.mode == "condition" and step.condition_type == "text_appear":
+            text = step.condition_value
+        elif step.type == "wait" and step.mode == "condition" and step.condition_type == "image_match":
+            template = step.condition_template.get(self._load_template)
+            if template is None:
+                return LocatorResult(found=False, message="Template image not found")
+        else:
+            return LocatorResult(found=False, message=f"Step does not locate: {step.type}/{step.mode}")
+
+        if text:
+            self._locator.ensure_ocr_ready()
+        self._window.step()
+        deadline = Deadline(self.config.ocr_timeout) if self.config.ocr_timeout > 0 else None
+        if step.type == "click":
+            return self._locate_with_hint(step, template, deadline, record=False)
+        return self._locator.locate(text=text, template=template, deadline=deadline)
+
+    def resync(self) -> Optional[int]:
+        """从当前画面对应的步骤开始执行（未在执行中时可用），返回起始步骤索引"""
+        if self._status in (PlaybackStatus.PLAYING, PlaybackStatus.PAUSED):
+            return None
+
+        index = self.resync_index(self._current_step_index)
+        if index is not None:
+            self.play(index)
+        return index
+
+    def get_verify_stats(self) -> VerifyStats:
+        """获取本次执行的点击校验统计（耗时与疑似丢失点击占比）"""
+        return self._verify_stats
 
     def _set_status(self, status: PlaybackStatus) -> None:
         """设置状态"""
@@ -132,332 +424,905 @@ class Player:
         if self._on_status_change_callback:
             self._on_status_change_callback(status)
 
+    def _on_play_done(self, future: Future) -> None:
+        """执行循环异常退出时标记错误"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error:
+            print(f"Playback loop error: {error}")
+            self._set_status(PlaybackStatus.ERROR)
+
     def _play_loop(self) -> None:
-        """执行循环"""
-        while self._current_step_index < len(self._steps):
-            # 检查停止标志
-            if self._stop_flag.is_set():
-                break
+        """执行循环（同步包装）"""
+        self._runtime.run(self._play_async())
+
+    def _wait_settle(self, step: CompiledStep, result: StepResult) -> tuple[int, bool]:
+        """等待动作后的画面稳定，观察动作位置附近区域"""
+        center = result.actual_position or self._window.apply(step.position)
+        return SettleDetector(self._screen_capture, self.config, self._control).wait(center)
+
+    def _start_lookahead(self, loop: asyncio.AbstractEventLoop) -> None:
+        """为下一个智能点击步骤启动预解析"""
+        self._lookahead_future = None
+        if not self.config.lookahead or self._current_step_index >= len(self._steps):
+            return
 
-            # 检查暂停标志
-            while self._pause_flag.is_set():
-                time.sleep(0.1)
-                if self._stop_flag.is_set():
-                    return
+        step = self._steps[self._current_step_index]
+        if step.type != "click" or step.mode != "smart":
+            return
 
-            step = self._steps[self._current_step_index]
-            result = self._execute_step(step)
-            self._logs.append(result)
+        self._lookahead_future = loop.run_in_executor(
+            self._lookahead_executor, self._speculate, step
+        )
 
-            # 触发回调
-            if self._on_step_callback:
-                self._on_step_callback(step, result)
+    async def _collect_lookahead(self) -> None:
+        """等待预解析完成（最多 ocr_timeout），并登记其结果"""
+        future = self._lookahead_future
+        self._lookahead_future = None
+        if future is None:
+            return
 
-            # 如果失败且未重试成功，停止执行
-            if result.status == StepResultStatus.FAILED:
-                self._set_status(PlaybackStatus.ERROR)
-                return
+        # 预解析未完成时等待，避免与步骤自身的 OCR 并发
+        timeout = self.config.ocr_timeout / 1000 if self.config.ocr_timeout > 0 else None
+        done, _ = await asyncio.wait({future}, timeout=timeout)
+        if not done or future.exception():
+            return
 
-            self._current_step_index += 1
+        speculation = future.result()
+        if speculation:
+            self._speculations[speculation.step_id] = speculation
+
+    def _discard_lookahead(self) -> None:
+        """丢弃预解析结果并取消进行中的预解析"""
+        if self._lookahead_future is not None:
+            self._lookahead_future.cancel()
+            self._lookahead_future = None
+        self._speculations.clear()
+
+    def _speculate(self, step: CompiledStep) -> Optional[Speculation]:
+        """预取模板并在当前画面上推测定位下一步目标"""
+        with self._tracer.span("lookahead", cat="lookahead", step_id=step.id):
+            return self._speculate_locate(step)
+
+    def _speculate_locate(self, step: CompiledStep) -> Optional[Speculation]:
+        """预解析定位"""
+        template = step.template.get(self._load_template) if step.template else None
+        if not self._screen_capture:
+            return None
 
-            # 步骤间延迟
-            time.sleep(self.config.step_delay / 1000)
+        if step.text:
+            self._locator.ensure_ocr_ready()
+        deadline = Deadline(self.config.ocr_timeout) if self.config.ocr_timeout > 0 else None
+        result = self._locate_with_hint(step, template, deadline, record=False)
+        if not result.found:
+            return None
 
-        # 执行完成
-        if not self._stop_flag.is_set():
-            self._set_status(PlaybackStatus.COMPLETED)
+        patch = capture_patch(self._screen_capture, result.position, self.config.lookahead_patch_size)
+        if patch is None:
+            return None
 
-    def _execute_step(self, step: dict) -> StepResult:
-        """执行单个步骤"""
-        step_id = step.get("id", "")
-        step_type = step.get("type", "")
-        mode = step.get("mode", "fixed")
-        start_time = time.time()
+        return Speculation(step_id=step.id, result=result, patch=patch)
 
-        retry_count = 0
-        last_error = None
+    def _validate_speculation(self, speculation: Speculation) -> Optional[LocatorResult]:
+        """用新画面校验预解析结果，目标区域无明显变化则直接采用"""
+        result = speculation.result
+        patch = capture_patch(self._screen_capture, result.position, self.config.lookahead_patch_size)
+        if patch is None or mean_abs_diff(patch, speculation.patch) > self.config.lookahead_max_diff:
+            return None
+
+        return LocatorResult(
+            found=True,
+            position=result.position,
+            confidence=result.confidence,
+            method=result.method,
+            message=f"Lookahead: {result.message}"
+        )
 
-        while retry_count <= self.config.retry_count:
+    async def _prepare_async(self) -> Readiness:
+        """并行执行各项预热，分别计时"""
+        loop = asyncio.get_running_loop()
+        readiness = Readiness()
+        start = time.perf_counter()
+
+        async def timed(name: str, *tasks) -> None:
+            begin = time.perf_counter()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            readiness.phases[name] = int((time.perf_counter() - begin) * 1000)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                readiness.errors[name] = str(errors[0])
+
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, self.config.prepare_workers), thread_name_prefix="player-prepare"
+        )
+        try:
+            def in_pool(fn, *args):
+                return loop.run_in_executor(pool, fn, *args)
+
+            templates = list(self._plan.templates.values()) if self._plan else []
+            phases = []
+            if templates:
+                phases.append(timed("cv2", in_pool(self._locator.warmup)))
+            if self._locator.ocr_adapter is not None:
+                phases.append(timed("ocr", in_pool(self._locator.warmup_ocr)))
+            if self._screen_capture is not None:
+                phases.append(timed("capture", in_pool(self._screen_capture.capture_window, None)))
+            if self._ai_engine is not None and hasattr(self._ai_engine, "warmup"):
+                phases.append(timed("ai", self._ai_engine.warmup()))
+            if templates:
+                phases.append(self._prepare_templates(templates, timed, in_pool))
+
+            with self._tracer.span("prepare", cat="prepare"):
+                await asyncio.gather(*phases)
+        finally:
+            pool.shutdown(wait=False)
+
+        for template in templates:
+            if template.image is None:
+                readiness.missing_templates.append(template.url)
+        readiness.templates = len(templates) - len(readiness.missing_templates)
+        readiness.total = int((time.perf_counter() - start) * 1000)
+        return readiness
+
+    async def _prepare_templates(self, templates, timed, in_pool) -> None:
+        """批量下载模板到本地缓存（已设置预取器时），再并行加载并计算描述子"""
+        if self._assets is not None:
+            await timed("assets", in_pool(self._assets.prefetch, [t.url for t in templates]))
+        await timed("templates", *(in_pool(self._prefetch_template, t) for t in templates))
+
+    def _prefetch_template(self, template) -> None:
+        """加载模板并预先计算特征点描述子"""
+        image = template.get(self._load_template)
+        if image is not None:
+            self._locator.prepare_template(image)
+
+    async def _play_async(self) -> None:
+        """按 loop_iterations / loop_duration 循环执行录制"""
+        # 调用过 prepare() 时先等待预热完成（失败项在步骤执行时按原方式延迟初始化）
+        if self._prepare_future is not None:
+            with self._tracer.span("prepare_wait", cat="prepare"):
+                await asyncio.wait({asyncio.wrap_future(self._prepare_future)})
+
+        started = time.monotonic()
+        iteration = 0
+
+        while True:
+            self._iteration = IterationStats(iteration=iteration, started_at=int(time.time() * 1000))
             try:
-                if step_type == "click":
-                    return self._execute_click(step, start_time, retry_count)
-                elif step_type == "scroll":
-                    return self._execute_scroll(step, start_time)
-                elif step_type == "drag":
-                    return self._execute_drag(step, start_time)
-                elif step_type == "input":
-                    return self._execute_input(step, start_time)
-                elif step_type == "key":
-                    return self._execute_key(step, start_time)
-                elif step_type == "wait":
-                    return self._execute_wait(step, start_time)
-                elif step_type == "file_select":
-                    return self._execute_file_select(step, start_time)
-                else:
-                    return StepResult(
-                        step_id=step_id,
-                        status=StepResultStatus.SKIPPED,
-                        message=f"Unknown step type: {step_type}",
-                        duration=int((time.time() - start_time) * 1000)
-                    )
+                completed = await self._play_iteration()
+            finally:
+                self._finish_iteration()
+            if not completed:
+                return
+
+            iteration += 1
+            if self.config.loop_iterations and iteration >= self.config.loop_iterations:
+                break
+            if self.config.loop_duration and time.monotonic() - started >= self.config.loop_duration:
+                break
+
+            # 下一轮从头开始，只重置进度，缓存与已学到的状态保留
+            self._current_step_index = 0
+            self._resyncs = 0
+            self._discard_lookahead()
+            self._scheduler.reset(self._steps, 0)
+
+        self._set_status(PlaybackStatus.COMPLETED)
+
+    def _finish_iteration(self) -> None:
+        """结束当前一轮：写出日志并登记汇总统计"""
+        stats = self._iteration
+        self._iteration = None
+        self._logs.flush()
+        if stats is None:
+            return
 
+        stats.duration = int(time.time() * 1000) - stats.started_at
+        stats.resyncs = self._resyncs
+        stats.completed = self._current_step_index >= len(self._steps)
+        self._iterations.append(stats)
+        if self._on_iteration_callback:
+            try:
+                self._on_iteration_callback(stats)
             except Exception as e:
-                last_error = str(e)
-                retry_count += 1
-                if retry_count <= self.config.retry_count:
-                    time.sleep(self.config.retry_delay / 1000)
+                print(f"Iteration callback error: {e}")
 
-        return StepResult(
-            step_id=step_id,
-            status=StepResultStatus.FAILED,
-            message=f"Failed after {retry_count} retries",
-            error=last_error,
-            duration=int((time.time() - start_time) * 1000),
-            retry_count=retry_count
-        )
+    async def _play_iteration(self) -> bool:
+        """
+        执行一轮：步骤在专用线程中串行执行，协程工作在事件循环上进行
+
+        Returns:
+            是否执行到最后一步（被停止或出错时为 False）
+        """
+        loop = asyncio.get_running_loop()
+
+        while self._current_step_index < len(self._steps):
+            # 暂停时在控制令牌上等待继续（暂停时长从调度计划中扣除），停止则退出
+            paused_before = self._control.paused_total()
+            if not await self._control.checkpoint_async():
+                return False
+            self._scheduler.shift(self._control.paused_total() - paused_before)
+
+            step = self._steps[self._current_step_index]
+            await self._collect_lookahead()
+            self._scheduler.mark_start()
+
+            end = self._batch_ends[self._current_step_index]
+            adaptive = self.config.pacing == "adaptive" and self._screen_capture is not None
+            if end - self._current_step_index > 1:
+                # 连续的固定坐标步骤一次提交，批内不做单步延迟（遇到失败或停止时提前结束）
+                steps = self._steps[self._current_step_index:end]
+                results = await loop.run_in_executor(self._step_executor, self._execute_batch, steps)
+            else:
+                steps = (step,)
+                result = await loop.run_in_executor(self._step_executor, self._execute_step, step)
 
-    def _execute_click(self, step: dict, start_time: float, retry_count: int) -> StepResult:
+                # adaptive 模式：等待画面稳定代替固定延迟
+                if adaptive and result.status == StepResultStatus.SUCCESS:
+                    result.settle_time, _ = await loop.run_in_executor(
+                        self._step_executor, self._wait_settle, step, result
+                    )
+                    if self._tracer.enabled:
+                        result.phases["settle"] = float(result.settle_time)
+                results = [result]
+
+            for step, result in zip(steps, results):
+                # 回调时索引指向刚执行的步骤
+                self._current_step_index = step.index
+                self._logs.append(result, self._iteration.iteration)
+                self._iteration.add(result)
+
+                # 触发回调
+                if self._on_step_callback:
+                    self._on_step_callback(step.raw, result)
+
+            # 步骤执行中被停止：不再按失败处理
+            if self._control.stopped:
+                return False
+
+            # 如果失败且未重试成功，停止执行（等待步骤超时仍继续）
+            if result.status == StepResultStatus.FAILED or (
+                result.status == StepResultStatus.TIMEOUT and step.type != "wait"
+            ):
+                # 按画面重新同步到录制中的对应步骤后继续
+                index = await loop.run_in_executor(self._step_executor, self._auto_resync)
+                if index is None:
+                    self._set_status(PlaybackStatus.ERROR)
+                    return False
+                # 进度已跳转，之前的预解析针对的画面与步骤都不再可信
+                self._current_step_index = index
+                self._discard_lookahead()
+                self._scheduler.reset(self._steps, index)
+                continue
+
+            self._current_step_index += 1
+
+            # 步骤间延迟（同时预解析下一步）
+            self._start_lookahead(loop)
+            with self._tracer.span("delay", cat="schedule", index=self._current_step_index):
+                await self._scheduler.wait_next(self._current_step_index, adaptive)
+
+        return not self._control.stopped
+
+    def _auto_resync(self) -> Optional[int]:
+        """失败后自动重新同步（resync_on_failure 启用且未超过 resync_limit）"""
+        if not self.config.resync_on_failure or self._resyncs >= self.config.resync_limit:
+            return None
+
+        index = self.resync_index(self._current_step_index)
+        if index is not None:
+            self._resyncs += 1
+        return index
+
+    def _execute_step(self, step: CompiledStep) -> StepResult:
+        """执行单个步骤，启用 trace 时在结果中附带各阶段耗时"""
+        with self._tracer.span("step", cat="step", step_id=step.id, type=step.type, index=step.index) as span:
+            self._window.step()
+            result = self._execute_handler(step)
+        if span is not None:
+            result.phases = self._tracer.breakdown(span)
+        return result
+
+    def _execute_handler(self, step: CompiledStep) -> StepResult:
+        """
+        执行步骤处理函数
+
+        重试只发生在定位阶段（见 _locate_with_retry）；处理函数抛出异常时
+        输入可能已经发出，整步重试会造成重复点击，因此直接按失败处理
+        """
+        start_time = time.perf_counter()
+        if step.locates and step.text:
+            # OCR 模型加载不计入单步时限
+            self._locator.ensure_ocr_ready()
+        deadline = self._step_deadline() if step.locates else None
+
+        try:
+            return step.handler(self, step, start_time, deadline)
+        except Exception as e:
+            return StepResult(
+                step_id=step.id,
+                status=StepResultStatus.FAILED,
+                message=f"Step error: {e}",
+                error=str(e),
+                duration=int((time.perf_counter() - start_time) * 1000)
+            )
+
+    def _compute_batches(self, steps: tuple[CompiledStep, ...]) -> list[int]:
+        """从每步开始的快速执行批次结束索引（不可合并的步骤为自身索引 + 1）"""
+        ends = [i + 1 for i in range(len(steps))]
+        if not (
+            self.config.batch_fixed_steps
+            and self.config.timing_mode == "fixed"
+            and self.config.pacing == "fixed"
+        ):
+            return ends
+
+        limit = max(1, self.config.batch_max_steps)
+        for i in range(len(steps) - 2, -1, -1):
+            if self._batchable(steps[i]) and self._batchable(steps[i + 1]):
+                ends[i] = min(ends[i + 1], i + limit)
+        return ends
+
+    def _batchable(self, step: CompiledStep) -> bool:
+        """无需定位、等待与校验的固定坐标点击/按键/输入步骤"""
+        if step.mode != "fixed":
+            return False
+        if step.type == "click":
+            return not self.config.verify_clicks
+        return step.type in ("key", "input")
+
+    def _execute_batch(self, steps: tuple[CompiledStep, ...]) -> list[StepResult]:
+        """
+        连续执行一批固定坐标步骤：动作间只间隔 batch_gap，不做单步延迟与重试
+
+        每步仍生成结果；出错或被停止时提前结束，结果只包含已执行的步骤
+        """
+        gap = self.config.batch_gap / 1000
+        results: list[StepResult] = []
+
+        with self._tracer.span("batch", cat="step", index=steps[0].index, count=len(steps)):
+            for step in steps:
+                if results and not self._control.sleep(gap):
+                    break
+
+                start_time = time.perf_counter()
+                with self._tracer.span("step", cat="step", step_id=step.id, type=step.type, index=step.index) as span:
+                    self._window.step()
+                    try:
+                        result = self._batch_action(step)
+                    except Exception as e:
+                        result = StepResult(
+                            step_id=step.id,
+                            status=StepResultStatus.FAILED,
+                            message=f"Step error: {e}",
+                            error=str(e)
+                        )
+                    result.duration = int((time.perf_counter() - start_time) * 1000)
+                if span is not None:
+                    result.phases = self._tracer.breakdown(span)
+
+                results.append(result)
+                if result.status != StepResultStatus.SUCCESS:
+                    break
+        return results
+
+    def _batch_action(self, step: CompiledStep) -> StepResult:
+        """发出批内单步的输入"""
+        simulator = self._batch_simulator
+        position = self._window.apply(step.position)
+
+        with self._tracer.span("input", cat="input"):
+            if step.type == "click":
+                position = position or Position(0, 0)
+                simulator.click(position.x, position.y, step.button)
+                return StepResult(
+                    step_id=step.id,
+                    status=StepResultStatus.SUCCESS,
+                    actual_position=position,
+                    locate_method="fixed",
+                    confidence=1.0
+                )
+
+            if step.type == "key":
+                if len(step.keys) > 1:
+                    simulator.hotkey(*step.keys)
+                elif step.keys:
+                    simulator.press_key(step.keys[0])
+            else:
+                simulator.type_text(
+                    step.input_text,
+                    (position.x, position.y) if position else None,
+                    strategy=step.input_mode or self.config.input_strategy,
+                    delay=max(self.config.batch_gap, self._type_delay or 0)
+                )
+
+        return StepResult(step_id=step.id, status=StepResultStatus.SUCCESS)
+
+    def _step_deadline(self) -> Deadline:
+        """单步总时限，默认按每次尝试的定位时限与最长退避等待估算"""
+        if self.config.step_timeout > 0:
+            return Deadline(self.config.step_timeout)
+        if self.config.ocr_timeout > 0:
+            return Deadline(
+                self.config.ocr_timeout * self._retry_policy.attempts
+                + self._retry_policy.max_total_delay() * 1000
+            )
+        return Deadline.unbounded()
+
+    def _execute_click(
+        self,
+        step: CompiledStep,
+        start_time: float,
+        deadline: Optional[Deadline] = None
+    ) -> StepResult:
         """执行点击步骤"""
-        step_id = step.get("id", "")
-        mode = step.get("mode", "fixed")
-        button = step.get("button", "left")
-        position = step.get("position", {})
-        text = step.get("text")
-        screenshot_url = step.get("screenshot")
+        method, confidence = "fixed", 1.0
+        retry_count = 0
 
         # 确定点击位置
-        if mode == "ai_decision":
+        if step.mode == "ai_decision":
             # AI 决策
-            actual_pos = self._ai_decide(step)
-        elif mode == "smart":
+            actual_pos = self._ai_decide(step, deadline)
+            method = "ai"
+        elif step.mode == "smart":
             # 智能定位
-            hint_pos = Position(position.get("x", 0), position.get("y", 0)) if position else None
-            template = self._load_template(screenshot_url) if screenshot_url else None
+            template = step.template.get(self._load_template) if step.template else None
 
-            result = self._locator.locate(
-                text=text,
-                template=template,
-                fixed_position=hint_pos,
-                hint_position=hint_pos
-            )
+            result = None
+            speculation = self._speculations.pop(step.id, None)
+            if speculation:
+                result = self._validate_speculation(speculation)
+                if result and step.position:
+                    self._record_hint(step, result)
+            if result is None:
+                result, retry_count = self._locate_with_retry(step, template, deadline)
 
             if not result.found:
                 return StepResult(
-                    step_id=step_id,
-                    status=StepResultStatus.FAILED,
+                    step_id=step.id,
+                    status=StepResultStatus.TIMEOUT if result.timed_out else StepResultStatus.FAILED,
                     message=result.message,
-                    duration=int((time.time() - start_time) * 1000),
+                    duration=int((time.perf_counter() - start_time) * 1000),
                     retry_count=retry_count
                 )
 
             actual_pos = result.position
+            method, confidence = result.method, result.confidence
         else:
             # 固定坐标
-            actual_pos = Position(position.get("x", 0), position.get("y", 0))
+            actual_pos = self._window.apply(step.position) or Position(0, 0)
+
+        # 启用校验时记录点击前的目标区域
+        verifier = self._action_verifier()
+        before = verifier.snapshot(actual_pos) if verifier else None
 
         # 执行点击
-        self._simulator.click(actual_pos.x, actual_pos.y, button)
+        with self._tracer.span("input", cat="input"):
+            self._simulator.click(actual_pos.x, actual_pos.y, step.button)
+
+        verify_time = 0
+        if before is not None:
+            changed, verify_time = self._verify_click(verifier, step, actual_pos, before)
+            if not changed:
+                return StepResult(
+                    step_id=step.id,
+                    status=StepResultStatus.FAILED,
+                    message="No screen change after click",
+                    actual_position=actual_pos,
+                    duration=int((time.perf_counter() - start_time) * 1000),
+                    retry_count=retry_count,
+                    verify_time=verify_time,
+                    locate_method=method,
+                    confidence=confidence
+                )
 
         return StepResult(
-            step_id=step_id,
+            step_id=step.id,
             status=StepResultStatus.SUCCESS,
             actual_position=actual_pos,
-            duration=int((time.time() - start_time) * 1000),
-            retry_count=retry_count
+            duration=int((time.perf_counter() - start_time) * 1000),
+            retry_count=retry_count,
+            verify_time=verify_time,
+            locate_method=method,
+            confidence=confidence
         )
 
-    def _execute_scroll(self, step: dict, start_time: float) -> StepResult:
+    def _action_verifier(self) -> Optional[ActionVerifier]:
+        """启用 verify_clicks 且有屏幕捕获器时返回校验器"""
+        if not self.config.verify_clicks or not self._screen_capture:
+            return None
+        return ActionVerifier(self._screen_capture, self.config, self._control)
+
+    def _verify_click(
+        self,
+        verifier: ActionVerifier,
+        step: CompiledStep,
+        position: Position,
+        before,
+    ) -> tuple[bool, int]:
+        """
+        校验点击后目标区域是否变化，无变化时按 verify_reissue 重新点击
+
+        Returns:
+            (是否变化, 校验耗时ms，不含重新点击)
+        """
+        stats = self._verify_stats
+        with self._tracer.span("verify", cat="verify", step_id=step.id):
+            changed, total = verifier.wait_change(position, before)
+            stats.checks += 1
+            if not changed:
+                stats.caught += 1
+                for _ in range(self.config.verify_reissue):
+                    if self._control.stopped:
+                        break
+                    with self._tracer.span("input", cat="input", reissue=True):
+                        self._simulator.click(position.x, position.y, step.button)
+                    changed, elapsed = verifier.wait_change(position, before)
+                    total += elapsed
+                    if changed:
+                        stats.recovered += 1
+                        break
+                if not changed:
+                    stats.failed += 1
+
+        stats.total_time += total
+        return changed, total
+
+    def _execute_scroll(self, step: CompiledStep, start_time: float, *_) -> StepResult:
         """执行滚动步骤"""
-        position = step.get("position", {})
-        direction = step.get("direction", "down")
-        amount = step.get("amount", 100)
+        position = self._window.apply(step.position) or Position(0, 0)
 
-        x = position.get("x", 0)
-        y = position.get("y", 0)
-
-        self._simulator.scroll(x, y, amount, direction)
+        with self._tracer.span("input", cat="input"):
+            self._simulator.scroll(position.x, position.y, step.amount, step.direction)
 
         return StepResult(
-            step_id=step.get("id", ""),
+            step_id=step.id,
             status=StepResultStatus.SUCCESS,
-            actual_position=Position(x, y),
-            duration=int((time.time() - start_time) * 1000)
+            actual_position=position,
+            duration=int((time.perf_counter() - start_time) * 1000)
         )
 
-    def _execute_drag(self, step: dict, start_time: float) -> StepResult:
+    def _execute_drag(self, step: CompiledStep, start_time: float, *_) -> StepResult:
         """执行拖拽步骤"""
-        from_pos = step.get("from", {})
-        to_pos = step.get("to", {})
-
-        self._simulator.drag(
-            from_pos.get("x", 0),
-            from_pos.get("y", 0),
-            to_pos.get("x", 0),
-            to_pos.get("y", 0)
-        )
+        from_pos = self._window.apply(step.from_position) or Position(0, 0)
+        to_pos = self._window.apply(step.to_position) or Position(0, 0)
+
+        with self._tracer.span("input", cat="input"):
+            self._simulator.drag(from_pos.x, from_pos.y, to_pos.x, to_pos.y)
 
         return StepResult(
-            step_id=step.get("id", ""),
+            step_id=step.id,
             status=StepResultStatus.SUCCESS,
-            duration=int((time.time() - start_time) * 1000)
+            duration=int((time.perf_counter() - start_time) * 1000)
         )
 
-    def _execute_input(self, step: dict, start_time: float) -> StepResult:
+    def _execute_input(self, step: CompiledStep, start_time: float, *_) -> StepResult:
         """执行输入步骤"""
-        text = step.get("text", "")
-        position = step.get("position")
-
-        pos = None
-        if position:
-            pos = (position.get("x", 0), position.get("y", 0))
-
-        self._simulator.type_text(text, pos)
+        position = self._window.apply(step.position)
+        pos = (position.x, position.y) if position else None
+
+        with self._tracer.span("input", cat="input"):
+            self._simulator.type_text(
+                step.input_text,
+                pos,
+                strategy=step.input_mode or self.config.input_strategy,
+                delay=self._type_delay
+            )
 
         return StepResult(
-            step_id=step.get("id", ""),
+            step_id=step.id,
             status=StepResultStatus.SUCCESS,
-            duration=int((time.time() - start_time) * 1000)
+            duration=int((time.perf_counter() - start_time) * 1000)
         )
 
-    def _execute_key(self, step: dict, start_time: float) -> StepResult:
+    def _execute_key(self, step: CompiledStep, start_time: float, *_) -> StepResult:
         """执行按键步骤"""
-        key = step.get("key", "")
-
-        if "+" in key:
-            # 组合键
-            keys = key.split("+")
-            self._simulator.hotkey(*keys)
-        else:
-            self._simulator.press_key(key)
+        with self._tracer.span("input", cat="input"):
+            if len(step.keys) > 1:
+                # 组合键
+                self._simulator.hotkey(*step.keys)
+            elif step.keys:
+                self._simulator.press_key(step.keys[0])
 
         return StepResult(
-            step_id=step.get("id", ""),
+            step_id=step.id,
             status=StepResultStatus.SUCCESS,
-            duration=int((time.time() - start_time) * 1000)
+            duration=int((time.perf_counter() - start_time) * 1000)
         )
 
-    def _execute_wait(self, step: dict, start_time: float) -> StepResult:
+    def _execute_wait(self, step: CompiledStep, start_time: float, *_) -> StepResult:
         """执行等待步骤"""
-        mode = step.get("mode", "time")
-        duration = step.get("duration", 0)
-        timeout = step.get("timeout", 30000)
-        condition = step.get("condition", {})
-
-        if mode == "time":
-            time.sleep(duration / 1000)
+        if step.mode == "time":
+            # 暂停期间不计时，停止时立即结束
+            with self._tracer.span("sleep", cat="wait"):
+                completed = self._control.sleep(step.wait_duration / 1000)
+            if not completed:
+                return StepResult(
+                    step_id=step.id,
+                    status=StepResultStatus.SKIPPED,
+                    message="Stopped",
+                    duration=int((time.perf_counter() - start_time) * 1000)
+                )
             return StepResult(
-                step_id=step.get("id", ""),
+                step_id=step.id,
                 status=StepResultStatus.SUCCESS,
-                message=f"Waited {duration}ms",
-                duration=int((time.time() - start_time) * 1000)
+                message=f"Waited {step.wait_duration}ms",
+                duration=int((time.perf_counter() - start_time) * 1000)
             )
 
-        elif mode == "condition":
-            condition_type = condition.get("type", "")
-            value = condition.get("value", "")
+        elif step.mode == "condition":
+            condition_type = step.condition_type
+            value = step.condition_value
 
             if condition_type == "text_appear":
-                result = self._locator.wait_for_text(value, timeout)
+                result = self._locator.wait_for_text(value, step.timeout)
             elif condition_type == "text_disappear":
                 # TODO: 实现等待文字消失
-                result = self._locator.wait_for_text(value, timeout)
+                result = self._locator.wait_for_text(value, step.timeout)
                 result.found = not result.found
             elif condition_type == "image_match":
-                template = self._load_template(value)
+                template = step.condition_template.get(self._load_template)
                 if template:
-                    result = self._locator.wait_for_template(template, timeout)
+                    result = self._locator.wait_for_template(template, step.timeout)
                 else:
                     return StepResult(
-                        step_id=step.get("id", ""),
+                        step_id=step.id,
                         status=StepResultStatus.FAILED,
                         message="Template image not found",
-                        duration=int((time.time() - start_time) * 1000)
+                        duration=int((time.perf_counter() - start_time) * 1000)
                     )
             else:
                 return StepResult(
-                    step_id=step.get("id", ""),
+                    step_id=step.id,
                     status=StepResultStatus.FAILED,
                     message=f"Unknown condition type: {condition_type}",
-                    duration=int((time.time() - start_time) * 1000)
+                    duration=int((time.perf_counter() - start_time) * 1000)
                 )
 
             if result.found:
                 return StepResult(
-                    step_id=step.get("id", ""),
+                    step_id=step.id,
                     status=StepResultStatus.SUCCESS,
                     message=result.message,
-                    duration=int((time.time() - start_time) * 1000)
+                    duration=int((time.perf_counter() - start_time) * 1000)
                 )
             else:
                 return StepResult(
-                    step_id=step.get("id", ""),
+                    step_id=step.id,
                     status=StepResultStatus.TIMEOUT,
                     message=result.message,
-                    duration=int((time.time() - start_time) * 1000)
+                    duration=int((time.perf_counter() - start_time) * 1000)
                 )
 
         return StepResult(
-            step_id=step.get("id", ""),
+            step_id=step.id,
             status=StepResultStatus.SKIPPED,
-            message=f"Unknown wait mode: {mode}",
-            duration=int((time.time() - start_time) * 1000)
+            message=f"Unknown wait mode: {step.mode}",
+            duration=int((time.perf_counter() - start_time) * 1000)
         )
 
-    def _execute_file_select(self, step: dict, start_time: float) -> StepResult:
+    def _execute_file_select(self, step: CompiledStep, start_time: float, *_) -> StepResult:
         """执行文件选择步骤"""
-        file_path = step.get("file_path", "")
-
         # 文件选择通常需要在文件对话框中输入路径
         # 这里简化处理，直接输入路径
-        self._simulator.type_text(file_path)
-        self._simulator.press_key("enter")
+        with self._tracer.span("input", cat="input"):
+            self._simulator.type_text(
+                step.file_path,
+                strategy=self.config.input_strategy,
+                delay=self._type_delay
+            )
+            self._simulator.press_key("enter")
 
         return StepResult(
-            step_id=step.get("id", ""),
+            step_id=step.id,
             status=StepResultStatus.SUCCESS,
-            message=f"Selected file: {file_path}",
-            duration=int((time.time() - start_time) * 1000)
+            message=f"Selected file: {step.file_path}",
+            duration=int((time.perf_counter() - start_time) * 1000)
         )
 
-    def _ai_decide(self, step: dict) -> Optional[Position]:
-        """AI 决策"""
-        if not self._ai_engine or not self._screen_capture:
-            # 回退到固定坐标
-            position = step.get("position", {})
-            return Position(position.get("x", 0), position.get("y", 0))
+    def _execute_unknown(self, step: CompiledStep, start_time: float, *_) -> StepResult:
+        """未知步骤类型"""
+        return StepResult(
+            step_id=step.id,
+            status=StepResultStatus.SKIPPED,
+            message=f"Unknown step type: {step.type}",
+            duration=int((time.perf_counter() - start_time) * 1000)
+        )
+
+    def _locate_with_hint(
+        self,
+        step: CompiledStep,
+        template: Optional[Image.Image],
+        deadline: Optional[Deadline] = None,
+        record: bool = True,
+    ):
+        """
+        智能定位，优先在历史运行学到的位置附近的小区域内搜索
+
+        提示区域内未找到时回退到默认搜索区域，并更新提示存储
+        （record 为 False 时只读，用于预解析）
+        """
+        deadline = deadline or Deadline.unbounded()
+        # 录制坐标按目标窗口换算，学到的偏移因此相对于窗口
+        hint_pos = self._window.apply(step.position)
+        recording_id = self._plan.recording_id if self._plan else ""
+        hint = None
+        if self._hint_store and hint_pos and recording_id:
+            hint = self._hint_store.get(recording_id, step.id)
+
+        if hint:
+            learned_pos = Position(hint_pos.x + hint.offset_x, hint_pos.y + hint.offset_y)
+            # 搜索区域至少要能容纳模板
+            expand = max(hint.expand, max(template.size)) if template else hint.expand
+            result = self._locator.locate(
+                text=step.text,
+                template=template,
+                hint_position=learned_pos,
+                search_expand=expand,
+                deadline=deadline.share(2)
+            )
+            if result.found:
+                if record:
+                    self._record_hint(step, result)
+                return result
+            if record:
+                self._hint_store.record_miss(recording_id, step.id)
+
+        result = self._locator.locate(
+            text=step.text,
+            template=template,
+            hint_position=hint_pos,
+            deadline=deadline,
+            # 窗口未移动时使用编译期预先计算的搜索区域
+            search_roi=step.search_roi if self._window.transform.identity else None
+        )
+        if record and result.found:
+            self._record_hint(step, result)
+        return result
+
+    def _locate_with_retry(
+        self,
+        step: CompiledStep,
+        template: Optional[Image.Image],
+        deadline: Optional[Deadline] = None,
+    ) -> tuple[LocatorResult, int]:
+        """
+        定位阶段重试：每次重新截图定位，未找到时逐次扩大搜索区域，
+        尝试间按指数退避加抖动等待，全部尝试与等待共享单步时限
+
+        未找到（且未超时）时回退到录制坐标；有录制坐标的步骤只在启用
+        retry_before_fallback 时先重试
+
+        Returns:
+            (定位结果, 重试次数)
+        """
+        deadline = deadline or Deadline.unbounded()
+        policy = self._retry_policy
+        cap = self.config.ocr_timeout or None
+        result = LocatorResult(found=False, message="No element found")
+        retry = 0
+        # 没有可用的定位策略（未设置截图、OCR 或模板）时重试无意义
+        retryable = self._locator.can_locate(step.text, template) and (
+            not step.position or self.config.retry_before_fallback
+        )
+        attempts = policy.attempts if retryable else 1
+
+        while True:
+            # 剩余预算在剩余尝试次数间平均分配
+            attempt_deadline = deadline.share(attempts - retry, cap=cap)
+            try:
+                if retry == 0:
+                    result = self._locate_with_hint(step, template, attempt_deadline)
+                else:
+                    result = self._locator.locate(
+                        text=step.text,
+                        template=template,
+                        hint_position=self._window.apply(step.position),
+                        search_expand=policy.expand(retry),
+                        deadline=attempt_deadline
+                    )
+                    if result.found:
+                        self._record_hint(step, result)
+            except Exception as e:
+                result = LocatorResult(found=False, message=f"Locate error: {e}")
+
+            if result.found or retry + 1 >= attempts or self._control.stopped:
+                break
+
+            # 退避等待最多占用剩余预算的一半，其余留给后续定位
+            delay = policy.delay(retry)
+            remaining = deadline.remaining()
+            if remaining is not None and delay > remaining / 2:
+                break
+            with self._tracer.span("retry_wait", cat="step", retry=retry + 1):
+                if not deadline.sleep(delay, self._control):
+                    break
+            retry += 1
+
+        if not result.found and not result.timed_out and step.position and not self._control.stopped:
+            result = LocatorResult(
+                found=True,
+                position=self._window.apply(step.position),
+                confidence=1.0,
+                method="fixed",
+                message=f"Using fixed position ({result.message})"
+            )
+        return result, retry
+
+    def _record_hint(self, step: CompiledStep, result) -> None:
+        """记录成功定位的偏移（固定坐标回退不计入）"""
+        recording_id = self._plan.recording_id if self._plan else ""
+        if not self._hint_store or not recording_id or not step.position or result.method == "fixed":
+            return
+
+        base = self._window.apply(step.position)
+        offset = Position(result.position.x - base.x, result.position.y - base.y)
+        self._hint_store.record_success(recording_id, step.id, offset, result.confidence)
 
-        ai_config = step.get("ai_config", {})
-        prompt = ai_config.get("prompt", "")
-        options = ai_config.get("options", [])
+    def _ai_decide(self, step: CompiledStep, deadline: Optional[Deadline] = None) -> Optional[Position]:
+        """AI 决策（超过单步时限或被停止时使用录制坐标）"""
+        # 回退坐标
+        fallback = self._window.apply(step.position) or Position(0, 0)
+
+        if not self._ai_engine or not self._screen_capture:
+            return fallback
 
         # 截取当前屏幕
-        screenshot = self._screen_capture.capture_window(None)
+        with self._tracer.span("capture", cat="ai"):
+            screenshot = self._screen_capture.capture_window(None)
         if not screenshot:
-            position = step.get("position", {})
-            return Position(position.get("x", 0), position.get("y", 0))
+            return fallback
 
-        # 调用 AI 引擎决策
+        # 调用 AI 引擎决策（在常驻事件循环上执行，客户端连接池可跨步骤复用）
         try:
-            # 异步转同步调用
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            decision = loop.run_until_complete(
-                self._ai_engine.decide(screenshot, prompt, options)
+            future = self._runtime.submit(
+                self._ai_engine.decide(screenshot, step.ai_prompt, list(step.ai_options))
             )
-            loop.close()
-
+            # 停止或超过单步时限时放弃等待
+            with self._tracer.span("ai", cat="ai", prompt=step.ai_prompt):
+                completed = self._control.wait_futures([future], deadline.remaining() if deadline else None)
+            if not completed:
+                future.cancel()
+                if not self._control.stopped:
+                    print(f"AI decision timed out for step {step.id}, using recorded position")
+                return fallback
+
+            decision = future.result()
             if decision and decision.position:
                 return decision.position
 
         except Exception as e:
             print(f"AI decision error: {e}")
 
-        # 回退到固定坐标
-        position = step.get("position", {})
-        return Position(position.get("x", 0), position.get("y", 0))
+        return fallback
+
+    def _window_type_delay(self, target_window: Optional[dict]) -> Optional[int]:
+        """按目标窗口标题或进程名匹配配置的逐字输入间隔"""
+        if not target_window or not self.config.window_type_delays:
+            return None
+
+        names = [
+            (target_window.get("title") or "").lower(),
+            (target_window.get("process_name") or "").lower(),
+        ]
+        for pattern, delay in self.config.window_type_delays.items():
+            if any(pattern.lower() in name for name in names if name):
+                return delay
+        return None
 
     def _load_template(self, url_or_path: str) -> Optional[Image.Image]:
-        """加载模板图片"""
+        """加载模板图片（由计划中的模板句柄缓存）"""
+        if self._template_loader:
+            template = self._template_loader(url_or_path)
+            if template is not None:
+                return template
+
+        if self._assets is not None:
+            template = self._assets.cache.load_image(url_or_path)
+            if template is not None:
+                return template
+
         try:
             if url_or_path.startswith("minio://"):
                 # TODO: 从 MinIO 加载
@@ -467,7 +1332,47 @@ class Player:
                 return None
             else:
                 # 本地文件
-                return Image.open(url_or_path)
+                template = Image.open(url_or_path)
+                template.load()
+                return template
         except Exception as e:
             print(f"Error loading template: {e}")
             return None
+
+
+# 循环执行时保留的每轮汇总统计数
+ITERATION_HISTORY = 1000
+
+
+def _release(
+    runtime: AsyncRuntime,
+    executors: tuple,
+    locator: ElementLocator,
+    hint_store: Optional[HintStore],
+    asset_cache: Optional[AssetCache],
+) -> None:
+    """
+    释放播放器持有的线程与连接（close() 或播放器被回收时调用一次）
+
+    只关闭按配置自建的模板缓存，set_asset_prefetcher 传入的预取器由调用方管理
+    """
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+    locator.close()
+    runtime.close()
+    if hint_store:
+        hint_store.close()
+    if asset_cache:
+        asset_cache.close()
+
+
+# 步骤类型 → 处理函数，编译执行计划时预先绑定到每个步骤
+STEP_HANDLERS: dict[str, Callable] = {
+    "click": Player._execute_click,
+    "scroll": Player._execute_scroll,
+    "drag": Player._execute_drag,
+    "input": Player._execute_input,
+    "key": Player._execute_key,
+    "wait": Player._execute_wait,
+    "file_select": Player._execute_file_select,
+}
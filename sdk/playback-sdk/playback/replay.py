@@ -0,0 +1,336 @@
+"""
+离线回放模块
+用录制时保存的帧序列代替实时屏幕，评估定位准确率与耗时
+"""
+
+import io
+import json
+import math
+import os
+import threading
+import time
+import zipfile
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from PIL import Image
+
+from .backends import VirtualBackend
+from .models import PlayerConfig, Position
+from .plan import CompiledStep
+from .player import Player
+
+
+MANIFEST_NAME = "manifest.json"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+
+@dataclass
+class FrameInfo:
+    """帧索引项"""
+    name: str  # 目录内相对路径或压缩包内条目名
+    step_id: str = ""
+    timestamp: int = 0  # 录制时间戳(ms)
+
+
+class FrameSequenceCapture:
+    """
+    帧序列屏幕捕获器，实现 capture_window / capture_region 接口
+
+    来源为目录或 zip 压缩包：
+    - 含 manifest.json 时按其 frames 列表索引 (file, step_id, timestamp)，
+      templates 字段将模板地址映射到包内文件
+    - 否则按文件名索引：纯数字文件名视为时间戳(ms)，其余视为步骤 id
+    """
+
+    def __init__(self, source: str, cache_size: int = 8):
+        self.source = source
+        self._zip: Optional[zipfile.ZipFile] = None
+        if zipfile.is_zipfile(source):
+            self._zip = zipfile.ZipFile(source)
+
+        self._cache: OrderedDict[str, Image.Image] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+        self.frames: list[FrameInfo] = []
+        self.templates: dict[str, str] = {}
+        self._load_index()
+
+        self._by_step = {f.step_id: f for f in self.frames if f.step_id}
+        self._timed = sorted((f for f in self.frames if f.timestamp), key=lambda f: f.timestamp)
+        self._timestamps = [f.timestamp for f in self._timed]
+        self._current: Optional[FrameInfo] = self.frames[0] if self.frames else None
+
+    @property
+    def current(self) -> Optional[FrameInfo]:
+        """当前帧"""
+        return self._current
+
+    def seek_step(self, step_id: str, timestamp: int = 0) -> bool:
+        """切换到步骤对应的帧，没有按步骤索引的帧时按时间戳查找"""
+        frame = self._by_step.get(step_id)
+        if frame is None and timestamp:
+            return self.seek_time(timestamp)
+        if frame is None:
+            return False
+        self._current = frame
+        return True
+
+    def seek_time(self, timestamp: int) -> bool:
+        """切换到时间戳之前（含）最近的帧"""
+        i = bisect_right(self._timestamps, timestamp) - 1
+        if i < 0:
+            return False
+        self._current = self._timed[i]
+        return True
+
+    def capture_window(self, window_id: Optional[str] = None) -> Optional[Image.Image]:
+        """返回当前帧"""
+        if self._current is None:
+            return None
+        return self._read(self._current.name).copy()
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        """裁剪当前帧区域"""
+        if self._current is None:
+            return None
+        return self._read(self._current.name).crop((x, y, x + width, y + height))
+
+    def load_template(self, url: str) -> Optional[Image.Image]:
+        """加载 manifest 中映射的模板图片"""
+        name = self.templates.get(url)
+        if not name:
+            return None
+        return self._read(name).copy()
+
+    def close(self) -> None:
+        """关闭压缩包"""
+        if self._zip:
+            self._zip.close()
+            self._zip = None
+
+    def _names(self) -> list[str]:
+        """列出来源中的文件"""
+        if self._zip:
+            return [n for n in self._zip.namelist() if not n.endswith("/")]
+        names = []
+        for root, _, files in os.walk(self.source):
+            for name in files:
+                names.append(os.path.relpath(os.path.join(root, name), self.source).replace(os.sep, "/"))
+        return sorted(names)
+
+    def _open(self, name: str) -> bytes:
+        """读取文件内容"""
+        if self._zip:
+            return self._zip.read(name)
+        with open(os.path.join(self.source, name), "rb") as f:
+            return f.read()
+
+    def _load_index(self) -> None:
+        """建立帧索引"""
+        names = self._names()
+        manifest = next((n for n in names if n.rsplit("/", 1)[-1] == MANIFEST_NAME), None)
+
+        if manifest:
+            base = manifest.rsplit("/", 1)[0] + "/" if "/" in manifest else ""
+            data = json.loads(self._open(manifest))
+            for item in data.get("frames", []):
+                self.frames.append(FrameInfo(
+                    name=base + item["file"],
+                    step_id=item.get("step_id", ""),
+                    timestamp=int(item.get("timestamp") or 0),
+                ))
+            self.templates = {url: base + path for url, path in data.get("templates", {}).items()}
+            return
+
+        for name in names:
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            stem = name.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+            if stem.isdigit():
+                self.frames.append(FrameInfo(name=name, timestamp=int(stem)))
+            else:
+                self.frames.append(FrameInfo(name=name, step_id=stem))
+
+    def _read(self, name: str) -> Image.Image:
+        """解码图片（LRU 缓存）"""
+        with self._lock:
+            image = self._cache.get(name)
+            if image is not None:
+                self._cache.move_to_end(name)
+                return image
+
+        image = Image.open(io.BytesIO(self._open(name)))
+        image.load()
+        with self._lock:
+            self._cache[name] = image
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return image
+
+
+@dataclass
+class ReplayStepReport:
+    """单步离线定位结果"""
+    index: int
+    step_id: str
+    type: str
+    mode: str
+    found: bool = False
+    method: str = ""
+    confidence: float = 0.0
+    position: Optional[Position] = None
+    expected: Optional[Position] = None  # 录制坐标
+    error_px: Optional[float] = None  # 定位结果与录制坐标的距离
+    duration: float = 0.0  # 定位耗时(ms)
+    timed_out: bool = False
+    message: str = ""
+
+
+@dataclass
+class ReplayReport:
+    """离线回放报告"""
+    recording_id: str
+    steps: list[ReplayStepReport] = field(default_factory=list)
+
+    @property
+    def hit_rate(self) -> float:
+        """定位成功率"""
+        return sum(s.found for s in self.steps) / len(self.steps) if self.steps else 0.0
+
+    def summary(self) -> dict:
+        """汇总统计"""
+        durations = sorted(s.duration for s in self.steps)
+        found = [s for s in self.steps if s.found]
+        errors = [s.error_px for s in found if s.error_px is not None]
+        return {
+            "recording_id": self.recording_id,
+            "steps": len(self.steps),
+            "found": len(found),
+            "hit_rate": round(self.hit_rate, 4),
+            "timed_out": sum(s.timed_out for s in self.steps),
+            "mean_confidence": round(sum(s.confidence for s in found) / len(found), 4) if found else 0.0,
+            "mean_error_px": round(sum(errors) / len(errors), 2) if errors else None,
+            "p50_ms": round(_percentile(durations, 50), 2),
+            "p99_ms": round(_percentile(durations, 99), 2),
+            "total_ms": round(sum(durations), 2),
+        }
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {"summary": self.summary(), "steps": [asdict(s) for s in self.steps]}
+
+    def format(self) -> str:
+        """格式化为文本表格"""
+        lines = [f"{'#':>4} {'step':<16} {'found':<6} {'method':<9} {'conf':>6} {'err(px)':>8} {'ms':>8}"]
+        for s in self.steps:
+            error = f"{s.error_px:.1f}" if s.error_px is not None else "-"
+            lines.append(
+                f"{s.index:>4} {s.step_id[:16]:<16} {str(s.found):<6} {s.method:<9} "
+                f"{s.confidence:>6.3f} {error:>8} {s.duration:>8.1f}"
+            )
+        summary = self.summary()
+        lines.append(
+            f"hit rate {summary['hit_rate']:.1%} ({summary['found']}/{summary['steps']}), "
+            f"p50 {summary['p50_ms']}ms, p99 {summary['p99_ms']}ms"
+        )
+        return "\n".join(lines)
+
+
+class ReplayHarness:
+    """
+    离线回放评估器
+
+    对录制中需要定位的步骤（智能点击、图像/文字等待条件），
+    切换到该步骤对应的帧后用 Player.locate_step 定位：不发送输入、不重试、
+    不写入定位提示，耗时只统计定位本身（模板与 OCR 在评估前预热）
+    """
+
+    def __init__(
+        self,
+        frames: FrameSequenceCapture,
+        config: Optional[PlayerConfig] = None,
+        ocr_adapter=None,
+    ):
+        self.frames = frames
+        self.config = config or PlayerConfig()
+        self._player = Player(self.config)
+        self._player.set_input_backend(VirtualBackend(record_moves=False))
+        self._player.set_screen_capture(frames)
+        self._player.set_template_loader(self._load_template)
+        if ocr_adapter:
+            self._player.set_ocr_adapter(ocr_adapter)
+
+    def run(self, recording: dict) -> ReplayReport:
+        """评估整个录制"""
+        self._player.load(recording)
+        report = ReplayReport(recording_id=self._player.plan.recording_id)
+        # 模板加载、OpenCV 与 OCR 初始化不计入定位耗时
+        self._player.prepare().result()
+
+        for step in self._player.plan.steps:
+            if not self._evaluates(step):
+                continue
+            if not self.frames.seek_step(step.id, step.timestamp):
+                report.steps.append(ReplayStepReport(
+                    index=step.index, step_id=step.id, type=step.type, mode=step.mode,
+                    expected=step.position, message="No frame for step"
+                ))
+                continue
+            report.steps.append(self._evaluate(step))
+
+        return report
+
+    def close(self) -> None:
+        """释放资源"""
+        self._player.close()
+
+    def _evaluates(self, step: CompiledStep) -> bool:
+        """是否需要评估该步骤"""
+        if step.type == "click":
+            return step.mode == "smart"
+        return step.type == "wait" and step.mode == "condition" and step.condition_type in (
+            "text_appear", "image_match"
+        )
+
+    def _evaluate(self, step: CompiledStep) -> ReplayStepReport:
+        """在当前帧上定位单个步骤（等待条件只检查当前帧，不轮询）"""
+        start = time.perf_counter()
+        located = self._player.locate_step(step.index)
+        duration = (time.perf_counter() - start) * 1000
+
+        report = ReplayStepReport(
+            index=step.index,
+            step_id=step.id,
+            type=step.type,
+            mode=step.mode,
+            found=located.found,
+            method=located.method,
+            confidence=located.confidence,
+            position=located.position,
+            expected=step.position if step.type == "click" else None,
+            duration=duration,
+            timed_out=located.timed_out,
+            message=located.message,
+        )
+        if report.found and report.position and report.expected:
+            report.error_px = math.hypot(
+                report.position.x - report.expected.x,
+                report.position.y - report.expected.y
+            )
+        return report
+
+    def _load_template(self, url: str) -> Optional[Image.Image]:
+        """优先从帧序列包中加载模板"""
+        return self.frames.load_template(url)
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """已排序数据的百分位数（最近秩）"""
+    if not values:
+        return 0.0
+    rank = max(0, math.ceil(percent / 100 * len(values)) - 1)
+    return values[rank]
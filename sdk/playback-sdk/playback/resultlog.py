@@ -0,0 +1,96 @@
+"""
+步骤结果日志
+内存中只保留最近的结果（环形缓冲），完整结果按批追加写入 JSON Lines 文件，
+长时间循环执行时内存占用保持不变
+"""
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .models import StepResult
+
+
+class ResultLog:
+    """
+    步骤结果环形缓冲
+
+    Args:
+        capacity: 内存中保留的条数，0 表示不限
+        spill_path: 追加写入的 JSON Lines 文件，为空则不落盘
+        spill_batch: 累计多少条写一次盘
+    """
+
+    def __init__(self, capacity: int = 0, spill_path: Optional[str] = None, spill_batch: int = 500):
+        self._results: deque[StepResult] = deque(maxlen=capacity or None)
+        self._spill_path = Path(spill_path) if spill_path else None
+        self._spill_batch = max(1, spill_batch)
+        self._pending: list[dict] = []
+        self.total = 0  # 累计写入条数（含已移出缓冲的）
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __iter__(self) -> Iterator[StepResult]:
+        return iter(self._results)
+
+    def append(self, result: StepResult, iteration: int = 0) -> None:
+        """记录一个步骤结果"""
+        self._results.append(result)
+        self.total += 1
+        if self._spill_path is None:
+            return
+
+        self._pending.append(_to_record(result, iteration))
+        if len(self._pending) >= self._spill_batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """把待写入的结果追加到文件"""
+        if not self._pending or self._spill_path is None:
+            return
+
+        try:
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._spill_path, "a", encoding="utf-8") as f:
+                for record in self._pending:
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write("\n")
+        except Exception as e:
+            print(f"Error spilling step results: {e}")
+        # 写盘失败也丢弃，避免待写入列表无限增长
+        self._pending.clear()
+
+    def clear(self) -> None:
+        """清空内存中的结果（先写出待写入的部分）"""
+        self.flush()
+        self._results.clear()
+        self.total = 0
+
+
+def _to_record(result: StepResult, iteration: int) -> dict:
+    """结果转为可序列化的字典（不含截图数据）"""
+    record = {
+        "time": int(time.time() * 1000),
+        "iteration": iteration,
+        "step_id": result.step_id,
+        "status": result.status.value,
+        "message": result.message,
+        "duration": result.duration,
+        "retry_count": result.retry_count,
+        "locate_method": result.locate_method,
+        "confidence": round(result.confidence, 4),
+    }
+    if result.actual_position:
+        record["position"] = [result.actual_position.x, result.actual_position.y]
+    if result.error:
+        record["error"] = result.error
+    if result.settle_time:
+        record["settle_time"] = result.settle_time
+    if result.verify_time:
+        record["verify_time"] = result.verify_time
+    if result.phases:
+        record["phases"] = result.phases
+    return record
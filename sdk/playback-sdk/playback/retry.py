@@ -0,0 +1,41 @@
+"""
+重试策略模块
+定位失败时按指数退避加随机抖动重试，并逐次扩大搜索区域
+"""
+
+import random
+from typing import Optional
+
+from .models import PlayerConfig
+
+
+class RetryPolicy:
+    """定位重试策略"""
+
+    def __init__(self, config: Optional[PlayerConfig] = None, rng: Optional[random.Random] = None):
+        self.config = config or PlayerConfig()
+        self._rng = rng or random.Random()
+
+    @property
+    def attempts(self) -> int:
+        """总尝试次数（含首次）"""
+        return max(0, self.config.retry_count) + 1
+
+    def base_delay(self, retry: int) -> float:
+        """第 retry 次重试前的名义等待(秒)，不含抖动"""
+        delay = self.config.retry_delay * self.config.retry_backoff ** retry
+        return min(delay, self.config.retry_max_delay) / 1000
+
+    def delay(self, retry: int) -> float:
+        """第 retry 次重试前的等待(秒)，按 retry_jitter 比例随机抖动，避免与界面动画同步"""
+        jitter = self.config.retry_jitter
+        return self.base_delay(retry) * self._rng.uniform(1 - jitter, 1 + jitter)
+
+    def max_total_delay(self) -> float:
+        """所有重试等待之和的上限(秒)"""
+        total = sum(self.base_delay(retry) for retry in range(self.attempts - 1))
+        return total * (1 + self.config.retry_jitter)
+
+    def expand(self, retry: int) -> int:
+        """第 retry 次重试的搜索区域扩展(px)"""
+        return int(self.config.search_region_expand * self.config.retry_expand_factor ** retry)
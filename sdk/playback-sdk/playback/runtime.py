@@ -0,0 +1,92 @@
+"""
+异步运行时模块
+在常驻线程上运行单一事件循环，供播放器执行协程（AI 决策、远程 OCR、资源下载等）
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+
+class AsyncRuntime:
+    """常驻事件循环线程"""
+
+    def __init__(self, name: str = "playback-loop"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取事件循环（首次访问时启动线程）"""
+        self.start()
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        """事件循环是否在运行"""
+        return self._loop is not None and self._loop.is_running()
+
+    def start(self) -> None:
+        """启动事件循环线程"""
+        with self._lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self._name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        """提交协程到事件循环，返回 concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        在事件循环上执行协程并同步等待结果
+
+        Args:
+            coro: 协程
+            timeout: 超时(秒)，超时后取消协程并抛出 TimeoutError
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() cannot be called from the loop thread")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def in_loop_thread(self) -> bool:
+        """当前线程是否为事件循环线程"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def close(self) -> None:
+        """停止事件循环并等待线程退出"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+
+        if loop is None:
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if not loop.is_running():
+            loop.close()
@@ -0,0 +1,131 @@
+"""
+回放调度模块
+按录制时间戳还原或缩放步骤间隔
+"""
+
+import asyncio
+import time
+from typing import Optional, Sequence
+
+from .control import PlaybackControl
+from .models import PlayerConfig
+
+
+# 缩放模式允许的速度范围
+MIN_SPEED = 0.5
+MAX_SPEED = 20.0
+
+
+class ReplayScheduler:
+    """
+    步骤调度器
+
+    - fixed: 每步之后固定等待 step_delay（默认）
+    - faithful: 按录制时间戳还原步骤间隔
+    - scaled: 录制间隔除以 speed，且不小于 min_step_gap
+
+    faithful/scaled 模式以单调高精度时钟计算每步的绝对计划时间，
+    单步的执行耗时会从后续间隔中扣除，不会逐步累积漂移；
+    落后超过 drift_tolerance 时整体顺延计划，保留后续间隔
+
+    等待期间暂停的时长会顺延计划，停止时立即返回
+    """
+
+    def __init__(
+        self,
+        config: Optional[PlayerConfig] = None,
+        control: Optional[PlaybackControl] = None
+    ):
+        self.config = config or PlayerConfig()
+        self._control = control or PlaybackControl()
+        self._offsets: list[float] = []
+        self._origin: Optional[float] = None
+
+    @property
+    def mode(self) -> str:
+        """调度模式"""
+        return self.config.timing_mode
+
+    def reset(self, steps: Sequence, start_index: int = 0) -> None:
+        """根据步骤时间戳计算相对 start_index 的计划偏移(秒)"""
+        speed = min(MAX_SPEED, max(MIN_SPEED, self.config.speed))
+        fallback = self.config.step_delay / 1000
+        min_gap = self.config.min_step_gap / 1000
+
+        self._offsets = [0.0] * len(steps)
+        self._origin = None
+
+        offset = 0.0
+        last_ts = None
+        for i in range(start_index, len(steps)):
+            ts = steps[i].timestamp
+            if i > start_index:
+                if ts > 0 and last_ts is not None and ts >= last_ts:
+                    gap = (ts - last_ts) / 1000
+                else:
+                    gap = fallback
+
+                if self.mode == "scaled":
+                    gap = max(min_gap, gap / speed)
+                offset += gap
+
+            self._offsets[i] = offset
+            if ts > 0 and (last_ts is None or ts >= last_ts):
+                last_ts = ts
+
+    def mark_start(self) -> None:
+        """记录计划起点（首个步骤开始执行时调用）"""
+        if self._origin is None:
+            self._origin = time.perf_counter()
+
+    def shift(self, seconds: float) -> None:
+        """整体顺延计划（如暂停期间）"""
+        if self._origin is not None:
+            self._origin += seconds
+
+    async def wait_next(self, next_index: int, adaptive: bool = False) -> float:
+        """
+        等待到下一步的计划时间
+
+        Args:
+            next_index: 下一步索引
+            adaptive: 是否已通过画面稳定检测完成等待（仅影响 fixed 模式）
+
+        Returns:
+            实际等待时间(秒)
+        """
+        if self.mode not in ("faithful", "scaled"):
+            if adaptive:
+                return 0.0
+            delay = self.config.step_delay / 1000
+            start = time.perf_counter()
+            await self._control.sleep_async(delay)
+            return time.perf_counter() - start
+
+        if self._origin is None or next_index >= len(self._offsets):
+            return 0.0
+
+        target = self._origin + self._offsets[next_index]
+        now = time.perf_counter()
+        lag = now - target
+        if lag > self.config.drift_tolerance / 1000:
+            # 落后太多：顺延后续计划，保留录制间隔
+            self._origin += lag
+            return 0.0
+
+        paused_before = self._control.paused_total()
+        await self._sleep_until(target)
+        # 等待期间的暂停已由可暂停睡眠顺延，同步顺延计划起点
+        self.shift(self._control.paused_total() - paused_before)
+        return max(0.0, time.perf_counter() - now)
+
+    async def _sleep_until(self, target: float) -> None:
+        """粗粒度可中断 sleep 后让出循环自旋到目标时间，减少定时器抖动"""
+        remaining = target - time.perf_counter()
+        if remaining > 0.002:
+            paused_before = self._control.paused_total()
+            if not await self._control.sleep_async(remaining - 0.002):
+                return
+            target += self._control.paused_total() - paused_before
+        while time.perf_counter() < target and not self._control.stopped:
+            await asyncio.sleep(0)
@@ -0,0 +1,78 @@
+"""
+画面稳定检测模块
+动作执行后轮询屏幕区域，画面持续稳定一段时间即认为界面已响应完毕
+"""
+
+import time
+from typing import Optional
+
+from .frames import mean_abs_diff, to_signature
+from .models import PlayerConfig, Position
+
+
+class SettleDetector:
+    """画面稳定检测器"""
+
+    def __init__(self, capture, config: Optional[PlayerConfig] = None, control=None):
+        self.config = config or PlayerConfig()
+        self._capture = capture
+        self._control = control
+
+    def wait(self, center: Optional[Position] = None) -> tuple[int, bool]:
+        """
+        等待画面稳定
+
+        Args:
+            center: 观察区域中心，为空或 settle_region_size 为 0 时观察整个窗口
+
+        Returns:
+            (等待耗时ms, 是否在 settle_max_ms 内达到稳定)
+        """
+        start = time.monotonic()
+        max_wait = self.config.settle_max_ms / 1000
+        stable_for = self.config.settle_stable_ms / 1000
+        poll = self.config.settle_poll_ms / 1000
+
+        previous = self._snapshot(center)
+        stable_since = time.monotonic()
+
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= max_wait:
+                return int(elapsed * 1000), False
+
+            if self._control is not None:
+                if not self._control.sleep(poll):
+                    return int((time.monotonic() - start) * 1000), False
+            else:
+                time.sleep(poll)
+
+            current = self._snapshot(center)
+            now = time.monotonic()
+            if previous is None or current is None:
+                # 截图失败时无法判断，按时间上限处理
+                previous = current
+                stable_since = now
+                continue
+
+            if mean_abs_diff(previous, current) > self.config.settle_diff_threshold:
+                stable_since = now
+            elif now - stable_since >= stable_for:
+                return int((now - start) * 1000), True
+
+            previous = current
+
+    def _snapshot(self, center: Optional[Position]):
+        """截取观察区域签名"""
+        size = self.config.settle_region_size
+        if center and size > 0:
+            half = size // 2
+            image = self._capture.capture_region(
+                max(0, center.x - half), max(0, center.y - half), size, size
+            )
+        else:
+            image = self._capture.capture_window(None)
+
+        if image is None:
+            return None
+        return to_signature(image, 64)
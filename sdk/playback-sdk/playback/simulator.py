@@ -7,33 +7,68 @@ import platform
 import time
 from typing import Optional
 
-from pynput.mouse import Button, Controller as MouseController
-from pynput.keyboard import Key, Controller as KeyboardController
+from .backends import InputBackend, PynputBackend
+from .clipboard import Clipboard
+from .control import PlaybackControl
+from .tracing import NULL_TRACER, Tracer
+
+
+# 整串输入时每次发送的字符数，块之间检查暂停/停止
+BATCH_CHUNK_SIZE = 32
 
 
 class EventSimulator:
     """事件模拟器"""
 
-    def __init__(self, click_delay: int = 100, type_delay: int = 50):
-        self._mouse = MouseController()
-        self._keyboard = KeyboardController()
+    def __init__(
+        self,
+        click_delay: int = 100,
+        type_delay: int = 50,
+        control: Optional[PlaybackControl] = None,
+        paste_restore_delay: int = 100,
+        backend: Optional[InputBackend] = None,
+        tracer: Optional[Tracer] = None
+    ):
+        self._backend = backend or PynputBackend()
         self._click_delay = click_delay / 1000  # 转换为秒
         self._type_delay = type_delay / 1000
         self._platform = platform.system()
+        self._control = control
+        self._clipboard = Clipboard()
+        self._paste_restore_delay = paste_restore_delay / 1000
+        self._tracer = tracer or NULL_TRACER
+
+    @property
+    def backend(self) -> InputBackend:
+        """输入后端"""
+        return self._backend
+
+    def set_backend(self, backend: InputBackend) -> None:
+        """设置输入后端"""
+        self._backend = backend
+
+    def set_control(self, control: Optional[PlaybackControl]) -> None:
+        """设置播放控制令牌，动作间的等待随之可暂停/停止"""
+        self._control = control
+
+    def set_tracer(self, tracer: Optional[Tracer]) -> None:
+        """设置跨度记录器，动作间的等待记录为 sleep 跨度"""
+        self._tracer = tracer or NULL_TRACER
 
     def click(self, x: int, y: int, button: str = "left") -> None:
         """模拟点击"""
-        self._mouse.position = (x, y)
-        time.sleep(self._click_delay)
+        self._backend.move(x, y)
+        if not self._sleep(self._click_delay):
+            return
 
-        btn = self._get_button(button)
-        self._mouse.click(btn)
+        self._backend.click(self._get_button(button))
 
     def double_click(self, x: int, y: int) -> None:
         """模拟双击"""
-        self._mouse.position = (x, y)
-        time.sleep(self._click_delay)
-        self._mouse.click(Button.left, 2)
+        self._backend.move(x, y)
+        if not self._sleep(self._click_delay):
+            return
+        self._backend.click("left", 2)
 
     def right_click(self, x: int, y: int) -> None:
         """模拟右键点击"""
@@ -41,126 +76,156 @@ class EventSimulator:
 
     def scroll(self, x: int, y: int, amount: int, direction: str) -> None:
         """模拟滚动"""
-        self._mouse.position = (x, y)
-        time.sleep(self._click_delay)
+        self._backend.move(x, y)
+        if not self._sleep(self._click_delay):
+            return
 
         if direction in ("up", "down"):
             dy = amount if direction == "up" else -amount
-            self._mouse.scroll(0, dy)
+            self._backend.scroll(0, dy)
         else:
             dx = amount if direction == "right" else -amount
-            self._mouse.scroll(dx, 0)
+            self._backend.scroll(dx, 0)
 
     def drag(self, from_x: int, from_y: int, to_x: int, to_y: int, duration: float = 0.5) -> None:
         """模拟拖拽"""
-        self._mouse.position = (from_x, from_y)
-        time.sleep(self._click_delay)
-
-        self._mouse.press(Button.left)
-
-        # 平滑移动
-        steps = max(10, int(duration * 60))
-        dx = (to_x - from_x) / steps
-        dy = (to_y - from_y) / steps
-
-        for i in range(steps):
-            x = int(from_x + dx * (i + 1))
-            y = int(from_y + dy * (i + 1))
-            self._mouse.position = (x, y)
-            time.sleep(duration / steps)
-
-        self._mouse.release(Button.left)
-
-    def type_text(self, text: str, position: Optional[tuple] = None) -> None:
-        """模拟输入文字"""
+        self._backend.move(from_x, from_y)
+        if not self._sleep(self._click_delay):
+            return
+
+        self._backend.mouse_down("left")
+
+        # 平滑移动（被停止时也要松开按键）
+        try:
+            steps = max(10, int(duration * 60))
+            dx = (to_x - from_x) / steps
+            dy = (to_y - from_y) / steps
+
+            for i in range(steps):
+                x = int(from_x + dx * (i + 1))
+                y = int(from_y + dy * (i + 1))
+                self._backend.move(x, y)
+                if not self._sleep(duration / steps):
+                    return
+        finally:
+            self._backend.mouse_up("left")
+
+    def type_text(
+        self,
+        text: str,
+        position: Optional[tuple] = None,
+        strategy: str = "char",
+        delay: Optional[int] = None
+    ) -> None:
+        """
+        模拟输入文字
+
+        Args:
+            text: 文字
+            position: 输入前先点击的位置
+            strategy: char 逐字输入; batch 整串输入; paste 剪贴板粘贴（剪贴板不可用时退回 batch）
+            delay: 逐字输入的字符间隔(ms)，默认 type_delay
+        """
         if position:
             self.click(position[0], position[1])
-            time.sleep(self._click_delay)
+            if not self._sleep(self._click_delay):
+                return
 
+        if strategy == "paste" and self._paste(text):
+            return
+
+        if strategy in ("batch", "paste"):
+            for i in range(0, len(text), BATCH_CHUNK_SIZE):
+                self._backend.type(text[i:i + BATCH_CHUNK_SIZE])
+                if self._control is not None and not self._control.checkpoint():
+                    return
+            return
+
+        type_delay = delay / 1000 if delay is not None else self._type_delay
         for char in text:
-            self._keyboard.type(char)
-            time.sleep(self._type_delay)
+            self._backend.type(char)
+            if not self._sleep(type_delay):
+                return
+
+    def _paste(self, text: str) -> bool:
+        """通过剪贴板粘贴文字，完成后恢复原剪贴板内容"""
+        if not self._clipboard.available:
+            return False
+
+        previous = self._clipboard.get()
+        if not self._clipboard.set(text):
+            return False
+
+        try:
+            self.hotkey("cmd" if self._platform == "Darwin" else "ctrl", "v")
+            # 目标程序异步读取剪贴板，稍候再恢复
+            self._sleep(self._paste_restore_delay)
+        finally:
+            if previous is not None:
+                self._clipboard.set(previous)
+        return True
 
     def press_key(self, key: str) -> None:
         """模拟按键"""
-        key_obj = self._get_key(key)
-        if key_obj:
-            self._keyboard.press(key_obj)
-            self._keyboard.release(key_obj)
+        key_name = self._get_key(key)
+        if key_name:
+            self._backend.key_down(key_name)
+            self._backend.key_up(key_name)
 
     def hotkey(self, *keys: str) -> None:
         """模拟组合键"""
-        key_objs = [self._get_key(k) for k in keys if self._get_key(k)]
+        key_names = [self._get_key(k) for k in keys if self._get_key(k)]
 
         # 按下所有键
-        for key in key_objs:
-            self._keyboard.press(key)
+        for key in key_names:
+            self._backend.key_down(key)
 
         # 释放所有键（逆序）
-        for key in reversed(key_objs):
-            self._keyboard.release(key)
+        for key in reversed(key_names):
+            self._backend.key_up(key)
 
     def move_to(self, x: int, y: int) -> None:
         """移动鼠标到指定位置"""
-        self._mouse.position = (x, y)
-
-    def _get_button(self, button: str) -> Button:
-        """获取鼠标按钮"""
-        buttons = {
-            "left": Button.left,
-            "right": Button.right,
-            "middle": Button.middle,
+        self._backend.move(x, y)
+
+    def _sleep(self, seconds: float) -> bool:
+        """动作间等待，被停止时返回 False"""
+        with self._tracer.span("sleep", cat="input"):
+            if self._control is not None:
+                return self._control.sleep(seconds)
+            time.sleep(seconds)
+            return True
+
+    def _get_button(self, button: str) -> str:
+        """规范化鼠标按钮名"""
+        button = button.lower()
+        return button if button in ("left", "right", "middle") else "left"
+
+    def _get_key(self, key: str) -> Optional[str]:
+        """规范化按键名"""
+        # 特殊键别名
+        aliases = {
+            "return": "enter",
+            "escape": "esc",
+            "pageup": "page_up",
+            "pagedown": "page_down",
+            "control": "ctrl",
+            "command": "cmd",
+            "win": "cmd",
         }
-        return buttons.get(button.lower(), Button.left)
-
-    def _get_key(self, key: str):
-        """获取按键对象"""
-        # 特殊键映射
         special_keys = {
-            "enter": Key.enter,
-            "return": Key.enter,
-            "tab": Key.tab,
-            "space": Key.space,
-            "backspace": Key.backspace,
-            "delete": Key.delete,
-            "escape": Key.esc,
-            "esc": Key.esc,
-            "up": Key.up,
-            "down": Key.down,
-            "left": Key.left,
-            "right": Key.right,
-            "home": Key.home,
-            "end": Key.end,
-            "page_up": Key.page_up,
-            "pageup": Key.page_up,
-            "page_down": Key.page_down,
-            "pagedown": Key.page_down,
-            "ctrl": Key.ctrl,
-            "control": Key.ctrl,
-            "alt": Key.alt,
-            "shift": Key.shift,
-            "cmd": Key.cmd,
-            "command": Key.cmd,
-            "win": Key.cmd if self._platform == "Darwin" else Key.cmd,
-            "f1": Key.f1,
-            "f2": Key.f2,
-            "f3": Key.f3,
-            "f4": Key.f4,
-            "f5": Key.f5,
-            "f6": Key.f6,
-            "f7": Key.f7,
-            "f8": Key.f8,
-            "f9": Key.f9,
-            "f10": Key.f10,
-            "f11": Key.f11,
-            "f12": Key.f12,
+            "enter", "tab", "space", "backspace", "delete", "esc",
+            "up", "down", "left", "right", "home", "end", "page_up", "page_down",
+            "ctrl", "alt", "shift", "cmd",
+            *(f"f{i}" for i in range(1, 13)),
         }
 
         key_lower = key.lower()
+        key_lower = aliases.get(key_lower, key_lower)
 
         # 检查是否是特殊键
         if key_lower in special_keys:
-            return special_keys[key_lower]
+            return key_lower
 
         # 处理组合键格式 (如 "ctrl+c")
         if "+" in key:
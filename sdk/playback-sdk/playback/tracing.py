@@ -0,0 +1,224 @@
+"""
+步骤追踪模块
+记录步骤各阶段（截图、OCR、模板匹配、AI、输入、等待）的耗时跨度，
+可导出为 Chrome trace-event JSON，在 chrome://tracing 或 Perfetto 中查看关键路径
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Any, Callable, Optional
+
+
+class Span:
+    """耗时跨度"""
+
+    __slots__ = ("name", "cat", "start", "end", "tid", "args", "parent", "child_time")
+
+    def __init__(self, name: str, cat: str, tid: int, args: dict, parent: Optional["Span"]):
+        self.name = name
+        self.cat = cat
+        self.start = time.perf_counter_ns()
+        self.end = 0
+        self.tid = tid
+        self.args = args
+        self.parent = parent
+        self.child_time = 0  # 子跨度总耗时(ns)，用于计算自身耗时
+
+    @property
+    def duration(self) -> int:
+        """耗时(ns)"""
+        return self.end - self.start
+
+    @property
+    def self_time(self) -> int:
+        """扣除子跨度后的自身耗时(ns)，并发子跨度可能重叠，最小为 0"""
+        return max(0, self.duration - self.child_time)
+
+
+class _SpanContext:
+    """跨度上下文管理器"""
+
+    __slots__ = ("_tracer", "_name", "_cat", "_args", "_span")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: dict):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._args = args
+        self._span: Optional[Span] = None
+
+    def __enter__(self) -> Span:
+        self._span = self._tracer._open(self._name, self._cat, self._args)
+        return self._span
+
+    def __exit__(self, *exc) -> None:
+        self._tracer._close(self._span)
+
+
+class _NullContext:
+    """未启用追踪时的空上下文"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class Tracer:
+    """
+    跨度记录器
+
+    同一线程内的跨度按 with 嵌套形成父子关系；
+    提交到线程池的任务经 bind() 包装后，其跨度挂在提交时的当前跨度下
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = 100000):
+        self.enabled = enabled
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name: str, cat: str = "playback", **args: Any):
+        """创建跨度上下文，未启用时开销仅为一次函数调用"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _SpanContext(self, name, cat, args)
+
+    def current(self) -> Optional[Span]:
+        """当前线程正在进行的跨度"""
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def bind(self, fn: Callable) -> Callable:
+        """包装函数，使其在其他线程执行时的跨度挂在当前跨度下"""
+        if not self.enabled:
+            return fn
+        parent = self.current()
+
+        @wraps(fn)
+        def run(*args, **kwargs):
+            stack = self._stack()
+            stack.append(parent)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stack.pop()
+
+        return run
+
+    def spans(self) -> list[Span]:
+        """已完成的跨度（按结束顺序）"""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """清空已记录的跨度"""
+        with self._lock:
+            self._spans.clear()
+
+    def breakdown(self, root: Optional[Span]) -> dict[str, float]:
+        """
+        统计跨度下各阶段的自身耗时(ms)
+
+        子跨度按名称累加，根跨度扣除子跨度后的剩余时间计入 other
+        """
+        if root is None:
+            return {}
+
+        phases: dict[str, int] = {}
+        with self._lock:
+            # 子跨度先于根跨度结束，从后往前扫描到根跨度开始之前即可
+            for span in reversed(self._spans):
+                if span.end < root.start:
+                    break
+                if span is root or not self._descends(span, root):
+                    continue
+                phases[span.name] = phases.get(span.name, 0) + span.self_time
+
+        phases["other"] = root.self_time
+        return {name: round(ns / 1e6, 3) for name, ns in phases.items() if ns > 0}
+
+    def to_chrome_trace(self) -> dict:
+        """导出为 Chrome trace-event 格式（完整事件 ph=X，时间单位 us）"""
+        pid = os.getpid()
+        events = []
+        threads: dict[int, str] = {}
+        for span in self.spans():
+            events.append({
+                "name": span.name,
+                "cat": span.cat,
+                "ph": "X",
+                "ts": (span.start - self._origin) / 1000,
+                "dur": span.duration / 1000,
+                "pid": pid,
+                "tid": span.tid,
+                "args": span.args,
+            })
+            threads.setdefault(span.tid, "")
+
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for tid in threads:
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": names.get(tid, str(tid))},
+            })
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> None:
+        """保存 Chrome trace JSON 文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+    def _stack(self) -> list:
+        """当前线程的跨度栈"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _open(self, name: str, cat: str, args: dict) -> Span:
+        """开始跨度并压栈"""
+        stack = self._stack()
+        span = Span(name, cat, threading.get_ident(), args, stack[-1] if stack else None)
+        stack.append(span)
+        return span
+
+    def _close(self, span: Span) -> None:
+        """结束跨度并记录"""
+        span.end = time.perf_counter_ns()
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        with self._lock:
+            if span.parent is not None:
+                span.parent.child_time += span.duration
+            self._spans.append(span)
+
+    @staticmethod
+    def _descends(span: Span, root: Span) -> bool:
+        """span 是否为 root 的后代"""
+        parent = span.parent
+        while parent is not None:
+            if parent is root:
+                return True
+            parent = parent.parent
+        return False
+
+
+# 未启用追踪的共享实例，作为各组件的默认值
+NULL_TRACER = Tracer(enabled=False)
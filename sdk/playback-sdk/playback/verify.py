@@ -0,0 +1,53 @@
+"""
+动作效果校验模块
+点击前后比较目标区域的缩小灰度签名，短时间内无变化视为点击可能被丢弃
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from .frames import capture_patch, mean_abs_diff
+from .models import PlayerConfig, Position
+
+
+class ActionVerifier:
+    """点击效果校验器"""
+
+    def __init__(self, capture, config: Optional[PlayerConfig] = None, control=None):
+        self.config = config or PlayerConfig()
+        self._capture = capture
+        self._control = control
+
+    def snapshot(self, center: Position) -> Optional[np.ndarray]:
+        """截取动作前的区域签名"""
+        return capture_patch(self._capture, center, self.config.verify_region_size)
+
+    def wait_change(self, center: Position, before: np.ndarray) -> tuple[bool, int]:
+        """
+        在 verify_window_ms 内轮询区域签名，直到与动作前不同
+
+        Returns:
+            (是否变化, 耗时ms)；无法截图时按已变化处理，不误判失败
+        """
+        start = time.monotonic()
+        window = self.config.verify_window_ms / 1000
+        poll = self.config.verify_poll_ms / 1000
+
+        while True:
+            current = capture_patch(self._capture, center, self.config.verify_region_size)
+            if current is None or mean_abs_diff(before, current) > self.config.verify_diff_threshold:
+                return True, int((time.monotonic() - start) * 1000)
+
+            elapsed = time.monotonic() - start
+            if elapsed >= window:
+                return False, int(elapsed * 1000)
+
+            seconds = min(poll, window - elapsed)
+            if self._control is not None:
+                if not self._control.sleep(seconds):
+                    # 被停止时不判定失败
+                    return True, int((time.monotonic() - start) * 1000)
+            else:
+                time.sleep(seconds)
@@ -0,0 +1,179 @@
+"""
+目标窗口跟踪模块
+录制坐标是录制时的屏幕坐标，连同录制时的窗口矩形 (target_window.rect) 一起保存，
+等价于窗口相对坐标；回放时查找一次目标窗口，按窗口偏移与 DPI 缩放换算固定坐标，
+之后每隔若干步只低开销地重新读取窗口矩形
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .models import PlayerConfig, Position
+from .tracing import NULL_TRACER, Tracer
+
+
+@dataclass(frozen=True)
+class WindowTransform:
+    """录制坐标 → 当前屏幕坐标"""
+    recorded_x: int = 0  # 录制时窗口左上角
+    recorded_y: int = 0
+    x: int = 0  # 当前窗口左上角
+    y: int = 0
+    scale: float = 1.0  # 当前 DPI 缩放 / 录制时 DPI 缩放
+
+    @property
+    def identity(self) -> bool:
+        """是否为恒等变换"""
+        return self.recorded_x == self.x and self.recorded_y == self.y and self.scale == 1.0
+
+    def apply(self, position: Position) -> Position:
+        """换算单个坐标"""
+        if self.identity:
+            return position
+        return Position(
+            round(self.x + (position.x - self.recorded_x) * self.scale),
+            round(self.y + (position.y - self.recorded_y) * self.scale),
+        )
+
+
+IDENTITY = WindowTransform()
+
+
+def _rect(rect: Any) -> Optional[tuple[int, int, int, int]]:
+    """读取窗口矩形（录制中的字典或 Region 对象）"""
+    if rect is None:
+        return None
+    if isinstance(rect, dict):
+        return rect.get("x", 0), rect.get("y", 0), rect.get("width", 0), rect.get("height", 0)
+    return rect.x, rect.y, rect.width, rect.height
+
+
+class WindowTracker:
+    """
+    目标窗口跟踪器
+
+    窗口来源需实现 list_windows()（返回带 window_id/title/process_name/rect 的窗口信息），
+    可选实现 window_rect(window_id) 用于低开销的重新校验（如 recorder.ScreenCapture）
+    """
+
+    def __init__(self, config: Optional[PlayerConfig] = None, tracer: Optional[Tracer] = None):
+        self.config = config or PlayerConfig()
+        self._tracer = tracer or NULL_TRACER
+        self._source = None
+        self._target: Optional[dict] = None
+        self._window_id: Optional[str] = None
+        self._transform = IDENTITY
+        self._steps = 0  # 距上次校验的步骤数
+        self._missing_reported = False
+
+    def set_source(self, source) -> None:
+        """设置窗口来源，不支持列举窗口时不做换算"""
+        self._source = source if hasattr(source, "list_windows") else None
+        self.reset(self._target)
+
+    def set_tracer(self, tracer: Tracer) -> None:
+        """设置跨度记录器"""
+        self._tracer = tracer
+
+    @property
+    def enabled(self) -> bool:
+        """是否需要换算坐标"""
+        return (
+            self.config.follow_window
+            and self._source is not None
+            and self._target is not None
+            and _rect(self._target.get("rect")) is not None
+        )
+
+    @property
+    def transform(self) -> WindowTransform:
+        """当前坐标变换"""
+        return self._transform
+
+    def reset(self, target_window: Optional[dict]) -> None:
+        """切换录制的目标窗口，下一步执行前重新查找"""
+        self._target = target_window
+        self._window_id = None
+        self._transform = IDENTITY
+        self._steps = 0
+        self._missing_reported = False
+
+    def step(self) -> None:
+        """每步执行前调用：首次或每隔 window_check_steps 步重新校验窗口位置"""
+        if not self.enabled:
+            return
+
+        interval = self.config.window_check_steps
+        if self._window_id is None or (interval > 0 and self._steps >= interval):
+            with self._tracer.span("window", cat="window"):
+                self._refresh()
+            self._steps = 0
+        self._steps += 1
+
+    def region(self) -> Optional[tuple[int, int, int, int]]:
+        """目标窗口当前在屏幕上的区域 (x, y, width, height)，录制未记录窗口矩形时为 None"""
+        rect = _rect(self._target.get("rect")) if self._target else None
+        if rect is None or rect[2] <= 0 or rect[3] <= 0:
+            return None
+        origin = self._transform.apply(Position(rect[0], rect[1]))
+        scale = self._transform.scale
+        return origin.x, origin.y, round(rect[2] * scale), round(rect[3] * scale)
+
+    def apply(self, position: Optional[Position]) -> Optional[Position]:
+        """把录制坐标换算为当前屏幕坐标"""
+        if position is None:
+            return None
+        return self._transform.apply(position)
+
+    def _refresh(self) -> None:
+        """重新读取窗口矩形，窗口已不存在时重新查找；都失败时沿用上次的变换"""
+        rect = None
+        window_rect = getattr(self._source, "window_rect", None)
+        if self._window_id is not None and window_rect is not None:
+            try:
+                rect = _rect(window_rect(self._window_id))
+            except Exception as e:
+                print(f"Window rect error: {e}")
+
+        scale = self._transform.scale
+        if rect is None:
+            window = self._find()
+            if window is None:
+                if not self._missing_reported:
+                    print(f"Target window not found: {self._target.get('title')}, using recorded positions")
+                    self._missing_reported = True
+                return
+            self._window_id = str(window.window_id)
+            rect = _rect(window.rect)
+            scale = (getattr(window, "scale", None) or 1.0) / (self._target.get("scale") or 1.0)
+
+        recorded = _rect(self._target.get("rect"))
+        self._transform = WindowTransform(recorded[0], recorded[1], rect[0], rect[1], scale)
+
+    def _find(self):
+        """按标题与进程名查找目标窗口，并列时取尺寸最接近录制时的窗口"""
+        try:
+            windows = self._source.list_windows()
+        except Exception as e:
+            print(f"List windows error: {e}")
+            return None
+
+        title = self._target.get("title") or ""
+        process = self._target.get("process_name") or ""
+        _, _, width, height = _rect(self._target.get("rect"))
+
+        def score(window) -> tuple[int, int]:
+            matched = 0
+            if title and window.title == title:
+                matched += 2
+            elif title and title in window.title:
+                matched += 1
+            if process and getattr(window, "process_name", "") == process:
+                matched += 2
+            _, _, w, h = _rect(window.rect)
+            return matched, -(abs(w - width) + abs(h - height))
+
+        best = max(windows, key=score, default=None)
+        if best is None or score(best)[0] == 0:
+            return None
+        return best
@@ -0,0 +1,117 @@
+"""
+X 虚拟显示模块
+启动独立的 Xvfb 显示并在其上截图，多实例回放时每个实例拥有自己的屏幕与鼠标键盘
+"""
+
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+
+class XvfbDisplay:
+    """
+    Xvfb 虚拟显示
+
+    Args:
+        display: 显示编号，如 ":101"
+        size: 屏幕尺寸
+        depth: 色深
+    """
+
+    def __init__(self, display: str, size: tuple[int, int] = (1280, 720), depth: int = 24):
+        self.display = display
+        self.size = size
+        self.depth = depth
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def running(self) -> bool:
+        """Xvfb 进程是否在运行"""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, timeout: float = 5.0) -> None:
+        """启动 Xvfb 并等待显示可用"""
+        if self.running:
+            return
+        binary = shutil.which("Xvfb")
+        if binary is None:
+            raise RuntimeError("Xvfb not installed. Please install with: apt install xvfb")
+
+        width, height = self.size
+        self._process = subprocess.Popen(
+            [binary, self.display, "-screen", "0", f"{width}x{height}x{self.depth}", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        # 显示就绪后会创建对应的 socket
+        socket = Path(f"/tmp/.X11-unix/X{self.display.lstrip(':').split('.')[0]}")
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"Xvfb {self.display} exited with code {self._process.returncode}")
+            if socket.exists():
+                return
+            time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"Xvfb {self.display} did not start within {timeout}s")
+
+    def stop(self) -> None:
+        """停止 Xvfb"""
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+    def launch(self, command: list[str]) -> subprocess.Popen:
+        """在该显示上启动程序（如游戏客户端）"""
+        return subprocess.Popen(command, env={**os.environ, "DISPLAY": self.display})
+
+    def __enter__(self) -> "XvfbDisplay":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+
+class XDisplayCapture:
+    """
+    指定 X 显示的屏幕捕获器，实现 capture_window / capture_region 接口
+
+    Args:
+        display: 显示编号，如 ":101"，为空时使用 DISPLAY 环境变量
+    """
+
+    def __init__(self, display: Optional[str] = None):
+        self.display = display or os.environ.get("DISPLAY", ":0")
+
+    def capture_window(self, window_id: Optional[str] = None) -> Optional[Image.Image]:
+        """截取整个显示"""
+        from PIL import ImageGrab
+
+        try:
+            return ImageGrab.grab(xdisplay=self.display)
+        except Exception as e:
+            print(f"Capture error on {self.display}: {e}")
+            return None
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        """截取显示区域"""
+        from PIL import ImageGrab
+
+        try:
+            return ImageGrab.grab(bbox=(x, y, x + width, y + height), xdisplay=self.display)
+        except Exception as e:
+            print(f"Capture error on {self.display}: {e}")
+            return None
@@ -0,0 +1,91 @@
+"""模板资源缓存：内容寻址与按最近使用淘汰"""
+
+import io
+import itertools
+import sqlite3
+
+import pytest
+from PIL import Image
+
+from playback import assets
+from playback.assets import AssetCache
+from playback.models import PlayerConfig
+from playback.player import Player
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """单调递增的时间，保证最近使用顺序确定"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(assets.time, "time", lambda: float(next(ticks)))
+
+
+def test_put_and_get(tmp_path, clock):
+    cache = AssetCache(str(tmp_path))
+    path = cache.put("http://a/1.png", b"one")
+    assert path.read_bytes() == b"one"
+    assert "http://a/1.png" in cache
+    assert "http://a/2.png" not in cache
+    assert cache.get("http://a/1.png") == b"one"
+    assert cache.get("http://a/2.png") is None
+
+
+def test_same_content_stored_once(tmp_path, clock):
+    cache = AssetCache(str(tmp_path))
+    first = cache.put("http://a/1.png", b"same")
+    second = cache.put("http://b/1.png", b"same")
+    assert first == second
+    assert cache.size == 4
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    cache = AssetCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # a 变为最近使用
+    cache.put("c", b"cccc")
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.size == 8
+
+
+def test_evicted_file_removed_from_disk(tmp_path, clock):
+    cache = AssetCache(str(tmp_path), max_bytes=4)
+    old = cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert not old.exists()
+
+
+def test_externally_deleted_file_is_forgotten(tmp_path, clock):
+    cache = AssetCache(str(tmp_path))
+    cache.put("a", b"aaaa").unlink()
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_load_image_and_clear(tmp_path, clock):
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 3), "red").save(buffer, "PNG")
+    cache = AssetCache(str(tmp_path))
+    path = cache.put("tpl", buffer.getvalue())
+    assert cache.load_image("tpl").size == (4, 3)
+    assert cache.load_image("missing") is None
+
+    cache.clear()
+    assert not path.exists()
+    assert cache.size == 0
+    cache.close()
+
+
+def test_index_persists_across_instances(tmp_path, clock):
+    AssetCache(str(tmp_path)).put("a", b"aaaa")
+    assert AssetCache(str(tmp_path)).get("a") == b"aaaa"
+
+
+def test_player_close_closes_its_cache(tmp_path):
+    player = Player(PlayerConfig(asset_cache_dir=str(tmp_path)))
+    cache = player._assets.cache
+    player.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        cache._conn.execute("SELECT 1")
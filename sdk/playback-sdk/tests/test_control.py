@@ -0,0 +1,72 @@
+"""播放控制：暂停冻结倒计时、停止立即唤醒"""
+
+import asyncio
+import threading
+import time
+
+from playback.control import PlaybackControl
+
+
+def test_sleep_completes_without_interruption():
+    control = PlaybackControl()
+    start = time.monotonic()
+    assert control.sleep(0.05)
+    assert time.monotonic() - start >= 0.05
+
+
+def test_stop_wakes_sleeper():
+    control = PlaybackControl()
+    threading.Timer(0.05, control.stop).start()
+    start = time.monotonic()
+    assert not control.sleep(5)
+    assert time.monotonic() - start < 1.0
+    assert not control.checkpoint()
+
+
+def test_pause_freezes_countdown():
+    control = PlaybackControl()
+    threading.Timer(0.02, control.pause).start()
+    threading.Timer(0.22, control.resume).start()
+    start = time.monotonic()
+    assert control.sleep(0.1)
+    # 暂停的 0.2s 不计入睡眠时长
+    assert time.monotonic() - start >= 0.28
+    assert 0.15 <= control.paused_total() < 1.0
+
+
+def test_checkpoint_blocks_while_paused():
+    control = PlaybackControl()
+    control.pause()
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: control.checkpoint() and done.set())
+    thread.start()
+    assert not done.wait(0.1)
+    control.resume()
+    assert done.wait(1.0)
+    thread.join()
+
+
+def test_stop_while_paused_and_reset():
+    control = PlaybackControl()
+    control.pause()
+    threading.Timer(0.05, control.stop).start()
+    assert not control.sleep(1)
+    assert control.stopped and not control.paused
+    # 停止后不能再暂停，reset 后恢复可用
+    control.pause()
+    assert not control.paused
+    control.reset()
+    assert not control.stopped
+    assert control.sleep(0)
+
+
+def test_sleep_async_stops_from_other_thread():
+    control = PlaybackControl()
+
+    async def run():
+        threading.Timer(0.05, control.stop).start()
+        return await control.sleep_async(5)
+
+    start = time.monotonic()
+    assert asyncio.run(run()) is False
+    assert time.monotonic() - start < 1.0
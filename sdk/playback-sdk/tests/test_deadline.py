@@ -0,0 +1,49 @@
+"""截止时间：剩余预算、分摊与可中断睡眠"""
+
+import threading
+import time
+
+from playback.control import PlaybackControl
+from playback.deadline import Deadline
+
+
+def test_unbounded_never_expires():
+    deadline = Deadline.unbounded()
+    assert not deadline.bounded
+    assert deadline.remaining() is None
+    assert deadline.remaining_ms() is None
+    assert not deadline.expired()
+
+
+def test_remaining_counts_down_to_zero():
+    deadline = Deadline(50)
+    assert deadline.bounded
+    assert 0 < deadline.remaining_ms() <= 50
+    time.sleep(0.06)
+    assert deadline.expired()
+    assert deadline.remaining() == 0.0
+
+
+def test_share_splits_remaining_budget():
+    deadline = Deadline(1000)
+    part = deadline.share(4)
+    assert 200 <= part.remaining_ms() <= 250
+    assert deadline.share(4, cap=100).remaining_ms() <= 100
+    # 不限时的截止时间只受 cap 约束
+    assert not Deadline.unbounded().share(3).bounded
+    assert Deadline.unbounded().share(3, cap=100).remaining_ms() <= 100
+
+
+def test_sleep_is_capped_by_deadline():
+    deadline = Deadline(50)
+    start = time.monotonic()
+    assert deadline.sleep(2.0)
+    assert time.monotonic() - start < 0.5
+
+
+def test_sleep_returns_false_when_stopped():
+    control = PlaybackControl()
+    threading.Timer(0.05, control.stop).start()
+    start = time.monotonic()
+    assert not Deadline(5000).sleep(2.0, control)
+    assert time.monotonic() - start < 1.0
@@ -0,0 +1,111 @@
+"""画面指纹：录制端与回放端哈希一致性、多索引哈希查找"""
+
+import importlib.util
+import random
+from pathlib import Path
+
+from PIL import Image
+
+from playback.fingerprint import HASH_SIZE, FrameIndex, MultiIndexHash, dhash, hamming, parse_hash
+
+
+def noise(seed: int, size=(160, 90)) -> Image.Image:
+    """可复现的噪声画面"""
+    image = Image.effect_noise(size, 64 + seed).convert("RGB")
+    return image.rotate(seed * 37)
+
+
+def load_framehash():
+    """单独加载录制端帧哈希模块（不经过 recorder/__init__，无显示时也可导入）"""
+    path = Path(__file__).resolve().parents[2] / "recorder-sdk" / "recorder" / "framehash.py"
+    spec = importlib.util.spec_from_file_location("recorder_framehash", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_recorder_frame_hash_matches_dhash():
+    framehash = load_framehash()
+    assert framehash.FRAME_HASH_SIZE == HASH_SIZE
+    for seed in range(8):
+        image = noise(seed)
+        recorded = framehash.frame_hash(image)
+        assert len(recorded) == HASH_SIZE * HASH_SIZE // 4
+        assert parse_hash(recorded) == dhash(image)
+
+
+def test_dhash_bit_order():
+    # 逐像素比较的参考实现：按行从左到右，左侧更亮记 1，先比较的位在高位
+    image = noise(3)
+    small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR)
+    value = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (small.getpixel((col, row)) > small.getpixel((col + 1, row)))
+    assert dhash(image) == value
+
+
+def flip(value: int, bits) -> int:
+    """翻转指定位"""
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+def test_multi_index_hash_exact_match_returns_all_values():
+    index = MultiIndexHash()
+    index.add(0xABCD, "a")
+    index.add(0xABCD, "b")
+    index.add(0x1234, "c")
+    assert len(index) == 3
+    assert index.nearest(0xABCD, 8) == (0, ["a", "b"])
+
+
+def test_multi_index_hash_radius():
+    index = MultiIndexHash()
+    base = 0x0F0F_F0F0_1234_5678
+    index.add(base, "base")
+    # 距离分散在各段时也能找到（每段不超过 r // 4）
+    query = flip(base, [0, 17, 33, 50, 63])
+    assert index.nearest(query, 8) == (5, ["base"])
+    assert index.nearest(flip(base, range(10)), 8) == (-1, [])
+    assert MultiIndexHash().nearest(base, 8) == (-1, [])
+
+
+def test_multi_index_hash_ties_and_closest():
+    index = MultiIndexHash()
+    index.add(flip(0, [1, 2]), "far")
+    index.add(flip(0, [3]), "near-1")
+    index.add(flip(0, [40]), "near-2")
+    distance, values = index.nearest(0, 6)
+    assert distance == 1
+    assert sorted(values) == ["near-1", "near-2"]
+
+
+def test_multi_index_hash_matches_linear_scan():
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(300)]
+    index = MultiIndexHash()
+    for i, value in enumerate(hashes):
+        index.add(value, i)
+
+    for _ in range(200):
+        query = flip(rng.choice(hashes), rng.sample(range(64), rng.randrange(0, 12)))
+        best = min(hamming(query, value) for value in hashes)
+        distance, values = index.nearest(query, 10)
+        if best > 10:
+            assert (distance, values) == (-1, [])
+        else:
+            assert distance == best
+            assert sorted(values) == [i for i, value in enumerate(hashes) if hamming(query, value) == best]
+
+
+def test_frame_index_prefers_steps_from_near():
+    index = FrameIndex()
+    for step_index in (2, 5, 9):
+        index.add(0xFF, step_index)
+    assert index.nearest(0xFF, 4) == (2, 0)
+    assert index.nearest(0xFF, 4, near=3) == (5, 0)
+    # near 之后没有匹配时取之前最近的
+    assert index.nearest(0xFF, 4, near=10) == (9, 0)
+    assert index.nearest(flip(0xFF, range(20)), 4) is None
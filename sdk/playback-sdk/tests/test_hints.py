@@ -0,0 +1,67 @@
+"""定位提示存储：搜索区域收缩、漂移与失败恢复"""
+
+from playback.hints import HintStore
+from playback.models import PlayerConfig, Position
+
+
+def store(**overrides) -> HintStore:
+    config = PlayerConfig(**{"search_region_expand": 200, "hint_min_expand": 40, "hint_shrink_factor": 0.5, **overrides})
+    return HintStore(config=config)
+
+
+def test_missing_hint():
+    assert store().get("r", "s") is None
+    assert store().record_miss("r", "s") is None
+
+
+def test_success_shrinks_search_region_to_minimum():
+    hints = store()
+    expands = [hints.record_success("r", "s", Position(5, -3), 0.9).expand for _ in range(4)]
+    assert expands == [100, 50, 40, 40]
+
+    hint = hints.get("r", "s")
+    assert (hint.offset_x, hint.offset_y) == (5, -3)
+    assert hint.hits == 4 and hint.misses == 0
+    assert hint.confidence == 0.9
+
+
+def test_drift_keeps_region_wide_enough():
+    hints = store()
+    for _ in range(3):
+        hints.record_success("r", "s", Position(0, 0), 0.9)
+    # 偏移漂移 45px：区域至少为漂移量的两倍
+    assert hints.record_success("r", "s", Position(45, 0), 0.9).expand == 90
+    # 不超过默认搜索区域
+    assert hints.record_success("r", "s", Position(-200, 0), 0.9).expand == 200
+
+
+def test_miss_restores_default_region():
+    hints = store()
+    hints.record_success("r", "s", Position(1, 1), 0.8)
+    hint = hints.record_miss("r", "s")
+    assert hint.expand == 200
+    assert hint.confidence == 0.4
+    assert hints.get("r", "s").misses == 1
+
+
+def test_clear_by_recording():
+    hints = store()
+    hints.record_success("r1", "s", Position(0, 0), 1.0)
+    hints.record_success("r2", "s", Position(0, 0), 1.0)
+    hints.clear("r1")
+    assert hints.get("r1", "s") is None
+    assert hints.get("r2", "s") is not None
+    hints.clear()
+    assert hints.get("r2", "s") is None
+
+
+def test_persists_to_file(tmp_path):
+    path = str(tmp_path / "db" / "hints.db")
+    first = HintStore(path)
+    first.record_success("r", "s", Position(3, 4), 0.7)
+    first.close()
+
+    second = HintStore(path)
+    hint = second.get("r", "s")
+    assert (hint.offset_x, hint.offset_y, hint.hits) == (3, 4, 1)
+    second.close()
@@ -0,0 +1,74 @@
+"""多实例回放：实例进程中按调用方的下载函数预取模板"""
+
+import io
+import queue
+import threading
+
+from PIL import Image, ImageDraw
+
+from playback.backends import VirtualBackend
+from playback.multi import InstanceSpec, _run_instance
+
+
+TEMPLATE_URL = "minio://recordings/button.png"
+
+# 按钮在画面中的实际中心（录制坐标偏离此处）
+BUTTON = (420, 260)
+
+
+def screen() -> Image.Image:
+    """带一个按钮的合成画面"""
+    image = Image.new("RGB", (640, 400), (40, 40, 40))
+    draw = ImageDraw.Draw(image)
+    x, y = BUTTON
+    draw.rectangle((x - 30, y - 15, x + 30, y + 15), fill=(30, 120, 220))
+    draw.text((x - 20, y - 6), "PLAY", fill=(255, 255, 255))
+    draw.line((x - 30, y + 15, x + 30, y - 15), fill=(250, 200, 0), width=2)
+    return image
+
+
+BACKEND = VirtualBackend(background=screen(), record_moves=False)
+FETCHED: list[str] = []
+
+
+def backend_factory():
+    return BACKEND
+
+
+def minio_fetcher():
+    template = io.BytesIO()
+    x, y = BUTTON
+    screen().crop((x - 40, y - 25, x + 40, y + 25)).save(template, "PNG")
+
+    def fetch(url: str):
+        FETCHED.append(url)
+        return template.getvalue() if url == TEMPLATE_URL else None
+
+    return fetch
+
+
+def test_instance_prefetches_minio_templates_with_spec_fetcher(tmp_path):
+    recording = {"id": "r", "steps": [{
+        "id": "s0", "index": 0, "type": "click", "mode": "smart",
+        "position": {"x": 380, "y": 230}, "screenshot": TEMPLATE_URL,
+    }]}
+    spec = InstanceSpec(
+        name="instance-0",
+        recording=recording,
+        config={"asset_cache_dir": str(tmp_path / "assets"), "step_delay": 0},
+        backend=backend_factory,
+        asset_fetcher=minio_fetcher,
+    )
+    updates: queue.Queue = queue.Queue()
+
+    _run_instance(spec, updates, threading.Event(), None)
+
+    statuses = []
+    while not updates.empty():
+        statuses.append(updates.get())
+    assert statuses[-1].status == "completed"
+    assert statuses[-1].succeeded == 1
+    assert FETCHED == [TEMPLATE_URL]
+    # 模板从本地缓存加载并匹配到按钮，而不是回退录制坐标
+    clicks = [action.args for action in BACKEND.actions if action.action == "click"]
+    assert clicks == [("left", *BUTTON, 1)]
@@ -0,0 +1,154 @@
+"""录制优化：各项改写规则与缺少时间戳的步骤"""
+
+import copy
+
+import pytest
+
+from playback.hints import HintStore
+from playback.models import PlayerConfig, Position
+from playback.optimizer import optimize_recording
+
+
+def optimize(*steps, **kwargs):
+    recording = {"id": "r", "steps": [{"id": f"s{i}", "index": i, **step} for i, step in enumerate(steps)]}
+    optimized, report = optimize_recording(recording, **kwargs)
+    return optimized["steps"], report
+
+
+def rules(report) -> list[str]:
+    return [change.rule for change in report.changes]
+
+
+def test_recording_is_not_modified():
+    recording = {"id": "r", "steps": [
+        {"id": "a", "type": "input", "text": "ab", "timestamp": 100},
+        {"id": "b", "type": "input", "text": "cd", "timestamp": 200},
+    ]}
+    original = copy.deepcopy(recording)
+    optimize_recording(recording)
+    assert recording == original
+
+
+def test_drop_noops():
+    steps, report = optimize(
+        {"type": "input", "text": ""},
+        {"type": "key", "key": ""},
+        {"type": "wait", "mode": "time", "duration": 0},
+        {"type": "click", "position": {"x": 1, "y": 1}},
+    )
+    assert [s["type"] for s in steps] == ["click"]
+    assert steps[0]["index"] == 0
+    assert rules(report) == ["noop"] * 3
+    assert report.saved_ms > 0
+
+
+def test_short_drag_becomes_click():
+    steps, report = optimize({"type": "drag", "from": {"x": 10, "y": 10}, "to": {"x": 11, "y": 11}})
+    assert steps == [{"id": "s0", "index": 0, "type": "click", "position": {"x": 10, "y": 10}, "button": "left"}]
+    assert rules(report) == ["short_drag"]
+
+
+def test_modifier_steps_are_not_folded():
+    # 单独按下再松开修饰键与组合键不等价
+    steps, report = optimize(
+        {"type": "key", "key": "ctrl", "timestamp": 100},
+        {"type": "input", "text": "c", "timestamp": 150},
+    )
+    assert [s["type"] for s in steps] == ["key", "input"]
+    assert report.changes == []
+
+
+def test_merge_inputs_and_scrolls():
+    steps, report = optimize(
+        {"type": "input", "text": "he", "timestamp": 100},
+        {"type": "input", "text": "llo", "timestamp": 300},
+        {"type": "scroll", "position": {"x": 5, "y": 5}, "timestamp": 400},
+        {"type": "scroll", "position": {"x": 7, "y": 6}, "amount": 0, "timestamp": 500},
+        {"type": "scroll", "position": {"x": 6, "y": 6}, "amount": 50, "timestamp": 600},
+    )
+    assert steps[0]["text"] == "hello"
+    # 只有未指定的滚动量按 100 处理
+    assert steps[1]["amount"] == 150
+    assert rules(report) == ["merge_input", "merge_scroll", "merge_scroll"]
+
+
+def test_dedupe_clicks():
+    click = {"type": "click", "position": {"x": 1, "y": 2}}
+    steps, report = optimize(
+        {**click, "timestamp": 1000},
+        {**click, "timestamp": 1050},
+        {**click, "timestamp": 1200},
+    )
+    assert [s["id"] for s in steps] == ["s0", "s2"]
+    assert rules(report) == ["duplicate_click"]
+
+
+def test_dedupe_keeps_clicks_of_a_double_click():
+    click = {"type": "click", "position": {"x": 1, "y": 2}}
+    steps, report = optimize(
+        {**click, "timestamp": 1000},
+        {**click, "timestamp": 1030},
+        {**click, "description": "双击", "timestamp": 1060},
+    )
+    assert [s["id"] for s in steps] == ["s0", "s1", "s2"]
+    assert report.changes == []
+
+
+def test_merge_waits():
+    steps, _ = optimize(
+        {"type": "wait", "mode": "time", "duration": 300},
+        {"type": "wait", "duration": 200},
+        {"type": "wait", "mode": "condition", "condition": {"type": "text_appear", "value": "ok"}},
+    )
+    assert [s.get("duration") for s in steps] == [500, None]
+
+
+def test_gap_beyond_merge_gap_is_kept():
+    steps, report = optimize(
+        {"type": "input", "text": "a", "timestamp": 100},
+        {"type": "input", "text": "b", "timestamp": 5000},
+        merge_gap=1500,
+    )
+    assert len(steps) == 2
+    assert report.changes == []
+
+
+@pytest.mark.parametrize("timestamps", [(0, 0), (None, None), (1000, 0), (0, 1000), (1000, None)])
+def test_steps_without_timestamps_are_not_merged(timestamps):
+    def stamp(step, ts):
+        return {**step, "timestamp": ts} if ts is not None else step
+
+    click = {"type": "click", "position": {"x": 1, "y": 2}}
+    scroll = {"type": "scroll", "position": {"x": 1, "y": 2}}
+    steps, report = optimize(
+        stamp({"type": "input", "text": "a"}, timestamps[0]),
+        stamp({"type": "input", "text": "b"}, timestamps[1]),
+        stamp(scroll, timestamps[0]),
+        stamp(scroll, timestamps[1]),
+        stamp(click, timestamps[0]),
+        stamp(click, timestamps[1]),
+        stamp({"type": "key", "key": "ctrl"}, timestamps[0]),
+        stamp({"type": "key", "key": "c"}, timestamps[1]),
+    )
+    assert len(steps) == 8
+    assert report.changes == []
+
+
+def test_stable_smart_steps():
+    hints = HintStore(config=PlayerConfig())
+    for _ in range(6):
+        hints.record_success("r", "s0", Position(3, -2), 0.95)
+    smart = {"type": "click", "mode": "smart", "position": {"x": 100, "y": 50}, "screenshot": "tpl"}
+
+    steps, report = optimize(smart, hints=hints)
+    assert report.stable_steps == ["s0"]
+    assert steps[0]["mode"] == "smart"
+
+    steps, report = optimize(smart, hints=hints, downgrade_stable=True)
+    assert steps[0]["mode"] == "fixed"
+    assert steps[0]["position"] == {"x": 103, "y": 48}
+    assert report.saved_ms > 0
+
+    hints.record_miss("r", "s0")
+    _, report = optimize(smart, hints=hints)
+    assert report.stable_steps == []
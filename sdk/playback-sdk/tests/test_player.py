@@ -0,0 +1,285 @@
+"""播放器：在虚拟输入后端与静态画面上执行录制"""
+
+import time
+
+from PIL import Image, ImageDraw
+
+from playback.backends import VirtualBackend
+from playback.fingerprint import dhash
+from playback.frames import capture_patch
+from playback.models import LocatorResult, PlaybackStatus, PlayerConfig, Position, Speculation
+from playback.player import Player
+
+
+# 按钮在画面中的中心
+BUTTON = (420, 260)
+
+
+def screen() -> Image.Image:
+    """带一个按钮的合成画面"""
+    image = Image.new("RGB", (640, 400), (40, 40, 40))
+    draw = ImageDraw.Draw(image)
+    x, y = BUTTON
+    draw.rectangle((x - 30, y - 15, x + 30, y + 15), fill=(30, 120, 220))
+    draw.line((x - 30, y + 15, x + 30, y - 15), fill=(250, 200, 0), width=2)
+    draw.rectangle((60, 60, 140, 100), fill=(200, 60, 60))
+    return image
+
+
+def button_template() -> Image.Image:
+    x, y = BUTTON
+    return screen().crop((x - 40, y - 25, x + 40, y + 25))
+
+
+class StaticScreen:
+    """不随输入变化的画面（截图器接口）"""
+
+    def __init__(self, image: Image.Image):
+        self.image = image
+
+    def capture_window(self, window_id=None):
+        return self.image.copy()
+
+    def capture_region(self, x, y, width, height):
+        return self.image.crop((x, y, x + width, y + height))
+
+
+def make_player(steps, templates=None, **config):
+    """创建使用虚拟输入后端与静态画面的播放器"""
+    config = {"step_delay": 0, "click_delay": 0, "retry_delay": 0, **config}
+    player = Player(PlayerConfig(**config))
+    backend = VirtualBackend(size=(640, 400), record_moves=False)
+    player.set_input_backend(backend)
+    player.set_screen_capture(StaticScreen(screen()))
+    templates = templates or {}
+    player.set_template_loader(templates.get)
+    player.load({"id": "r", "steps": [{"id": f"s{i}", "index": i, **step} for i, step in enumerate(steps)]})
+    return player, backend
+
+
+def clicks(backend: VirtualBackend) -> list[tuple]:
+    return [action.args[1:3] for action in backend.actions if action.action == "click"]
+
+
+def test_resync_discards_stale_lookahead():
+    frame = f"{dhash(screen()):016x}"
+    steps = [
+        {"type": "click", "mode": "smart", "screenshot": "button", "position": {"x": 400, "y": 250},
+         "frame_hash": frame},
+        # 画面中不存在的目标，且没有录制坐标可回退：失败后按画面重新同步到第 0 步
+        {"type": "click", "mode": "smart", "screenshot": "missing", "frame_hash": "0" * 16},
+    ]
+    player, backend = make_player(
+        steps,
+        templates={"button": button_template(), "missing": Image.effect_noise((40, 40), 80).convert("RGB")},
+        lookahead=True,
+        resync_on_failure=True,
+        resync_limit=1,
+        retry_count=0,
+    )
+    stale = Position(100, 80)
+    patch = capture_patch(StaticScreen(screen()), stale, player.config.lookahead_patch_size)
+
+    def on_step(step, result):
+        # 失败时登记一个针对第 0 步的过期预解析（其目标区域未变化，校验会通过）
+        if step["id"] == "s1":
+            player._speculations["s0"] = Speculation(
+                step_id="s0", result=LocatorResult(found=True, position=stale, method="template"), patch=patch
+            )
+
+    player.on_step(on_step)
+    player.play()
+    assert player.wait(10) == PlaybackStatus.ERROR
+    player.close()
+
+    assert clicks(backend) == [BUTTON, BUTTON]
+
+
+class DelayedScreen(StaticScreen):
+    """前 hidden 次截图中按钮尚未出现"""
+
+    def __init__(self, image: Image.Image, hidden: int):
+        super().__init__(image)
+        self.hidden = hidden
+        self.blank = Image.new("RGB", image.size, (40, 40, 40))
+
+    def capture_window(self, window_id=None):
+        return self._next().copy()
+
+    def capture_region(self, x, y, width, height):
+        return self._next().crop((x, y, x + width, y + height))
+
+    def _next(self) -> Image.Image:
+        self.hidden -= 1
+        return self.blank if self.hidden >= 0 else self.image
+
+
+def test_retry_relocates_without_repeating_clicks():
+    player, backend = make_player(
+        [{"type": "click", "mode": "smart", "screenshot": "button"}],
+        templates={"button": button_template()},
+        retry_count=3,
+        retry_jitter=0,
+    )
+    player.set_screen_capture(DelayedScreen(screen(), hidden=2))
+    player.play()
+    assert player.wait(10) == PlaybackStatus.COMPLETED
+    player.close()
+
+    [result] = player.get_logs()
+    assert result.retry_count == 2
+    assert clicks(backend) == [BUTTON]
+
+
+def test_failed_retries_send_no_input():
+    player, backend = make_player(
+        [{"type": "click", "mode": "smart", "screenshot": "missing"}],
+        templates={"missing": Image.effect_noise((40, 40), 80).convert("RGB")},
+        retry_count=2,
+        retry_jitter=0,
+    )
+    player.play()
+    assert player.wait(10) == PlaybackStatus.ERROR
+    player.close()
+
+    [result] = player.get_logs()
+    assert result.retry_count == 2
+    assert backend.actions == []
+
+
+def test_click_without_screen_change_fails_after_reissue():
+    player, backend = make_player(
+        [{"type": "click", "position": {"x": 100, "y": 80}}],
+        verify_clicks=True,
+        verify_window_ms=60,
+        verify_poll_ms=10,
+        verify_reissue=1,
+    )
+    player.play()
+    assert player.wait(10) == PlaybackStatus.ERROR
+    player.close()
+
+    [result] = player.get_logs()
+    assert result.message == "No screen change after click"
+    # 首次点击 + 一次重新点击
+    assert clicks(backend) == [(100, 80), (100, 80)]
+    stats = player.get_verify_stats()
+    assert (stats.checks, stats.caught, stats.recovered, stats.failed) == (1, 1, 0, 1)
+
+
+def test_click_with_screen_change_passes_verification():
+    # 虚拟后端在点击处绘制标记，作为截图器时点击即可观察到画面变化（校验区域缩小到标记附近）
+    player, _ = make_player(
+        [{"type": "click", "position": {"x": 100, "y": 80}}], verify_clicks=True, verify_region_size=24
+    )
+    framebuffer = VirtualBackend(background=screen(), record_moves=False)
+    player.set_input_backend(framebuffer)
+    player.set_screen_capture(framebuffer)
+    player.play()
+    assert player.wait(10) == PlaybackStatus.COMPLETED
+    player.close()
+
+    assert clicks(framebuffer) == [(100, 80)]
+    stats = player.get_verify_stats()
+    assert (stats.checks, stats.caught) == (1, 0)
+
+
+def test_consecutive_fixed_steps_run_as_one_batch():
+    steps = [
+        {"type": "click", "position": {"x": 10, "y": 20}},
+        {"type": "key", "key": "enter"},
+        {"type": "input", "text": "ab"},
+        {"type": "click", "position": {"x": 30, "y": 40}},
+        # 智能步骤不参与合并
+        {"type": "click", "mode": "smart", "screenshot": "button", "position": {"x": 400, "y": 250}},
+        {"type": "click", "position": {"x": 50, "y": 60}},
+    ]
+    player, backend = make_player(
+        steps, templates={"button": button_template()}, batch_fixed_steps=True, trace=True
+    )
+    player.play()
+    assert player.wait(10) == PlaybackStatus.COMPLETED
+    player.close()
+
+    assert clicks(backend) == [(10, 20), (30, 40), BUTTON, (50, 60)]
+    assert backend.text == "\nab"
+    assert [s.step_id for s in player.get_logs()] == [f"s{i}" for i in range(6)]
+    batches = [(span.args["index"], span.args["count"]) for span in player.tracer.spans() if span.name == "batch"]
+    assert batches == [(0, 4)]
+
+
+def test_batching_is_off_with_click_verification():
+    steps = [{"type": "click", "position": {"x": 10, "y": 20}}, {"type": "key", "key": "enter"}]
+    player, _ = make_player(steps, batch_fixed_steps=True, trace=True, verify_clicks=True, verify_window_ms=0)
+    player.play()
+    player.wait(10)
+    player.close()
+
+    assert not [span for span in player.tracer.spans() if span.name == "batch"]
+
+
+def test_loop_runs_iterations_with_bounded_log():
+    steps = [{"type": "click", "position": {"x": 10, "y": 20}}, {"type": "key", "key": "a"}]
+    player, backend = make_player(steps, loop_iterations=3, log_capacity=4)
+    iterations = []
+    player.on_iteration(lambda stats: iterations.append(stats.iteration))
+    player.play()
+    assert player.wait(10) == PlaybackStatus.COMPLETED
+    player.close()
+
+    assert len(clicks(backend)) == 3
+    assert iterations == [0, 1, 2]
+    assert [(s.steps, s.succeeded, s.completed) for s in player.get_iteration_stats()] == [(2, 2, True)] * 3
+    # 内存中只保留最近 log_capacity 条结果
+    assert [s.step_id for s in player.get_logs()] == ["s0", "s1", "s0", "s1"]
+
+
+def wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_pause_resume_and_stop_unbounded_loop():
+    player, backend = make_player([{"type": "click", "position": {"x": 10, "y": 20}}], loop_iterations=0, step_delay=20)
+    player.play()
+    assert wait_for(lambda: len(clicks(backend)) >= 3)
+
+    player.pause()
+    assert player.get_status() == PlaybackStatus.PAUSED
+    time.sleep(0.1)
+    paused = len(clicks(backend))
+    time.sleep(0.2)
+    assert len(clicks(backend)) == paused
+
+    player.resume()
+    assert wait_for(lambda: len(clicks(backend)) > paused)
+
+    player.stop()
+    assert player.wait(5) == PlaybackStatus.STOPPED
+    stopped = len(clicks(backend))
+    time.sleep(0.1)
+    assert len(clicks(backend)) == stopped
+    player.close()
+
+
+def test_lookahead_resolves_next_step_during_delay():
+    steps = [
+        {"type": "click", "position": {"x": 10, "y": 20}},
+        {"type": "click", "mode": "smart", "screenshot": "button", "position": {"x": 400, "y": 250}},
+    ]
+    player, backend = make_player(
+        steps, templates={"button": button_template()}, lookahead=True, trace=True, step_delay=50
+    )
+    player.play()
+    assert player.wait(10) == PlaybackStatus.COMPLETED
+    player.close()
+
+    assert clicks(backend) == [(10, 20), BUTTON]
+    spans = player.tracer.spans()
+    assert [span.args["step_id"] for span in spans if span.name == "lookahead"] == ["s1"]
+    # 第 1 步采用预解析结果，执行时不再定位
+    assert sum(span.name == "locate" for span in spans) == 1
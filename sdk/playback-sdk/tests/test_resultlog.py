@@ -0,0 +1,66 @@
+"""步骤结果日志：环形缓冲与按批落盘"""
+
+import json
+
+from playback.models import Position, StepResult, StepResultStatus
+from playback.resultlog import ResultLog
+
+
+def result(i: int) -> StepResult:
+    return StepResult(step_id=f"s{i}", actual_position=Position(i, i), duration=i)
+
+
+def read(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_capacity_bounds_memory():
+    log = ResultLog(capacity=3)
+    for i in range(10):
+        log.append(result(i))
+    assert len(log) == 3
+    assert [r.step_id for r in log] == ["s7", "s8", "s9"]
+    assert log.total == 10
+
+
+def test_unbounded_without_capacity():
+    log = ResultLog()
+    for i in range(10):
+        log.append(result(i))
+    assert len(log) == 10
+
+
+def test_spill_writes_in_batches(tmp_path):
+    path = tmp_path / "logs" / "results.jsonl"
+    log = ResultLog(capacity=2, spill_path=str(path), spill_batch=4)
+    for i in range(6):
+        log.append(result(i), iteration=1)
+
+    # 只写出了满一批的 4 条
+    records = read(path)
+    assert [r["step_id"] for r in records] == ["s0", "s1", "s2", "s3"]
+    assert records[0]["iteration"] == 1
+    assert records[0]["status"] == StepResultStatus.SUCCESS.value
+    assert records[3]["position"] == [3, 3]
+
+    log.flush()
+    assert [r["step_id"] for r in read(path)] == [f"s{i}" for i in range(6)]
+
+
+def test_clear_flushes_pending(tmp_path):
+    path = tmp_path / "results.jsonl"
+    log = ResultLog(spill_path=str(path), spill_batch=100)
+    log.append(result(0))
+    assert not path.exists()
+    log.clear()
+    assert len(log) == 0 and log.total == 0
+    assert [r["step_id"] for r in read(path)] == ["s0"]
+
+
+def test_spill_failure_drops_pending(tmp_path, capsys):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    log = ResultLog(spill_path=str(blocker / "results.jsonl"), spill_batch=1)
+    log.append(result(0))
+    assert "Error spilling step results" in capsys.readouterr().out
+    assert log._pending == []
@@ -0,0 +1,42 @@
+"""重试策略：指数退避、上限与抖动"""
+
+import random
+
+import pytest
+
+from playback.models import PlayerConfig
+from playback.retry import RetryPolicy
+
+
+def policy(**overrides) -> RetryPolicy:
+    return RetryPolicy(PlayerConfig(**overrides), random.Random(0))
+
+
+def test_attempts_include_first_try():
+    assert policy(retry_count=3).attempts == 4
+    assert policy(retry_count=0).attempts == 1
+    assert policy(retry_count=-1).attempts == 1
+
+
+def test_base_delay_backs_off_exponentially_up_to_cap():
+    p = policy(retry_delay=100, retry_backoff=2.0, retry_max_delay=500)
+    assert [p.base_delay(i) for i in range(5)] == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+
+def test_delay_jitter_stays_within_ratio():
+    p = policy(retry_delay=100, retry_backoff=1.0, retry_jitter=0.2)
+    delays = [p.delay(0) for _ in range(200)]
+    assert all(0.08 <= d <= 0.12 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy(retry_delay=100, retry_jitter=0.0).delay(0) == pytest.approx(0.1)
+
+
+def test_max_total_delay_bounds_all_waits():
+    p = policy(retry_count=3, retry_delay=100, retry_backoff=2.0, retry_max_delay=5000, retry_jitter=0.2)
+    assert p.max_total_delay() == pytest.approx((0.1 + 0.2 + 0.4) * 1.2)
+    assert sum(p.delay(i) for i in range(p.attempts - 1)) <= p.max_total_delay()
+
+
+def test_expand_grows_search_region():
+    p = policy(search_region_expand=100, retry_expand_factor=1.5)
+    assert [p.expand(i) for i in range(3)] == [100, 150, 225]
@@ -0,0 +1,96 @@
+"""回放调度：fixed / faithful / scaled 模式的步骤间隔"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from playback.control import PlaybackControl
+from playback.models import PlayerConfig
+from playback.scheduler import ReplayScheduler
+
+
+def steps(*timestamps):
+    return [SimpleNamespace(timestamp=ts) for ts in timestamps]
+
+
+def run_waits(scheduler: ReplayScheduler, count: int) -> list[float]:
+    """从第 0 步开始依次等待到后续各步的计划时间，返回各步相对起点的时刻(s)"""
+
+    async def run():
+        scheduler.mark_start()
+        start = time.perf_counter()
+        times = []
+        for i in range(1, count):
+            await scheduler.wait_next(i)
+            times.append(time.perf_counter() - start)
+        return times
+
+    return asyncio.run(run())
+
+
+def test_fixed_mode_waits_step_delay():
+    scheduler = ReplayScheduler(PlayerConfig(step_delay=50))
+    scheduler.reset(steps(0, 0))
+    waited = asyncio.run(scheduler.wait_next(1))
+    assert 0.045 <= waited < 0.5
+    # 已通过画面稳定检测完成等待时不再固定等待
+    assert asyncio.run(scheduler.wait_next(1, adaptive=True)) == 0.0
+
+
+def test_faithful_mode_restores_recorded_gaps():
+    scheduler = ReplayScheduler(PlayerConfig(timing_mode="faithful", drift_tolerance=500))
+    scheduler.reset(steps(1000, 1100, 1250))
+    times = run_waits(scheduler, 3)
+    assert times[0] == pytest.approx(0.1, abs=0.03)
+    assert times[1] == pytest.approx(0.25, abs=0.03)
+
+
+def test_faithful_mode_falls_back_to_step_delay_without_timestamps():
+    scheduler = ReplayScheduler(PlayerConfig(timing_mode="faithful", step_delay=40, drift_tolerance=500))
+    # 时间戳缺失或倒退的步骤按 step_delay 计算间隔
+    scheduler.reset(steps(1000, 0, 900, 1100))
+    times = run_waits(scheduler, 4)
+    assert times == pytest.approx([0.04, 0.08, 0.18], abs=0.03)
+
+
+def test_scaled_mode_divides_gaps_and_keeps_min_gap():
+    config = PlayerConfig(timing_mode="scaled", speed=4.0, min_step_gap=30, drift_tolerance=500)
+    scheduler = ReplayScheduler(config)
+    scheduler.reset(steps(1, 401, 411))
+    times = run_waits(scheduler, 3)
+    assert times[0] == pytest.approx(0.1, abs=0.03)
+    assert times[1] == pytest.approx(0.13, abs=0.03)
+
+
+def test_scaled_mode_clamps_speed():
+    scheduler = ReplayScheduler(PlayerConfig(timing_mode="scaled", speed=1000.0, min_step_gap=1, drift_tolerance=500))
+    scheduler.reset(steps(1, 2001))
+    # 速度上限 20 倍：2s 的间隔至少 0.1s
+    assert run_waits(scheduler, 2)[0] == pytest.approx(0.1, abs=0.03)
+
+
+def test_falling_behind_shifts_plan_instead_of_rushing():
+    scheduler = ReplayScheduler(PlayerConfig(timing_mode="faithful", drift_tolerance=20))
+    scheduler.reset(steps(1, 51, 151))
+
+    async def run():
+        scheduler.mark_start()
+        await asyncio.sleep(0.15)  # 第 1 步执行过慢
+        assert await scheduler.wait_next(1) == 0.0
+        start = time.perf_counter()
+        await scheduler.wait_next(2)
+        return time.perf_counter() - start
+
+    # 顺延后保留第 1、2 步之间 100ms 的录制间隔
+    assert asyncio.run(run()) == pytest.approx(0.1, abs=0.03)
+
+
+def test_stop_interrupts_wait():
+    control = PlaybackControl()
+    scheduler = ReplayScheduler(PlayerConfig(timing_mode="faithful"), control)
+    scheduler.reset(steps(1, 5001))
+    threading.Timer(0.05, control.stop).start()
+    assert run_waits(scheduler, 2)[0] < 1.0
@@ -9,6 +9,7 @@ from typing import Optional
 from PIL import Image
 
 from .models import WindowInfo, Region
+from .framehash import FRAME_HASH_SIZE, frame_hash
 
 
 class ScreenCapture:
@@ -31,6 +32,10 @@ class ScreenCapture:
         """获取窗口列表"""
         return self._capturer.list_windows()
 
+    def window_rect(self, window_id: str) -> Optional[Region]:
+        """获取指定窗口的当前矩形（不生成缩略图，供回放时低开销地校验窗口位置）"""
+        return self._capturer.window_rect(window_id)
+
     def capture_window(self, window_id: str) -> Optional[Image.Image]:
         """捕获指定窗口"""
         return self._capturer.capture_window(window_id)
@@ -122,6 +127,28 @@ class MacOSCapture:
 
         return windows
 
+    def window_rect(self, window_id: str) -> Optional[Region]:
+        """获取指定窗口的当前矩形，窗口不存在时返回 None"""
+        if not self._available:
+            return None
+
+        try:
+            from Quartz import CGWindowListCopyWindowInfo, kCGWindowListOptionIncludingWindow
+
+            window_list = CGWindowListCopyWindowInfo(kCGWindowListOptionIncludingWindow, int(window_id))
+            if not window_list:
+                return None
+            bounds = window_list[0].get("kCGWindowBounds", {})
+            return Region(
+                x=int(bounds.get("X", 0)),
+                y=int(bounds.get("Y", 0)),
+                width=int(bounds.get("Width", 0)),
+                height=int(bounds.get("Height", 0))
+            )
+        except Exception as e:
+            print(f"Error getting window rect: {e}")
+            return None
+
     def _get_window_thumbnail(self, window_id: int, max_size: int = 200) -> Optional[bytes]:
 
         """获取窗口缩略图"""
@@ -297,13 +324,42 @@ class WindowsCapture:
                             y=rect[1],
                             width=rect[2] - rect[0],
                             height=rect[3] - rect[1]
-                        )
+                        ),
+                        scale=self._window_scale(hwnd)
                     ))
             return True
 
         win32gui.EnumWindows(enum_callback, None)
         return windows
 
+    def window_rect(self, window_id: str) -> Optional[Region]:
+        """获取指定窗口的当前矩形，窗口不存在时返回 None"""
+        if not self._available or window_id.startswith("monitor_"):
+            return None
+
+        try:
+            import win32gui
+
+            hwnd = int(window_id)
+            if not win32gui.IsWindow(hwnd):
+                return None
+            rect = win32gui.GetWindowRect(hwnd)
+            return Region(x=rect[0], y=rect[1], width=rect[2] - rect[0], height=rect[3] - rect[1])
+        except Exception as e:
+            print(f"Error getting window rect: {e}")
+            return None
+
+    @staticmethod
+    def _window_scale(hwnd: int) -> float:
+        """窗口所在显示器的 DPI 缩放比例（Windows 10 1607+）"""
+        try:
+            import ctypes
+
+            dpi = ctypes.windll.user32.GetDpiForWindow(hwnd)
+            return dpi / 96 if dpi else 1.0
+        except Exception:
+            return 1.0
+
     def _list_windows_fallback(self) -> list[WindowInfo]:
         """使用mss的fallback实现"""
         import mss
@@ -0,0 +1,24 @@
+"""
+帧哈希模块
+录制时标记每一步窗口画面的差异哈希，只依赖 PIL 与 numpy，回放 SDK 测试可单独加载校验
+"""
+
+import numpy as np
+from PIL import Image
+
+
+# 帧哈希边长（64 位），须与回放端 playback.fingerprint.HASH_SIZE 相同
+FRAME_HASH_SIZE = 8
+
+
+def frame_hash(image: Image.Image, size: int = FRAME_HASH_SIZE) -> str:
+    """
+    画面差异哈希 (dHash)，返回十六进制字符串
+
+    缩小为 (size+1)×size 灰度图后逐行比较相邻像素亮度，
+    与回放端 playback.fingerprint.dhash 逐位一致（由回放 SDK 测试校验）
+    """
+    small = np.asarray(image.convert("L").resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, :-1] > small[:, 1:]).ravel()
+    value = int.from_bytes(np.packbits(bits).tobytes(), "big") >> (-bits.size % 8)
+    return f"{value:0{size * size // 4}x}"
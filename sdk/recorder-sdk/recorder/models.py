@@ -58,6 +58,7 @@ class WindowInfo:
     process_name: str
     rect: Region
     thumbnail: Optional[bytes] = None
+    scale: float = 1.0  # DPI 缩放比例（物理像素 / 逻辑像素）
 
 
 @dataclass
@@ -67,6 +68,8 @@ class RecorderConfig:
     capture_fps: int = 10  # 屏幕捕获帧率
     enable_ocr: bool = True  # 是否启用OCR
     ocr_lang: str = "ch"  # OCR语言
+    frame_dir: Optional[str] = None  # 每步保存完整窗口帧的目录（供离线回放评估），为空则不保存
+    frame_hash: bool = False  # 记录每步窗口画面的感知哈希（回放失败后据此重新同步进度）；每个事件都在监听线程上截取整个窗口，会增加输入延迟
 
 
 @dataclass
@@ -106,6 +109,7 @@ class Step:
     screenshot: Optional[str] = None
     timestamp: int = 0
     description: str = ""
+    frame_hash: Optional[str] = None  # 步骤发生时窗口画面的 dHash（16 位十六进制）
 
     # 特定类型字段
     button: str = "left"  # 点击按钮类型
@@ -114,6 +118,7 @@ class Step:
     from_position: Optional[Position] = None  # 拖拽起点
     to_position: Optional[Position] = None  # 拖拽终点
     input_text: Optional[str] = None  # 输入文字
+    input_mode: Optional[str] = None  # 输入方式: char, batch, paste，为空使用播放器配置
     key: Optional[str] = None  # 按键
     file_path: Optional[str] = None  # 文件路径
 
@@ -131,7 +136,8 @@ class TargetWindow:
     """目标窗口"""
     title: str
     process_name: str
-    rect: Region
+    rect: Region  # 录制时的窗口矩形，回放时据此换算窗口偏移
+    scale: float = 1.0  # 录制时的 DPI 缩放比例
 
 
 @dataclass
@@ -159,7 +165,8 @@ class Recording:
                     "y": self.target_window.rect.y,
                     "width": self.target_window.rect.width,
                     "height": self.target_window.rect.height,
-                }
+                },
+                "scale": self.target_window.scale,
             } if self.target_window else None,
             "steps": [self._step_to_dict(step) for step in self.steps]
         }
@@ -193,6 +200,10 @@ class Recording:
             result["to"] = {"x": step.to_position.x, "y": step.to_position.y}
         if step.input_text:
             result["text"] = step.input_text
+        if step.input_mode:
+            result["input_mode"] = step.input_mode
+        if step.frame_hash:
+            result["frame_hash"] = step.frame_hash
         if step.key:
             result["key"] = step.key
         if step.file_path:
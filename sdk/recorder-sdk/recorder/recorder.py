@@ -9,6 +9,8 @@ import uuid
 from typing import Optional, Callable
 from pathlib import Path
 
+from PIL import Image
+
 from .models import (
     Recording,
     Step,
@@ -20,7 +22,7 @@ from .models import (
     RecorderConfig,
     WindowInfo,
 )
-from .capture import ScreenCapture
+from .capture import ScreenCapture, frame_hash
 from .listener import EventListener
 
 
@@ -47,6 +49,10 @@ class Recorder:
         # 截图存储回调
         self._save_screenshot_callback: Optional[Callable[[bytes, str], str]] = None
 
+        # 帧序列索引（frame_dir 启用时）
+        self._frames: list[dict] = []
+        self._templates: dict[str, str] = {}
+
     def set_ocr_adapter(self, adapter) -> None:
         """设置OCR适配器"""
         self._ocr_adapter = adapter
@@ -83,6 +89,8 @@ class Recorder:
         self._target_window = target
         self._is_recording = True
         self._step_index = 0
+        self._frames = []
+        self._templates = {}
 
         # 创建录制记录
         self._recording = Recording(
@@ -92,7 +100,8 @@ class Recorder:
             target_window=TargetWindow(
                 title=target.title,
                 process_name=target.process_name,
-                rect=target.rect
+                rect=target.rect,
+                scale=target.scale
             ),
             steps=[]
         )
@@ -107,6 +116,7 @@ class Recorder:
 
         self._is_recording = False
         self._listener.stop()
+        self._write_frame_manifest()
 
         recording = self._recording
         self._recording = None
@@ -131,10 +141,15 @@ class Recorder:
         if self._on_event_callback:
             self._on_event_callback(event)
 
+        # 先截取窗口画面：步骤转换中的截图与 OCR 较慢，之后画面可能已是动作之后的状态
+        frame = self._grab_frame()
+
         # 将事件转换为步骤
         step = self._event_to_step(event)
         if step:
             self._recording.steps.append(step)
+            if frame is not None:
+                self._save_frame(step, frame)
 
             # 触发步骤回调
             if self._on_step_callback:
@@ -224,6 +239,7 @@ class Recorder:
                     screenshot_bytes,
                     f"{step.id}.png"
                 )
+            self._save_template(step, screenshot_bytes)
 
             # OCR识别
             if self.config.enable_ocr and self._ocr_adapter:
@@ -236,6 +252,61 @@ class Recorder:
                 except Exception as e:
                     print(f"OCR error: {e}")
 
+    def _grab_frame(self) -> Optional[Image.Image]:
+        """截取事件发生时的目标窗口画面（未启用帧哈希与帧保存时不截取）"""
+        if not (self.config.frame_dir or self.config.frame_hash) or not self._target_window:
+            return None
+        return self._capture.capture_window(self._target_window.window_id)
+
+    def _save_frame(self, step: Step, image: Image.Image) -> None:
+        """记录步骤发生时窗口画面的哈希，并按需保存完整窗口帧"""
+        if self.config.frame_hash:
+            step.frame_hash = frame_hash(image)
+
+        if not self.config.frame_dir:
+            return
+
+        try:
+            path = Path(self.config.frame_dir)
+            path.mkdir(parents=True, exist_ok=True)
+            filename = f"{step.id}.png"
+            image.save(path / filename, format="PNG")
+            self._frames.append({
+                "file": filename,
+                "step_id": step.id,
+                "timestamp": step.timestamp,
+            })
+        except Exception as e:
+            print(f"Error saving frame: {e}")
+
+    def _save_template(self, step: Step, screenshot_bytes: bytes) -> None:
+        """将点击区域截图随帧序列保存，离线回放时作为模板"""
+        if not self.config.frame_dir or not step.screenshot:
+            return
+
+        try:
+            path = Path(self.config.frame_dir) / "templates"
+            path.mkdir(parents=True, exist_ok=True)
+            filename = f"templates/{step.id}.png"
+            (path / f"{step.id}.png").write_bytes(screenshot_bytes)
+            self._templates[step.screenshot] = filename
+        except Exception as e:
+            print(f"Error saving template: {e}")
+
+    def _write_frame_manifest(self) -> None:
+        """写入帧序列索引 manifest.json"""
+        if not self.config.frame_dir or not self._frames:
+            return
+
+        path = Path(self.config.frame_dir) / "manifest.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"frames": self._frames, "templates": self._templates},
+                f,
+                ensure_ascii=False,
+                indent=2
+            )
+
     def save_to_file(self, recording: Recording, filepath: str) -> None:
         """保存录制到文件"""
         path = Path(filepath)
@@ -257,7 +328,8 @@ class Recorder:
             target_window = TargetWindow(
                 title=tw["title"],
                 process_name=tw["process_name"],
-                rect=Region(**tw["rect"])
+                rect=Region(**tw["rect"]),
+                scale=tw.get("scale", 1.0)
             )
 
         steps = []
@@ -287,6 +359,10 @@ class Recorder:
                 step.from_position = Position(**step_data["from"])
             if "to" in step_data:
                 step.to_position = Position(**step_data["to"])
+            if "input_mode" in step_data:
+                step.input_mode = step_data["input_mode"]
+            if "frame_hash" in step_data:
+                step.frame_hash = step_data["frame_hash"]
             if "key" in step_data:
                 step.key = step_data["key"]
             if "file_path" in step_data:
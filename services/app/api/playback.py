@@ -2,11 +2,14 @@
 回放控制API
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
-from ..services.playback_service import PlaybackService, PlaybackStatus, StepLog
+from ..services.playback_service import PlaybackService, PlaybackStatus, StepLog, IterationLog
+from ..services.fleet_service import FleetService
 
 router = APIRouter()
 
@@ -15,6 +18,8 @@ class StartPlaybackRequest(BaseModel):
     """开始执行请求"""
     recording_id: str
     start_index: int = 0
+    iterations: int = 1  # 循环执行轮数，0 表示不限
+    loop_duration: int = 0  # 循环执行总时长上限(s)，0 表示不限
 
 
 class PlaybackStatusResponse(BaseModel):
@@ -25,6 +30,9 @@ class PlaybackStatusResponse(BaseModel):
     total_steps: int = 0
     duration: int = 0
     error: Optional[str] = None
+    iteration: int = 0
+    iterations: int = 1
+    readiness: dict[str, int] = {}
 
 
 class StepLogResponse(BaseModel):
@@ -34,15 +42,74 @@ class StepLogResponse(BaseModel):
     message: str
     duration: int
     timestamp: int
+    settle_time: int = 0
+    verify_time: int = 0
+    phases: dict[str, float] = {}
+
+
+class IterationResponse(BaseModel):
+    """循环执行单轮汇总响应"""
+    iteration: int
+    started_at: int
+    duration: int
+    steps: int
+    succeeded: int
+    failed: int
+    skipped: int
+    retries: int
+    resyncs: int
+    completed: bool
+
+
+class StartFleetRequest(BaseModel):
+    """多实例执行请求"""
+    recording_id: str
+    instances: int = 1
+    iterations: int = 1  # 每个实例的循环执行轮数，0 表示不限
+    loop_duration: int = 0  # 循环执行总时长上限(s)，0 表示不限
+    displays: Optional[list[str]] = None  # 各实例使用的 X 显示，为空则各自启动 Xvfb
+    launch: Optional[list[str]] = None  # 在每个显示上启动的游戏客户端命令
+
+
+class InstanceStatusResponse(BaseModel):
+    """单个实例状态响应"""
+    name: str
+    status: str
+    pid: Optional[int] = None
+    display: Optional[str] = None
+    current_step: int = 0
+    total_steps: int = 0
+    iteration: int = 0
+    steps: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    steps_per_sec: float = 0.0
+    error: Optional[str] = None
+
+
+class FleetStatusResponse(BaseModel):
+    """多实例执行汇总响应"""
+    recording_id: Optional[str] = None
+    instances: list[InstanceStatusResponse] = []
+    running: int = 0
+    steps: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    steps_per_sec: float = 0.0
 
 
 @router.post("/start", response_model=PlaybackStatusResponse)
 async def start_playback(request: StartPlaybackRequest):
     """开始执行"""
     try:
-        state = PlaybackService.start(
+        # 开始前会释放上一次执行的播放器，同样放到线程中
+        state = await asyncio.to_thread(
+            PlaybackService.start,
             recording_id=request.recording_id,
-            start_index=request.start_index
+            start_index=request.start_index,
+            iterations=request.iterations,
+            loop_duration=request.loop_duration
         )
         return PlaybackStatusResponse(
             status=state.status.value,
@@ -50,7 +117,10 @@ async def start_playback(request: StartPlaybackRequest):
             current_step=state.current_step,
             total_steps=state.total_steps,
             duration=state.duration,
-            error=state.error
+            error=state.error,
+            iteration=state.iteration,
+            iterations=state.iterations,
+            readiness=state.readiness
         )
     except (RuntimeError, ValueError) as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -66,7 +136,10 @@ async def pause_playback():
         current_step=state.current_step,
         total_steps=state.total_steps,
         duration=state.duration,
-        error=state.error
+        error=state.error,
+        iteration=state.iteration,
+        iterations=state.iterations,
+        readiness=state.readiness
     )
 
 
@@ -80,21 +153,48 @@ async def resume_playback():
         current_step=state.current_step,
         total_steps=state.total_steps,
         duration=state.duration,
-        error=state.error
+        error=state.error,
+        iteration=state.iteration,
+        iterations=state.iterations,
+        readiness=state.readiness
+    )
+
+
+@router.post("/resync", response_model=PlaybackStatusResponse)
+async def resync_playback():
+    """按当前画面重新同步进度并继续执行（仅在执行出错后可用）"""
+    try:
+        state = PlaybackService.resync()
+    except (RuntimeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PlaybackStatusResponse(
+        status=state.status.value,
+        recording_id=state.recording_id,
+        current_step=state.current_step,
+        total_steps=state.total_steps,
+        duration=state.duration,
+        error=state.error,
+        iteration=state.iteration,
+        iterations=state.iterations,
+        readiness=state.readiness
     )
 
 
 @router.post("/stop", response_model=PlaybackStatusResponse)
 async def stop_playback():
     """停止执行"""
-    state = PlaybackService.stop()
+    # 释放播放器会等待执行循环结束，放到线程中避免阻塞事件循环
+    state = await asyncio.to_thread(PlaybackService.stop)
     return PlaybackStatusResponse(
         status=state.status.value,
         recording_id=state.recording_id,
         current_step=state.current_step,
         total_steps=state.total_steps,
         duration=state.duration,
-        error=state.error
+        error=state.error,
+        iteration=state.iteration,
+        iterations=state.iterations,
+        readiness=state.readiness
     )
 
 
@@ -108,7 +208,10 @@ async def get_playback_status():
         current_step=state.current_step,
         total_steps=state.total_steps,
         duration=state.duration,
-        error=state.error
+        error=state.error,
+        iteration=state.iteration,
+        iterations=state.iterations,
+        readiness=state.readiness
     )
 
 
@@ -122,7 +225,53 @@ async def get_playback_logs():
             status=log.status,
             message=log.message,
             duration=log.duration,
-            timestamp=log.timestamp
+            timestamp=log.timestamp,
+            settle_time=log.settle_time,
+            verify_time=log.verify_time,
+            phases=log.phases
         )
         for log in logs
     ]
+
+
+@router.get("/iterations", response_model=list[IterationResponse])
+async def get_playback_iterations():
+    """获取循环执行各轮汇总"""
+    return [IterationResponse(**vars(log)) for log in PlaybackService.get_iterations()]
+
+
+@router.get("/trace")
+async def get_playback_trace():
+    """获取执行跨度（Chrome trace-event JSON，需启用 PLAYBACK_TRACE）"""
+    return PlaybackService.get_trace()
+
+
+@router.post("/fleet/start", response_model=FleetStatusResponse)
+async def start_fleet(request: StartFleetRequest):
+    """在多个 X 显示上并行执行同一录制"""
+    if request.instances < 1:
+        raise HTTPException(status_code=400, detail="instances must be at least 1")
+    try:
+        status = FleetService.start(
+            recording_id=request.recording_id,
+            instances=request.instances,
+            iterations=request.iterations,
+            loop_duration=request.loop_duration,
+            displays=request.displays,
+            launch=request.launch
+        )
+    except (RuntimeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FleetStatusResponse(**status)
+
+
+@router.post("/fleet/stop", response_model=FleetStatusResponse)
+async def stop_fleet():
+    """停止多实例执行"""
+    return FleetStatusResponse(**FleetService.stop())
+
+
+@router.get("/fleet/status", response_model=FleetStatusResponse)
+async def get_fleet_status():
+    """获取各实例状态与汇总吞吐"""
+    return FleetStatusResponse(**FleetService.get_status())
@@ -3,6 +3,7 @@
 """
 
 from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
 from typing import Optional
 
 from ..models.recording import (
@@ -18,6 +19,33 @@ from ..services.recording_service import RecordingService
 router = APIRouter()
 
 
+class OptimizeRequest(BaseModel):
+    """优化录制请求"""
+    apply: bool = False  # 保存优化结果，否则只预览
+    downgrade_stable: bool = False  # 目标从未移动的智能步骤改为固定坐标
+
+
+class OptimizeChangeResponse(BaseModel):
+    """一项改写"""
+    rule: str
+    step_ids: list[str]
+    saved_ms: int
+    message: str = ""
+
+
+class OptimizeResponse(BaseModel):
+    """优化录制响应（耗时为按默认回放配置的估计值）"""
+    recording: Recording
+    applied: bool
+    original_steps: int
+    optimized_steps: int
+    original_ms: int
+    optimized_ms: int
+    saved_ms: int
+    changes: list[OptimizeChangeResponse]
+    stable_steps: list[str]
+
+
 @router.get("", response_model=list[Recording])
 async def list_recordings(project_id: Optional[str] = None):
     """获取录制列表"""
@@ -108,3 +136,17 @@ async def reorder_steps(recording_id: str, step_ids: list[str]):
     if steps is None:
         raise HTTPException(status_code=404, detail="Recording not found")
     return steps
+
+
+@router.post("/{recording_id}/optimize", response_model=OptimizeResponse)
+async def optimize_recording(recording_id: str, request: OptimizeRequest = OptimizeRequest()):
+    """优化录制（合并输入、滚动与等待，去除无效步骤与重复点击），返回估计节省的耗时"""
+    try:
+        result = RecordingService.optimize(recording_id, request.apply, request.downgrade_stable)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Recording not found")
+
+    recording, report = result
+    return OptimizeResponse(recording=recording, applied=request.apply, **report)
@@ -36,6 +36,23 @@ class Settings(BaseSettings):
     # 数据库配置
     SQLITE_DB_PATH: str = "data/app.db"
 
+    # 录制配置
+    RECORDER_FRAME_HASH: bool = False  # 记录每步窗口画面哈希（回放失败后自动重新同步需要），每个事件额外截取整个窗口
+
+    # 回放配置
+    PLAYBACK_HINT_DB_PATH: str = "data/hints.db"  # 步骤定位提示库
+    PLAYBACK_TRACE: bool = False  # 记录步骤分阶段耗时（/playback/trace 导出）
+    PLAYBACK_LOG_CAPACITY: int = 10000  # 内存中保留的最近步骤日志条数
+    PLAYBACK_LOG_DIR: Optional[str] = None  # 步骤结果 JSON Lines 落盘目录（按录制 ID 分文件），为空则不落盘
+    PLAYBACK_ASSET_CACHE_DIR: Optional[str] = "data/assets"  # 模板截图本地缓存目录，为空则执行时不预取
+    PLAYBACK_ASSET_CACHE_MB: int = 512  # 模板截图本地缓存容量(MB)
+    PLAYBACK_ASSET_WORKERS: int = 8  # 模板截图并发下载数
+    PLAYBACK_FLEET_SCREEN_WIDTH: int = 1280  # 多实例执行时 Xvfb 屏幕宽度(px)
+    PLAYBACK_FLEET_SCREEN_HEIGHT: int = 720  # 多实例执行时 Xvfb 屏幕高度(px)
+    PLAYBACK_FLEET_FIRST_DISPLAY: int = 100  # 自动分配的首个 X 显示编号
+    PLAYBACK_OCR_FACTORY: Optional[str] = None  # 共享 OCR 池的适配器工厂（"模块:属性"），为空则不启用 OCR
+    PLAYBACK_OCR_WORKERS: int = 1  # 共享 OCR 池工作进程数
+
     # AI配置
     AI_PROVIDER: str = "openai"
     AI_MODEL: str = "gpt-4o"
@@ -3,6 +3,7 @@ MinIO客户端
 """
 
 import io
+import threading
 from typing import Optional
 from minio import Minio
 from minio.error import S3Error
@@ -15,26 +16,29 @@ class MinIOClient:
 
     def __init__(self):
         self._client: Optional[Minio] = None
+        self._lock = threading.Lock()
 
     def _get_client(self) -> Minio:
-        """获取MinIO客户端"""
+        """获取MinIO客户端（线程安全，各线程共用同一连接池）"""
         if self._client is None:
-            self._client = Minio(
-                endpoint=settings.MINIO_ENDPOINT,
-                access_key=settings.MINIO_ACCESS_KEY,
-                secret_key=settings.MINIO_SECRET_KEY,
-                secure=settings.MINIO_SECURE
-            )
-            # 确保bucket存在
-            self._ensure_bucket()
+            with self._lock:
+                if self._client is None:
+                    client = Minio(
+                        endpoint=settings.MINIO_ENDPOINT,
+                        access_key=settings.MINIO_ACCESS_KEY,
+                        secret_key=settings.MINIO_SECRET_KEY,
+                        secure=settings.MINIO_SECURE
+                    )
+                    self._ensure_bucket(client)
+                    self._client = client
 
         return self._client
 
-    def _ensure_bucket(self):
+    def _ensure_bucket(self, client: Minio):
         """确保bucket存在"""
         try:
-            if not self._client.bucket_exists(settings.MINIO_BUCKET):
-                self._client.make_bucket(settings.MINIO_BUCKET)
+            if not client.bucket_exists(settings.MINIO_BUCKET):
+                client.make_bucket(settings.MINIO_BUCKET)
         except S3Error as e:
             print(f"MinIO bucket error: {e}")
 
@@ -68,12 +72,13 @@ class MinIOClient:
 
         return f"minio://{settings.MINIO_BUCKET}/{object_name}"
 
-    def download_file(self, object_name: str) -> Optional[bytes]:
+    def download_file(self, object_name: str, bucket_name: Optional[str] = None) -> Optional[bytes]:
         """
         下载文件
 
         Args:
             object_name: 对象名称（路径）
+            bucket_name: bucket，默认为配置的 MINIO_BUCKET
 
         Returns:
             文件数据
@@ -82,7 +87,7 @@ class MinIOClient:
         
         try:
             response = client.get_object(
-                bucket_name=settings.MINIO_BUCKET,
+                bucket_name=bucket_name or settings.MINIO_BUCKET,
                 object_name=object_name
             )
             return response.read()
@@ -94,6 +99,13 @@ class MinIOClient:
                 response.close()
                 response.release_conn()
 
+    def download_url(self, url: str) -> Optional[bytes]:
+        """按 upload_file 返回的 minio://{bucket}/{object} 地址下载"""
+        if not url.startswith("minio://"):
+            return None
+        bucket_name, _, object_name = url[len("minio://"):].partition("/")
+        return self.download_file(object_name, bucket_name)
+
     def delete_file(self, object_name: str) -> bool:
         """
         删除文件
@@ -172,3 +184,8 @@ class MinIOClient:
 
 
 minio_client = MinIOClient()
+
+
+def asset_fetcher():
+    """模板下载函数工厂（多实例回放进程中按 minio:// 地址下载模板）"""
+    return minio_client.download_url
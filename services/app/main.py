@@ -7,6 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
 from .core.database import init_db
 from .api import api_router
+from .services import FleetService
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -31,6 +32,12 @@ init_db()
 app.include_router(api_router, prefix=settings.API_PREFIX)
 
 
+@app.on_event("shutdown")
+def shutdown():
+    """停止多实例执行，释放实例进程与 Xvfb 显示"""
+    FleetService.close()
+
+
 @app.get("/")
 async def root():
     """根路由"""
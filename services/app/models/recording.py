@@ -14,7 +14,8 @@ class TargetWindow(BaseModel):
     """目标窗口"""
     title: str
     process_name: str
-    rect: Region
+    rect: Region  # 录制时的窗口矩形，回放时据此换算窗口偏移
+    scale: float = 1.0  # 录制时的 DPI 缩放比例
 
 
 class StepBase(BaseModel):
@@ -25,6 +26,7 @@ class StepBase(BaseModel):
     text: Optional[str] = None
     screenshot: Optional[str] = None
     description: str = ""
+    frame_hash: Optional[str] = None  # 录制时窗口画面的感知哈希，回放重新同步用
 
     # click
     button: str = "left"
@@ -39,6 +41,7 @@ class StepBase(BaseModel):
 
     # input
     input_text: Optional[str] = None
+    input_mode: Optional[Literal["char", "batch", "paste"]] = None
 
     # key
     key: Optional[str] = None
@@ -74,6 +77,7 @@ class StepUpdate(BaseModel):
     from_pos: Optional[Position] = Field(None, alias="from")
     to_pos: Optional[Position] = Field(None, alias="to")
     input_text: Optional[str] = None
+    input_mode: Optional[Literal["char", "batch", "paste"]] = None
     key: Optional[str] = None
     file_path: Optional[str] = None
     duration: Optional[int] = None
@@ -6,10 +6,12 @@ from .project_service import ProjectService
 from .recording_service import RecordingService
 from .recorder_service import RecorderService
 from .playback_service import PlaybackService
+from .fleet_service import FleetService
 
 __all__ = [
     "ProjectService",
     "RecordingService",
     "RecorderService",
     "PlaybackService",
+    "FleetService",
 ]
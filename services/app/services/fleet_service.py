@@ -0,0 +1,133 @@
+"""
+多实例回放服务
+同一录制在多个 X 显示上并行执行，每个实例一个进程，OCR 由共享进程池提供
+"""
+
+import os
+from typing import Optional
+
+# SDK imports
+try:
+    from playback import MultiRunner, InstanceSpec
+except ImportError:
+    MultiRunner = None
+    InstanceSpec = None
+
+from ..core.config import settings
+from .recording_service import RecordingService
+
+
+class FleetServiceSingleton:
+    """多实例回放服务单例"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._runner: Optional[MultiRunner] = None
+        self._recording_id: Optional[str] = None
+        self._initialized = True
+
+    def start(
+        self,
+        recording_id: str,
+        instances: int = 1,
+        iterations: int = 1,
+        loop_duration: int = 0,
+        displays: Optional[list[str]] = None,
+        launch: Optional[list[str]] = None,
+    ) -> dict:
+        """
+        启动多实例执行
+
+        displays 为空时每个实例启动自己的 Xvfb；launch 为在每个显示上启动的游戏客户端命令
+        """
+        if MultiRunner is None:
+            raise RuntimeError("Playback SDK not installed")
+        if self._runner is not None and self._runner.status().running:
+            raise RuntimeError("Already playing")
+        if displays and len(displays) < instances:
+            raise ValueError(f"Expected {instances} displays, got {len(displays)}")
+
+        recording = RecordingService.get_recording(recording_id)
+        if not recording:
+            raise ValueError(f"Recording {recording_id} not found")
+
+        self.close()
+
+        config = dict(
+            loop_iterations=iterations,
+            loop_duration=loop_duration,
+            log_capacity=settings.PLAYBACK_LOG_CAPACITY,
+            asset_cache_max_mb=settings.PLAYBACK_ASSET_CACHE_MB,
+            asset_prefetch_workers=settings.PLAYBACK_ASSET_WORKERS,
+        )
+        data = recording.model_dump()
+        specs = []
+        for i in range(instances):
+            name = f"instance-{i}"
+            specs.append(InstanceSpec(
+                name=name,
+                recording=data,
+                config={**config, **self._instance_paths(name)},
+                display=displays[i] if displays else None,
+                launch=launch,
+                asset_fetcher="app.core.minio_client:asset_fetcher",
+            ))
+
+        runner = MultiRunner(
+            specs,
+            ocr_factory=settings.PLAYBACK_OCR_FACTORY,
+            ocr_workers=settings.PLAYBACK_OCR_WORKERS,
+            screen=(settings.PLAYBACK_FLEET_SCREEN_WIDTH, settings.PLAYBACK_FLEET_SCREEN_HEIGHT),
+            first_display=settings.PLAYBACK_FLEET_FIRST_DISPLAY,
+        )
+        runner.start()
+        self._runner = runner
+        self._recording_id = recording_id
+        return self.get_status()
+
+    def stop(self) -> dict:
+        """停止所有实例"""
+        if self._runner is not None:
+            self._runner.stop()
+        return self.get_status()
+
+    def get_status(self) -> dict:
+        """各实例状态与汇总"""
+        if self._runner is None:
+            return {"recording_id": None, "instances": [], "running": 0}
+        return {"recording_id": self._recording_id, **self._runner.status().to_dict()}
+
+    def close(self):
+        """停止实例并释放进程与 Xvfb 显示"""
+        if self._runner is not None:
+            self._runner.close()
+            self._runner = None
+
+    def _instance_paths(self, name: str) -> dict:
+        """
+        实例独占的定位提示库与模板缓存目录
+
+        各实例是独立进程，共用 SQLite 文件会争抢写锁，共用缓存目录时
+        一个实例的淘汰会删除其他实例正在读取的模板
+        """
+        paths = {}
+        if settings.PLAYBACK_HINT_DB_PATH:
+            root, ext = os.path.splitext(settings.PLAYBACK_HINT_DB_PATH)
+            paths["hint_db_path"] = f"{root}-{name}{ext}"
+        if settings.PLAYBACK_ASSET_CACHE_DIR:
+            paths["asset_cache_dir"] = os.path.join(settings.PLAYBACK_ASSET_CACHE_DIR, "fleet", name)
+        return paths
+
+
+# 全局单例
+FleetService = FleetServiceSingleton()
@@ -2,7 +2,10 @@
 回放控制服务
 """
 
+import os
+import threading
 import time
+from collections import deque
 from typing import Optional
 from dataclasses import dataclass, field
 from enum import Enum
@@ -10,15 +13,24 @@ from enum import Enum
 # SDK imports
 try:
     from playback import Player, PlayerConfig, PlaybackStatus as SDKPlaybackStatus
+    from playback import AssetCache, AssetPrefetcher
 except ImportError:
     Player = None
     PlayerConfig = None
     SDKPlaybackStatus = None
 
+from ..core.config import settings
+from ..core.minio_client import minio_client
 from ..models.recording import Recording, Step
 from .recording_service import RecordingService
 
 print(Player)
+
+
+# 释放播放器前等待执行循环退出的最长时间(s)
+RELEASE_TIMEOUT = 10
+
+
 class PlaybackStatus(str, Enum):
     """回放状态"""
     IDLE = "idle"
@@ -37,6 +49,9 @@ class StepLog:
     message: str = ""
     duration: int = 0  # ms
     timestamp: int = 0
+    settle_time: int = 0  # 动作后等待画面稳定耗时(ms)
+    verify_time: int = 0  # 动作后校验画面变化耗时(ms)
+    phases: dict[str, float] = field(default_factory=dict)  # 各阶段耗时(ms)
 
 
 @dataclass
@@ -48,8 +63,26 @@ class PlaybackState:
     total_steps: int = 0
     start_time: Optional[int] = None
     duration: int = 0  # ms
-    logs: list[StepLog] = field(default_factory=list)
+    logs: deque[StepLog] = field(default_factory=deque)  # 最近 PLAYBACK_LOG_CAPACITY 条
     error: Optional[str] = None
+    iteration: int = 0  # 循环执行已完成的轮数
+    iterations: int = 1  # 循环执行总轮数，0 表示不限
+    readiness: dict[str, int] = field(default_factory=dict)  # 预热各项耗时(ms)，total 为总耗时
+
+
+@dataclass
+class IterationLog:
+    """循环执行单轮汇总"""
+    iteration: int
+    started_at: int
+    duration: int  # ms
+    steps: int
+    succeeded: int
+    failed: int
+    skipped: int
+    retries: int
+    resyncs: int
+    completed: bool
 
 
 class PlaybackServiceSingleton:
@@ -70,10 +103,19 @@ class PlaybackServiceSingleton:
         self._player: Optional[Player] = None
         self._state = PlaybackState()
         self._recording: Optional[Recording] = None
+        self._trace: dict = {"traceEvents": []}
+        self._iterations: deque[IterationLog] = deque(maxlen=1000)
+        self._assets = None  # 模板截图预取器（各次执行共用本地缓存）
         self._initialized = True
 
-    def start(self, recording_id: str, start_index: int = 0) -> PlaybackState:
-        """开始执行"""
+    def start(
+        self,
+        recording_id: str,
+        start_index: int = 0,
+        iterations: int = 1,
+        loop_duration: int = 0,
+    ) -> PlaybackState:
+        """开始执行（iterations 不为 1 时循环执行，0 表示不限轮数，直到 loop_duration 秒或停止）"""
         if self._state.status == PlaybackStatus.PLAYING:
             raise RuntimeError("Already playing")
 
@@ -89,34 +131,85 @@ class PlaybackServiceSingleton:
             current_step=start_index,
             total_steps=len(recording.steps),
             start_time=int(time.time() * 1000),
-            logs=[]
+            logs=deque(maxlen=settings.PLAYBACK_LOG_CAPACITY or None),
+            iterations=iterations
         )
+        self._iterations.clear()
+
+        # 释放上一次执行的播放器（线程池、事件循环线程与数据库连接）
+        self._release_player()
 
         # 启动播放器
         if Player is not None:
-            self._player = Player(PlayerConfig())
+            log_path = None
+            if settings.PLAYBACK_LOG_DIR:
+                log_path = os.path.join(settings.PLAYBACK_LOG_DIR, f"{recording_id}.jsonl")
+
+            player = self._player = Player(PlayerConfig(
+                hint_db_path=settings.PLAYBACK_HINT_DB_PATH,
+                trace=settings.PLAYBACK_TRACE,
+                loop_iterations=iterations,
+                loop_duration=loop_duration,
+                log_capacity=settings.PLAYBACK_LOG_CAPACITY,
+                log_spill_path=log_path
+            ))
 
             # 设置回调
             def on_step(step_dict, result):
-                self._state.current_step += 1
+                # 回调时播放器索引仍指向刚执行的步骤（循环执行时每轮从 0 开始）
+                self._state.current_step = player.get_current_step() + 1
                 self._state.logs.append(StepLog(
                     step_id=step_dict.get("id", ""),
                     status=result.status.value,
                     message=result.message,
                     duration=result.duration,
-                    timestamp=int(time.time() * 1000)
+                    timestamp=int(time.time() * 1000),
+                    settle_time=result.settle_time,
+                    verify_time=result.verify_time,
+                    phases=dict(result.phases)
                 ))
 
             def on_status_change(status):
                 self._state.status = PlaybackStatus(status.value)
                 if status.value == "error":
                     self._state.error = "Playback error"
+                elif status.value == "completed":
+                    # 回调在播放器的事件循环线程中执行，在其他线程等待执行结束后释放
+                    threading.Thread(
+                        target=self._release_player, args=(player,), name="playback-release", daemon=True
+                    ).start()
+
+            def on_iteration(stats):
+                self._state.iteration = stats.iteration + 1
+                self._iterations.append(IterationLog(
+                    iteration=stats.iteration,
+                    started_at=stats.started_at,
+                    duration=stats.duration,
+                    steps=stats.steps,
+                    succeeded=stats.succeeded,
+                    failed=stats.failed,
+                    skipped=stats.skipped,
+                    retries=stats.retries,
+                    resyncs=stats.resyncs,
+                    completed=stats.completed
+                ))
 
             self._player.on_step(on_step)
             self._player.on_status_change(on_status_change)
-
-            # 加载并执行
+            self._player.on_iteration(on_iteration)
+            self._player.set_asset_prefetcher(self._get_asset_prefetcher())
+
+            def on_prepared(future):
+                if future.cancelled() or future.exception():
+                    return
+                readiness = future.result()
+                self._state.readiness = {"total": readiness.total, **readiness.phases}
+                for name, error in readiness.errors.items():
+                    print(f"Playback warm-up {name} failed: {error}")
+
+            # 加载、预热（含模板批量下载）并执行（play 等待预热完成）
             self._player.load(recording.model_dump())
+            self._player.prepare().add_done_callback(on_prepared)
             self._player.play(start_index)
         else:
             # 模拟执行
@@ -124,6 +217,16 @@ class PlaybackServiceSingleton:
 
         return self._state
 
+    def _get_asset_prefetcher(self):
+        """获取模板截图预取器（从 MinIO 下载到本地内容寻址缓存）"""
+        if self._assets is None and settings.PLAYBACK_ASSET_CACHE_DIR:
+            self._assets = AssetPrefetcher(
+                AssetCache(settings.PLAYBACK_ASSET_CACHE_DIR, settings.PLAYBACK_ASSET_CACHE_MB * 2**20),
+                fetcher=minio_client.download_url,
+                workers=settings.PLAYBACK_ASSET_WORKERS
+            )
+        return self._assets
+
     def pause(self) -> PlaybackState:
         """暂停执行"""
         if self._state.status != PlaybackStatus.PLAYING:
@@ -146,16 +249,57 @@ class PlaybackServiceSingleton:
         self._state.status = PlaybackStatus.PLAYING
         return self._state
 
+    def resync(self) -> PlaybackState:
+        """
+        按当前画面找到录制中对应的步骤并从该步继续执行
+
+        只能在执行出错后调用：执行完成或停止时播放器已释放
+        """
+        if self._state.status in (PlaybackStatus.PLAYING, PlaybackStatus.PAUSED):
+            raise RuntimeError("Already playing")
+        if not self._player:
+            raise ValueError("No failed playback to resync")
+
+        index = self._player.resync()
+        if index is None:
+            raise ValueError("No recorded step matches the current screen")
+
+        self._state.status = PlaybackStatus.PLAYING
+        self._state.current_step = index
+        self._state.error = None
+        return self._state
+
     def stop(self) -> PlaybackState:
-        """停止执行"""
-        if self._player:
-            self._player.stop()
-            self._player = None
+        """停止执行（等待执行循环结束，最长 RELEASE_TIMEOUT 秒，异步调用方应放到线程中执行）"""
+        self._release_player()
 
         self._state.status = PlaybackStatus.STOPPED
         self._update_duration()
         return self._state
 
+    def _release_player(self, player=None):
+        """
+        关闭播放器并保留其执行跨度
+
+        Args:
+            player: 要释放的播放器，为空时释放当前播放器；已不是当前播放器时不做处理
+        """
+        current = self._player
+        if current is None or (player is not None and player is not current):
+            return
+
+        if current.get_status() in (SDKPlaybackStatus.PLAYING, SDKPlaybackStatus.PAUSED):
+            current.stop()
+        try:
+            current.wait(RELEASE_TIMEOUT)
+        except Exception as e:
+            # 执行循环的异常已由播放器上报，这里只需继续释放
+            print(f"Playback did not finish cleanly: {e!r}")
+        current.close()
+        self._trace = current.tracer.to_chrome_trace()
+        if self._player is current:
+            self._player = None
+
     def get_status(self) -> PlaybackState:
         """获取执行状态"""
         self._update_duration()
@@ -163,7 +307,17 @@ class PlaybackServiceSingleton:
 
     def get_logs(self) -> list[StepLog]:
         """获取执行日志"""
-        return self._state.logs
+        return list(self._state.logs)
+
+    def get_iterations(self) -> list[IterationLog]:
+        """获取循环执行各轮汇总（最近 1000 轮）"""
+        return list(self._iterations)
+
+    def get_trace(self) -> dict:
+        """获取执行跨度（Chrome trace-event 格式）"""
+        if self._player:
+            return self._player.tracer.to_chrome_trace()
+        return self._trace
 
     def _update_duration(self):
         """更新执行时长"""
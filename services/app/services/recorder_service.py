@@ -17,7 +17,8 @@ except ImportError:
     WindowInfo = None
 
 from ..models.common import WindowInfo as WindowInfoModel, Region
-from ..models.recording import Recording, Step
+from ..models.recording import Recording, Step, TargetWindow
+from ..core.config import settings
 from ..core.minio_client import minio_client
 from .recording_service import RecordingService
 
@@ -103,7 +104,7 @@ class RecorderServiceSingleton:
 
         # 启动录制器
         if Recorder is not None:
-            self._recorder = Recorder(RecorderConfig())
+            self._recorder = Recorder(RecorderConfig(frame_hash=settings.RECORDER_FRAME_HASH))
 
             # 设置截图保存回调
             def save_screenshot(data: bytes, filename: str) -> str:
@@ -132,6 +133,7 @@ class RecorderServiceSingleton:
             return None
 
         # 停止录制器
+        sdk_recording = None
         if self._recorder is not None:
             sdk_recording = self._recorder.stop()
             self._recorder = None
@@ -142,6 +144,9 @@ class RecorderServiceSingleton:
         self._current_recording = None
 
         if recording:
+            if sdk_recording is not None and sdk_recording.target_window:
+                recording.target_window = self._convert_target_window(sdk_recording.target_window)
+
             # 保存录制
             RecordingService.save_recording(recording)
 
@@ -154,6 +159,16 @@ class RecorderServiceSingleton:
 
         return self._status
 
+    def _convert_target_window(self, sdk_window) -> TargetWindow:
+        """转换SDK目标窗口为服务模型（回放时按录制时的窗口矩形换算坐标）"""
+        rect = sdk_window.rect
+        return TargetWindow(
+            title=sdk_window.title,
+            process_name=sdk_window.process_name,
+            rect=Region(x=rect.x, y=rect.y, width=rect.width, height=rect.height),
+            scale=getattr(sdk_window, "scale", 1.0),
+        )
+
     def _convert_step(self, sdk_step) -> Step:
         """转换SDK步骤为服务模型"""
         from ..models.recording import Step
@@ -180,6 +195,10 @@ class RecorderServiceSingleton:
             step.direction = sdk_step.direction
         if sdk_step.amount:
             step.amount = sdk_step.amount
+        if sdk_step.input_mode:
+            step.input_mode = sdk_step.input_mode
+        if sdk_step.frame_hash:
+            step.frame_hash = sdk_step.frame_hash
 
         return step
 
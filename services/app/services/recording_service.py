@@ -5,11 +5,21 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import select
 
+# SDK imports
+try:
+    from playback import HintStore, PlayerConfig, optimize_recording
+except ImportError:
+    HintStore = None
+    PlayerConfig = None
+    optimize_recording = None
+
+from ..core.config import settings
 from ..core.database import session_scope
 from ..core.minio_client import minio_client
 from ..db.models import RecordingRecord
@@ -340,3 +350,48 @@ class RecordingService:
         RecordingService.save_recording(recording)
 
         return recording.steps
+
+    # 优化
+
+    @staticmethod
+    def optimize(
+        recording_id: str,
+        apply: bool = False,
+        downgrade_stable: bool = False
+    ) -> Optional[tuple[Recording, dict]]:
+        """
+        优化录制：合并碎片输入、滚动与等待，去除无效步骤与重复点击等
+
+        Args:
+            recording_id: 录制ID
+            apply: 是否保存优化结果（否则只返回预览）
+            downgrade_stable: 是否把目标从未移动的智能步骤改为固定坐标
+
+        Returns:
+            (优化后的录制, 报告)
+        """
+        if optimize_recording is None:
+            raise RuntimeError("Playback SDK not installed")
+
+        recording = RecordingService.get_recording(recording_id)
+        if not recording:
+            return None
+
+        hints = None
+        if settings.PLAYBACK_HINT_DB_PATH and os.path.exists(settings.PLAYBACK_HINT_DB_PATH):
+            hints = HintStore(settings.PLAYBACK_HINT_DB_PATH)
+        try:
+            optimized, report = optimize_recording(
+                recording.model_dump(mode="json"),
+                PlayerConfig(),
+                hints=hints,
+                downgrade_stable=downgrade_stable
+            )
+        finally:
+            if hints:
+                hints.close()
+
+        recording = Recording.model_validate(optimized)
+        if apply:
+            recording = RecordingService._upload_recording(recording)
+        return recording, report.to_dict()